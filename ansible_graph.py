@@ -2,12 +2,17 @@
 # -*- coding: utf8 -*-
 """ AnsibleGraph main file """
 
-import argparse
+import cProfile
 import logging
+import pstats
 import sys
 import os
+import threading
 
 from ansible_graph import AnsibleGraphRunner
+from ansible_graph.command_line import add_format_arguments, \
+    get_argument_parser, set_logging_level
+from ansible_graph.report_output import ReportOutput
 
 
 class AnsibleGraph(object):
@@ -21,26 +26,70 @@ class AnsibleGraph(object):
         @return: class
         """
 
-        # set argument description/epilog
-        description = 'Ansible-Graph automated graphs for Ansible'
-        epilog = 'Please read the README for detailed description!'
-        parser = argparse.ArgumentParser(description=description,
-                                         epilog=epilog)
+        parser = get_argument_parser(
+            'Ansible-Graph automated graphs for Ansible')
 
         # set optional arguments
-        parser.add_argument("-v", "--verbosity",
-                            action="count",
-                            help="increase output verbosity")
-
-        parser.add_argument("-r", "--report",
-                            choices=['default', 'xml', 'json'],
-                            default='default',
-                            help="set report output format")
-
-        parser.add_argument("-f", "--format",
-                            choices=['svg', 'png', 'tif', 'gif', 'jpg'],
-                            default='png',
-                            help="set graph output format")
+        add_format_arguments(parser)
+
+        parser.add_argument("-t", "--io-threads",
+                            type=int,
+                            default=8,
+                            help="set number of parallel directory and "
+                                 "role root reads")
+
+        parser.add_argument("-j", "--jobs",
+                            type=int,
+                            default=1,
+                            help="set number of processes for role parsing")
+
+        parser.add_argument("--cache-size",
+                            type=int,
+                            default=10000,
+                            help="set number of cached role meta files")
+
+        parser.add_argument("--verify-cache",
+                            action="store_true",
+                            help="verify cached role meta files by content")
+
+        parser.add_argument("-p", "--partition",
+                            choices=['auto', 'always', 'never'],
+                            default='auto',
+                            help="render huge graphs as one file per part")
+
+        parser.add_argument("-o", "--output",
+                            help="write report into file instead of stdout, "
+                                 "compressed for .gz and .xz")
+
+        parser.add_argument("--save-snapshot",
+                            metavar="FILE",
+                            help="write scanned structure and roles to file")
+
+        parser.add_argument("--from-snapshot",
+                            metavar="FILE",
+                            help="read structure and roles from snapshot "
+                                 "instead of scanning the project")
+
+        parser.add_argument("-w", "--watch",
+                            action="store_true",
+                            help="update graphs and report on file changes")
+
+        parser.add_argument("--force",
+                            action="store_true",
+                            help="render graphs and report even if unchanged")
+
+        parser.add_argument("--no-graph", "--report-only",
+                            dest="no_graph",
+                            action="store_true",
+                            help="write report only, skip graph rendering")
+
+        parser.add_argument("--timings",
+                            action="store_true",
+                            help="print time and memory per stage to stderr")
+
+        parser.add_argument("--profile",
+                            metavar="FILE",
+                            help="write cProfile statistics of all threads")
 
         # set mandatory arguments
         parser.add_argument("project", help="the Ansible project directory")
@@ -58,16 +107,14 @@ class AnsibleGraph(object):
         args = AnsibleGraph.__parse_arguments()
 
         # set logging level
-        if args.verbosity > 1:
-            logging.basicConfig(level=logging.DEBUG)
-        elif args.verbosity == 1:
-            logging.basicConfig(level=logging.INFO)
-        else:
-            logging.basicConfig(level=logging.ERROR)
+        set_logging_level(args.verbosity)
 
         # assign arguments
         self.__args = args
 
+        # cProfile profiles of profiled threads
+        self.__profiles = list()
+
     def __verify_dir_path(self, dir_path):
         """
         Verify directory path and access
@@ -109,8 +156,19 @@ class AnsibleGraph(object):
         self.__logger.debug('project path - %s', self.__args.project)
         self.__logger.debug('configuration file - %s', self.__args.config)
 
-        # check ansible project argument
-        if not self.__verify_dir_path(self.__args.project):
+        if self.__args.from_snapshot:
+            # snapshot replaces the project, nothing of it is read
+            if not self.__verify_file_path(self.__args.from_snapshot):
+                self.__logger.error('%s not found', self.__args.from_snapshot)
+                sys.exit(1)
+
+            if self.__args.watch:
+                self.__logger.error('--watch needs the project, not a '
+                                    'snapshot')
+                sys.exit(1)
+
+        # check ansible project argument, not read for snapshot
+        elif not self.__verify_dir_path(self.__args.project):
             self.__logger.error('%s not found', self.__args.project)
             sys.exit(1)
 
@@ -119,28 +177,131 @@ class AnsibleGraph(object):
             self.__logger.error('%s not found', self.__args.config)
             sys.exit(1)
 
+        # check compression of output file, before anything is read
+        if self.__args.output:
+            try:
+                ReportOutput(self.__args.output)
+            except (TypeError, ValueError) as error:
+                self.__logger.error(error)
+                sys.exit(1)
+
+    def __start_profile(self):
+        """ Profile main thread and every thread started afterwards """
+
+        def profile_thread(*_):
+            """ Replace hook by own profile on first event of thread """
+
+            profile = cProfile.Profile()
+            self.__profiles.append(profile)
+            profile.enable()
+
+        profile = cProfile.Profile()
+        self.__profiles.append(profile)
+        threading.setprofile(profile_thread)
+        profile.enable()
+
+    def __stop_profile(self):
+        """ Merge profiles of all threads into profile file """
+
+        threading.setprofile(None)
+        statistics = None
+
+        for profile in self.__profiles:
+            profile.create_stats()
+
+            # skip threads without calls, pstats rejects empty profiles
+            if not profile.stats:
+                continue
+
+            if statistics is None:
+                statistics = pstats.Stats(profile)
+            else:
+                statistics.add(profile)
+
+        if statistics is not None:
+            statistics.dump_stats(self.__args.profile)
+
+        self.__logger.info('profile of %s threads - %s', len(self.__profiles),
+                           self.__args.profile)
+
+    def __write_report(self, write):
+        """
+        Write report into output file or stdout
+
+        @param write: writes report to file-like object
+        @type write: callable
+        """
+
+        self.__logger.info('** generate report output **')
+
+        if self.__args.output:
+            # buffered, compressed by extension, replaced when complete
+            with ReportOutput(self.__args.output) as output:
+                write(output)
+        else:
+            write(sys.stdout)
+            sys.stdout.write('\n')
+            sys.stdout.flush()
+
     def run_documentation(self):
         """ Start documentation run """
 
         options = dict()
         options['report'] = self.__args.report
         options['format'] = self.__args.format
+        options['io_threads'] = self.__args.io_threads
+        options['jobs'] = self.__args.jobs
+        options['cache_size'] = self.__args.cache_size
+        options['verify_cache'] = self.__args.verify_cache
+        options['force'] = self.__args.force
+        options['partition'] = self.__args.partition
+        options['timings'] = self.__args.timings
+        options['graph'] = not self.__args.no_graph
+        options['save_snapshot'] = self.__args.save_snapshot
+        options['from_snapshot'] = self.__args.from_snapshot
 
         self.__logger.debug('options - %s', options)
 
+        if self.__args.profile:
+            self.__start_profile()
+
         try:
             self.__logger.info('** start statistics run **')
 
             documentation = AnsibleGraphRunner(self.__args.project,
                                                self.__args.config,
                                                options)
-            documentation.run_project_parser()
+            results = dict()
+
+            def write_pipelined(stream):
+                """ Start run, write report while graphs still render """
+
+                results.update(documentation.start_project_parser(stream))
+                results['report'].get()
+
+            self.__write_report(write_pipelined)
 
-            self.__logger.info('** generate report output **')
-            print documentation.get_report()
+            for result in results.values():
+                result.get()
+
+            if self.__args.timings:
+                documentation.write_timings(sys.stderr)
+
+            if self.__args.watch:
+                self.__logger.info('** watch project for changes **')
+                documentation.watch_project(
+                    lambda: self.__write_report(documentation.write_report))
 
         except (ValueError, TypeError) as error:
             self.__logger.error(error)
+        except (IOError, OSError) as error:
+            self.__logger.error(error)
+            sys.exit(1)
+        except KeyboardInterrupt:
+            self.__logger.info('** watch stopped **')
+        finally:
+            if self.__args.profile:
+                self.__stop_profile()
 
 
 if __name__ == '__main__':
@@ -2,12 +2,25 @@
 """ Ansible graph package """
 
 import logging
+from collections import OrderedDict
+from threading import Thread
 
 from .configuration_reader import ReadConfiguration
 from .ansible_role_reader import AnsibleRoleReader
 from .ansible_directory_reader import AnsibleDirectoryReader
-from .graph_generator import GraphGenerator
+from .playbook_reader import AnsiblePlaybookReader
+from .include_reader import AnsibleIncludeReader
+from .inventory_reader import AnsibleInventoryReader
+from .inventory_index import InventoryIndex
+from .variable_reader import AnsibleVariableReader
+from .variable_index import VariableIndex
 from .report_generator import ReportGenerator
+from .scan_index import ScanIndex
+from .parse_cache import ParseCache
+from .role_dependency_graph import RoleDependencyGraph
+from .scan_snapshot import ScanSnapshot
+from .stage_result import StageResult
+from .stage_timer import StageTimer
 
 
 class AnsibleGraphRunner(object):
@@ -15,6 +28,13 @@ class AnsibleGraphRunner(object):
 
     __LOGGER = logging.getLogger(__name__)
 
+    # artifacts read by a reader of the project
+    READERS = ['project', 'roles', 'playbooks', 'includes', 'inventory',
+               'variables']
+
+    # artifacts with a graph
+    GRAPHS = ['project', 'roles', 'playbooks', 'includes', 'inventory']
+
     @classmethod
     def __read_configuration(cls, configuration_path):
         """
@@ -39,7 +59,8 @@ class AnsibleGraphRunner(object):
 
         return configuration_content
 
-    def __init__(self, project_path, configuration_path, arg_options):
+    def __init__(self, project_path, configuration_path, arg_options,
+                 configuration_content=None):
         """
         Ansible graph runner constructor
 
@@ -49,6 +70,8 @@ class AnsibleGraphRunner(object):
         @type configuration_path: str
         @param arg_options: application options
         @type arg_options: dict
+        @param configuration_content: already read configuration (optional)
+        @type configuration_content: dict
 
         @raise e: TypeError
         @raise e: ValueError
@@ -79,35 +102,281 @@ class AnsibleGraphRunner(object):
             self.__LOGGER.error(msg)
             raise TypeError(msg)
 
+        if configuration_content is not None and \
+                not isinstance(configuration_content, dict):
+            msg = 'Parameter: configuration_content needs to a dictionary'
+            self.__LOGGER.error(msg)
+            raise TypeError(msg)
+
         self.__project_path = str(project_path)
         self.__arg_options = dict(arg_options)
-        self.__config_content = AnsibleGraphRunner.__read_configuration(
-            str(configuration_path))
-        self.__project_content = dict()
-        self.__role_content = dict()
+        self.__stage_timer = StageTimer(bool(arg_options.get('timings')))
+
+        with self.__stage_timer.measure('configuration'):
+            if configuration_content is None:
+                self.__config_content = \
+                    AnsibleGraphRunner.__read_configuration(
+                        str(configuration_path))
+            else:
+                self.__config_content = dict(configuration_content)
+
+        # read content and indexes built from it, by artifact
+        self.__content = {'project': dict(), 'roles': dict(),
+                          'playbooks': dict(), 'includes': dict(),
+                          'inventory': dict(), 'variables': dict(),
+                          'dependency_graph': RoleDependencyGraph(),
+                          'inventory_index': InventoryIndex(),
+                          'variable_index': VariableIndex()}
+
+        # readers by artifact, None until read, and the caches they share
+        self.__readers = dict.fromkeys(self.READERS)
+        self.__readers['scan_index'] = ScanIndex()
+        self.__readers['parse_cache'] = ParseCache()
+
+        self.__errors = list()
+
+    def __record_error(self, error):
+        """
+        Log error of a skipped step and keep it for get_errors
+
+        @param error: error raised by reader or generator
+        @type error: Exception
+        """
+
+        self.__LOGGER.error(error)
+        self.__errors.append(str(error))
+
+    def __load_caches(self):
+        """
+        Load scan index and parse cache stored next to the graph output or
+        in location of option cache_location
+        """
+
+        location = str(self.__arg_options.get('cache_location') or
+                       self.__config_content['location'])
+        max_entries = int(self.__arg_options.get(
+            'cache_size', ParseCache.DEFAULT_MAX_ENTRIES))
+        verify = bool(self.__arg_options.get('verify_cache', False))
+
+        try:
+            with self.__stage_timer.measure('cache_load'):
+                self.__readers['scan_index'].set_index_location(location)
+                self.__readers['parse_cache'].set_cache_config(
+                    location, max_entries, verify)
+        except (TypeError, ValueError) as error:
+            self.__record_error(error)
 
     def __get_ansible_project_content(self):
-        """ Read Ansible project directories and files into dictionary """
+        """
+        Read Ansible project directories and files into dictionary
+
+        @return: dict
+        """
 
         include = list(self.__config_content['include'])
         exclude = list(self.__config_content['exclude'])
+        concurrency = int(self.__arg_options.get(
+            'io_threads', AnsibleDirectoryReader.DEFAULT_CONCURRENCY))
 
         try:
             structure = AnsibleDirectoryReader()
-            structure.set_reader_config(self.__project_path, include, exclude)
-            self.__project_content = structure.get_ansible_structure()
+            structure.set_reader_config(self.__project_path, include, exclude,
+                                        concurrency)
+            structure.set_scan_index(self.__readers['scan_index'])
+            with self.__stage_timer.measure('directory_scan'):
+                self.__content['project'] = structure.get_ansible_structure()
+            self.__readers['project'] = structure
         except (TypeError, ValueError) as error:
-            self.__LOGGER.error(error)
+            self.__record_error(error)
+
+        statistics = self.get_statistics()
+        self.__stage_timer.add_count('directory_scan', 'directories',
+                                     statistics['directories'])
+        self.__stage_timer.add_count('directory_scan', 'files',
+                                     statistics['files'])
+
+        return self.__content['project']
 
     def __get_ansible_roles_content(self):
-        """ Read Ansible roles and dependencies into dictionary """
+        """
+        Read Ansible roles and dependencies into dictionary
+
+        @return: dict
+        """
+
+        jobs = int(self.__arg_options.get('jobs', 1))
+        concurrency = int(self.__arg_options.get(
+            'io_threads', AnsibleRoleReader.DEFAULT_CONCURRENCY))
 
         try:
             roles = AnsibleRoleReader()
-            roles.set_reader_config(self.__project_path)
-            self.__role_content = roles.get_ansible_roles()
+            roles.set_reader_config(self.__project_path, jobs, concurrency)
+            roles.set_scan_index(self.__readers['scan_index'])
+            roles.set_parse_cache(self.__readers['parse_cache'])
+            roles.set_stage_timer(self.__stage_timer)
+            with self.__stage_timer.measure('role_scan'):
+                self.__content['roles'] = roles.get_ansible_roles()
+            self.__readers['roles'] = roles
+        except (TypeError, ValueError) as error:
+            self.__record_error(error)
+
+        self.__stage_timer.add_count('role_scan', 'roles',
+                                     len(self.__content['roles']))
+
+        self.__build_dependency_graph()
+
+        return self.__content['roles']
+
+    def __get_role_paths(self):
+        """
+        Return role locations of role reader, none if roles were not read
+
+        @return: dict
+        """
+
+        if self.__readers['roles'] is None:
+            return dict()
+
+        return self.__readers['roles'].get_role_paths()
+
+    def __get_ansible_playbooks_content(self):
+        """
+        Read Ansible playbooks, their plays and imports into dictionary
+
+        @return: dict
+        """
+
+        try:
+            playbooks = AnsiblePlaybookReader()
+            playbooks.set_reader_config(self.__project_path)
+            playbooks.set_scan_index(self.__readers['scan_index'])
+            playbooks.set_parse_cache(self.__readers['parse_cache'])
+            with self.__stage_timer.measure('playbook_scan'):
+                self.__content['playbooks'] = playbooks.get_ansible_playbooks()
+            self.__readers['playbooks'] = playbooks
+        except (TypeError, ValueError) as error:
+            self.__record_error(error)
+
+        self.__stage_timer.add_count('playbook_scan', 'playbooks',
+                                     len(self.__content['playbooks']))
+
+        return self.__content['playbooks']
+
+    def __get_ansible_includes_content(self):
+        """
+        Scan role task and template files for their references
+
+        @return: dict
+        """
+
+        try:
+            includes = AnsibleIncludeReader()
+            includes.set_reader_config(
+                self.__project_path, int(self.__arg_options.get('jobs', 1)))
+            includes.set_scan_index(self.__readers['scan_index'])
+            includes.set_role_paths(self.__get_role_paths())
+            with self.__stage_timer.measure('include_scan'):
+                self.__content['includes'] = includes.get_ansible_includes()
+            self.__readers['includes'] = includes
+        except (TypeError, ValueError) as error:
+            self.__record_error(error)
+
+        self.__stage_timer.add_count('include_scan', 'files',
+                                     len(self.__content['includes']))
+
+        return self.__content['includes']
+
+    def __get_ansible_inventory_content(self):
+        """
+        Read Ansible inventory and group/host vars into dictionary
+
+        @return: dict
+        """
+
+        try:
+            inventory = AnsibleInventoryReader()
+            inventory.set_reader_config(self.__project_path)
+            inventory.set_scan_index(self.__readers['scan_index'])
+            inventory.set_parse_cache(self.__readers['parse_cache'])
+            with self.__stage_timer.measure('inventory_scan'):
+                self.__content['inventory'] = inventory.get_ansible_inventory()
+            self.__readers['inventory'] = inventory
         except (TypeError, ValueError) as error:
-            self.__LOGGER.error(error)
+            self.__record_error(error)
+
+        self.__build_inventory_index()
+
+        return self.__content['inventory']
+
+    def __build_inventory_index(self):
+        """ Build inventory index once for graph and report """
+
+        with self.__stage_timer.measure('inventory_index'):
+            inventory_index = InventoryIndex()
+            inventory_index.set_inventory_content(self.__content['inventory'])
+            self.__content['inventory_index'] = inventory_index
+
+        self.__stage_timer.add_count('inventory_index', 'groups', len(
+            inventory_index.get_group_names()))
+        self.__stage_timer.add_count('inventory_index', 'hosts',
+                                     inventory_index.get_host_count())
+
+    def __generate_inventory_graph(self):
+        """
+        Render inventory group graph if an inventory was found
+
+        @return: str, location of rendered graph, None if not rendered
+        """
+
+        if not self.__content['inventory'].get('sources'):
+            return None
+
+        return self.__generate_graph(
+            'inventory',
+            self.__content['inventory_index'].get_group_hierarchy())
+
+    def __get_ansible_variables_content(self):
+        """
+        Scan roles, playbooks and vars files for variables
+
+        @return: dict
+        """
+
+        try:
+            variables = AnsibleVariableReader()
+            variables.set_reader_config(
+                self.__project_path, int(self.__arg_options.get('jobs', 1)))
+            variables.set_scan_index(self.__readers['scan_index'])
+            variables.set_role_paths(self.__get_role_paths())
+            with self.__stage_timer.measure('variable_scan'):
+                self.__content['variables'] = variables.get_ansible_variables(
+                    self.__content['playbooks'].keys(),
+                    self.__content['inventory'])
+            self.__readers['variables'] = variables
+            self.__stage_timer.add_count('variable_scan', 'files',
+                                         variables.get_file_count())
+        except (TypeError, ValueError) as error:
+            self.__record_error(error)
+
+        self.__build_variable_index()
+
+        return self.__content['variables']
+
+    def __build_variable_index(self):
+        """ Build variable index once for report and statistics """
+
+        with self.__stage_timer.measure('variable_index'):
+            variable_index = VariableIndex()
+            variable_index.set_variable_content(self.__content['variables'])
+            self.__content['variable_index'] = variable_index
+
+    def __build_dependency_graph(self):
+        """ Build role dependency graph once for graph and report """
+
+        with self.__stage_timer.measure('dependency_graph'):
+            dependency_graph = RoleDependencyGraph()
+            dependency_graph.set_role_content(self.__content['roles'])
+            self.__content['dependency_graph'] = dependency_graph
 
     def __generate_graph(self, graph_type, graph_content):
         """
@@ -117,30 +386,426 @@ class AnsibleGraphRunner(object):
         @type graph_type: str
         @param graph_content: content for graph
         @type graph_content: dict
+
+        @return: str, location of rendered graph, None if not rendered
         """
 
+        if not self.__arg_options.get('graph', True):
+            self.__LOGGER.debug('Skip %s graph', graph_type)
+            return None
+
+        # projects without roles, playbooks or includes get no such graph
+        if not graph_content:
+            self.__LOGGER.debug('Skip empty %s graph', graph_type)
+            return None
+
+        # graphviz is only imported if graphs are rendered
+        from .graph_generator import GraphGenerator
+
         gv_format = str(self.__arg_options['format'])
         gv_type = str(graph_type)
         gv_location = str(self.__config_content['location'])
         gv_content = dict(graph_content)
+        gv_force = bool(self.__arg_options.get('force', False))
+        gv_partition = str(self.__arg_options.get('partition', 'auto'))
 
         try:
             graph = GraphGenerator()
-            graph.set_graph_config(gv_format, gv_location)
-            graph.generate_graph(gv_content, gv_type)
+            graph.set_graph_config(gv_format, gv_location, gv_force)
+            graph.set_partition_mode(gv_partition)
+            graph.set_stage_timer(self.__stage_timer)
+            if gv_type == 'roles':
+                graph.set_dependency_graph(self.__content['dependency_graph'])
+            return graph.generate_graph(gv_content, gv_type)
         except (TypeError, ValueError) as error:
-            self.__LOGGER.error(error)
+            self.__record_error(error)
+
+        return None
+
+    def __generate_stage_graph(self, graph_type):
+        """
+        Render graph of read content, optional graphs only with content
+
+        @param graph_type: graph type
+            [project, roles, playbooks, includes, inventory]
+        @type graph_type: str
+
+        @return: str, location of rendered graph, None if not rendered
+        """
+
+        if graph_type == 'inventory':
+            return self.__generate_inventory_graph()
+
+        return self.__generate_graph(graph_type, self.__content[graph_type])
+
+    def __load_snapshot(self):
+        """ Read project structure and roles from snapshot, not project """
+
+        snapshot = ScanSnapshot()
+
+        with self.__stage_timer.measure('snapshot_load'):
+            snapshot.load(str(self.__arg_options['from_snapshot']))
+            self.__content['project'] = snapshot.get_project_content()
+            self.__content['roles'] = snapshot.get_role_content()
+
+        statistics = self.get_statistics()
+        self.__stage_timer.add_count('snapshot_load', 'directories',
+                                     statistics['directories'])
+        self.__stage_timer.add_count('snapshot_load', 'roles',
+                                     statistics['roles'])
+
+        self.__build_dependency_graph()
+
+    def __get_snapshot_content(self, name):
+        """
+        Return content read from snapshot
+
+        @param name: content [project, roles]
+        @type name: str
+
+        @return: dict
+        """
+
+        return self.__content[name]
+
+    def __save_snapshot(self):
+        """ Write project structure and roles for runs without scan """
+
+        snapshot = ScanSnapshot()
+        snapshot.set_snapshot_content(self.__content['project'],
+                                      self.__content['roles'])
+
+        with self.__stage_timer.measure('snapshot_save'):
+            snapshot.save(str(self.__arg_options['save_snapshot']))
+
+    def __save_caches(self):
+        """ Keep listings and parse results for the next run """
+
+        # caller saves caches shared with other runs, see get_cache_entries
+        if not self.__arg_options.get('save_caches', True):
+            return
+
+        with self.__stage_timer.measure('cache_save'):
+            self.__readers['scan_index'].save()
+            self.__readers['parse_cache'].save()
+
+    @staticmethod
+    def __run_stage(result, results, stage, *args):
+        """
+        Wait for results of earlier stages, run stage and set its result
+
+        Errors of earlier stages are set as error of this stage, the stage
+        is not run.
+
+        @param result: result of this stage
+        @type result: StageResult
+        @param results: results of stages this stage depends on
+        @type results: list
+        @param stage: stage to run
+        @type stage: callable
+        @param args: arguments of stage
+        @type args: tuple
+        """
+
+        try:
+            for item in results:
+                item.get()
+
+            result.set_value(stage(*args))
+        # any error, one not set on the result leaves get() of this and all
+        # dependent stages waiting forever, get() raises it again
+        except Exception as error:  # pylint: disable=broad-except
+            result.set_error(error)
+
+    @staticmethod
+    def __start_stage(results, name, depends, stage, *args):
+        """
+        Add result of stage and start it in a thread of its own
+
+        Stage threads are no daemons, interpreter exit waits for stages
+        still running. A thread per stage never lets waiting stages block
+        running ones.
+
+        @param results: results by artifact, result of stage is added
+        @type results: dict
+        @param name: artifact of stage
+        @type name: str
+        @param depends: artifacts this stage depends on
+        @type depends: list
+        @param stage: stage to run
+        @type stage: callable
+        @param args: arguments of stage
+        @type args: tuple
+        """
+
+        results[name] = StageResult()
+        Thread(target=AnsibleGraphRunner.__run_stage, name=name,
+               args=(results[name], [results[item] for item in depends],
+                     stage) + args).start()
+
+    def __start_snapshot_stages(self, results):
+        """
+        Start loading of snapshot, project structure and roles from it
+
+        @param results: results by artifact, results of stages are added
+        @type results: dict
+        """
+
+        start = AnsibleGraphRunner.__start_stage
+
+        start(results, 'snapshot', [], self.__load_snapshot)
+
+        for name in ['project', 'roles']:
+            start(results, name, ['snapshot'],
+                  self.__get_snapshot_content, name)
+
+    def __start_scan_stages(self, results):
+        """
+        Start readers, variable scan, saving of snapshot and caches
+
+        @param results: results by artifact, results of stages are added
+        @type results: dict
+        """
+
+        start = AnsibleGraphRunner.__start_stage
+
+        self.__load_caches()
+
+        readers = OrderedDict([
+            ('project', self.__get_ansible_project_content),
+            ('roles', self.__get_ansible_roles_content),
+            ('playbooks', self.__get_ansible_playbooks_content),
+            ('includes', self.__get_ansible_includes_content),
+            ('inventory', self.__get_ansible_inventory_content),
+            ('variables', self.__get_ansible_variables_content)])
+
+        # includes and variables are scanned in the roles of the role reader
+        depends = {'includes': ['roles'],
+                   'variables': ['roles', 'playbooks', 'inventory']}
+
+        for name, reader in readers.iteritems():
+            start(results, name, depends.get(name, []), reader)
+
+        if self.__arg_options.get('save_snapshot'):
+            start(results, 'snapshot', ['project', 'roles'],
+                  self.__save_snapshot)
+
+        start(results, 'caches', readers.keys(), self.__save_caches)
+
+    def start_project_parser(self, stream=None):
+        """
+        Start pipelined run and return a result per artifact
+
+        Readers run side by side. Each graph renders as soon as its content
+        is read, includes and variables are scanned once roles, playbooks and
+        inventory are known, and the report is written once its content is
+        complete while graphs may still render. get() of a result waits for
+        and returns the read content, the location of a rendered graph, or
+        None.
+
+        With option from_snapshot, project structure and roles are loaded
+        from the snapshot instead, the project is not read at all.
+
+        @param stream: file-like object for report, no report if None
+        @type stream: object
+
+        @return: dict of StageResult by artifact [project, roles, playbooks,
+            includes, inventory, <type>_graph, variables, report, snapshot,
+            caches]
+        """
+
+        start = AnsibleGraphRunner.__start_stage
+
+        results = OrderedDict()
+
+        if self.__arg_options.get('from_snapshot'):
+            self.__start_snapshot_stages(results)
+        else:
+            self.__start_scan_stages(results)
+
+        for name in self.GRAPHS:
+            if name in results:
+                start(results, name + '_graph', [name],
+                      self.__generate_stage_graph, name)
+
+        if stream is not None:
+            start(results, 'report', [
+                item for item in ['project', 'roles', 'inventory', 'variables']
+                if item in results
+                ], self.write_report, stream)
+
+        return results
 
     def run_project_parser(self):
-        """ Run Ansible project parser """
+        """ Run Ansible project parser, wait for all graphs and caches """
+
+        for result in self.start_project_parser().values():
+            result.get()
+
+    def update_project_parser(self, changes):
+        """
+        Re-read changed directories and meta files, render affected graphs
+
+        @param changes: changed directories and files, see ProjectWatcher
+        @type changes: dict
+
+        @return: bool, True if project structure or roles changed
+        """
 
-        # get Ansible project structure
-        self.__get_ansible_project_content()
-        self.__generate_graph('project', self.__project_content)
+        readers = self.__readers
 
-        # get Ansible roles
-        self.__get_ansible_roles_content()
-        self.__generate_graph('roles', self.__role_content)
+        # without a complete first run there is nothing to update
+        if changes.get('overflow') or \
+                any([readers[name] is None for name in self.READERS]):
+            self.__LOGGER.info('Full project update')
+            self.run_project_parser()
+            return True
+
+        directories = list(changes['directories'])
+        paths = directories + list(changes['files'])
+        project_changed = False
+        roles_changed = False
+        playbooks_changed = False
+        includes_changed = False
+        inventory_changed = False
+        variables_changed = False
+
+        try:
+            project_changed = readers['project'].update_ansible_structure(
+                directories)
+            roles_changed = readers['roles'].update_ansible_roles(paths)
+            readers['includes'].set_role_paths(self.__get_role_paths())
+            readers['variables'].set_role_paths(self.__get_role_paths())
+            playbooks_changed = readers['playbooks'].update_ansible_playbooks(
+                paths)
+            includes_changed = readers['includes'].update_ansible_includes(
+                paths)
+            inventory_changed = readers['inventory'].update_ansible_inventory(
+                paths)
+            variables_changed = readers['variables'].update_ansible_variables(
+                self.__content['playbooks'].keys(),
+                self.__content['inventory'], paths)
+        except (TypeError, ValueError, IOError, OSError) as error:
+            self.__record_error(error)
+
+        if project_changed:
+            self.__generate_graph('project', self.__content['project'])
+
+        if roles_changed:
+            self.__build_dependency_graph()
+            self.__generate_graph('roles', self.__content['roles'])
+
+        if playbooks_changed and self.__content['playbooks']:
+            self.__generate_graph('playbooks', self.__content['playbooks'])
+
+        if includes_changed and self.__content['includes']:
+            self.__generate_graph('includes', self.__content['includes'])
+
+        if inventory_changed:
+            self.__build_inventory_index()
+            self.__generate_inventory_graph()
+
+        if variables_changed:
+            self.__build_variable_index()
+
+        self.__readers['scan_index'].save()
+        self.__readers['parse_cache'].save()
+
+        return project_changed or roles_changed or playbooks_changed or \
+            includes_changed or inventory_changed or variables_changed
+
+    def watch_project(self, on_change):
+        """
+        Watch project and update graphs until interrupted
+
+        @param on_change: called without arguments after each update
+        @type on_change: callable
+
+        @raise e: OSError
+        """
+
+        from .project_watcher import ProjectWatcher
+
+        watcher = ProjectWatcher()
+        watcher.set_watch_config(self.__project_path,
+                                 list(self.__config_content['exclude']),
+                                 [str(self.__config_content['location'])])
+
+        try:
+            while True:
+                changes = watcher.wait_for_changes()
+
+                if self.update_project_parser(changes):
+                    on_change()
+        finally:
+            watcher.close()
+
+    def __get_report_generator(self):
+        """
+        Return report generator with project and roles content
+
+        @return: ReportGenerator
+        """
+
+        meta = {'title': self.__config_content['title'],
+                'company': self.__config_content['company']}
+
+        report = ReportGenerator(self.__arg_options['report'])
+        report.set_report_header(meta)
+        report.set_report_content(self.__content['project'],
+                                  self.__content['roles'],
+                                  self.__content['dependency_graph'])
+
+        # snapshot holds no inventory and variables, and its report must
+        # not replace the cached report of the scanned project
+        if self.__arg_options.get('from_snapshot'):
+            return report
+
+        report.set_report_cache(str(self.__config_content['location']),
+                                bool(self.__arg_options.get('force', False)))
+        report.set_inventory_index(self.__content['inventory_index'])
+        report.set_variable_index(self.__content['variable_index'])
+
+        return report
+
+    def get_statistics(self):
+        """
+        Return counts of directories, files, roles, dependency cycles,
+        playbooks, inventory groups, hosts, unused and undefined variables
+
+        @return: dict
+        """
+
+        content = self.__content
+
+        return {'directories': len(content['project']),
+                'files': sum([len(value['files'])
+                              for value in content['project'].values()]),
+                'roles': len(content['roles']),
+                'cycles': len(content['dependency_graph'].get_cycles()),
+                'playbooks': len(content['playbooks']),
+                'groups': len(content['inventory_index'].get_group_names()),
+                'hosts': content['inventory_index'].get_host_count(),
+                'unused_variables': len(
+                    content['variable_index'].get_unused()),
+                'undefined_variables': len(
+                    content['variable_index'].get_undefined())}
+
+    def write_report(self, stream):
+        """
+        Write full report to file-like object
+
+        @param stream: file-like object with write method
+        @type stream: object
+        """
+
+        stage = 'report_' + str(self.__arg_options['report'])
+
+        try:
+            with self.__stage_timer.measure(stage):
+                self.__get_report_generator().write_report(stream)
+        except (TypeError, ValueError) as error:
+            self.__record_error(error)
 
     def get_report(self):
         """
@@ -150,17 +815,52 @@ class AnsibleGraphRunner(object):
         """
 
         output = str()
-        meta = {'title': self.__config_content['title'],
-                'company': self.__config_content['company']}
 
         # generate report
+        stage = 'report_' + str(self.__arg_options['report'])
+
         try:
-            report = ReportGenerator(self.__arg_options['report'])
-            report.set_report_header(meta)
-            report.set_report_content(self.__project_content,
-                                      self.__role_content)
-            output = report.get_report()
+            with self.__stage_timer.measure(stage):
+                output = self.__get_report_generator().get_report()
         except (TypeError, ValueError) as error:
-            self.__LOGGER.error(error)
+            self.__record_error(error)
 
         return output
+
+    def get_errors(self):
+        """
+        Return errors of steps which were logged and skipped
+
+        @return: list
+        """
+
+        return list(self.__errors)
+
+    def get_cache_entries(self):
+        """
+        Return scan index and parse cache entries of this run
+
+        @return: tuple (scan index entries, parse cache entries)
+        """
+
+        return (self.__readers['scan_index'].get_entries(),
+                self.__readers['parse_cache'].get_entries())
+
+    def get_timings(self):
+        """
+        Return recorded stages, empty if timings are disabled
+
+        @return: OrderedDict
+        """
+
+        return self.__stage_timer.get_timings()
+
+    def write_timings(self, stream):
+        """
+        Write recorded stages as table to file-like object
+
+        @param stream: file-like object with write method
+        @type stream: object
+        """
+
+        self.__stage_timer.write_timings(stream)
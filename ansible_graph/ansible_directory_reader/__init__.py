@@ -3,19 +3,27 @@
 
 import logging
 import os
+from multiprocessing.pool import ThreadPool
 
+from ..reader_base import ReaderBase
 
-class AnsibleDirectoryReader(object):
+
+class AnsibleDirectoryReader(ReaderBase):
     """ Ansible directory reader class """
 
+    DEFAULT_CONCURRENCY = 8
+
     def __init__(self):
         """ Ansible directory reader constructor """
 
+        super(AnsibleDirectoryReader, self).__init__()
+
         self.__logger = logging.getLogger(__name__)
 
         self.__project_path = str()
         self.__include = list()
         self.__exclude = list()
+        self.__concurrency = self.DEFAULT_CONCURRENCY
         self.__ansible_structure = dict()
 
     def __get_dir_content(self, directory_path):
@@ -25,38 +33,63 @@ class AnsibleDirectoryReader(object):
         @param directory_path: location of directory
         @type directory_path: str
 
-        @return: dict
+        @return: tuple (directory content, walkable subdirectories)
         """
 
         self.__logger.debug('Read directory - %s', directory_path)
 
-        directory_content = {'directories': [], 'files': []}
-        filtered_content = list()
+        listing = self._scan_index.read_directory(directory_path)
+
+        directory_content = {
+            'directories': [
+                item for item in listing['directories'] + listing['links']
+                if item not in self.__exclude
+                ],
+            'files': [
+                item for item in listing['files']
+                if item not in self.__exclude
+                ]
+            }
+
+        # do not follow symlinks into possible cycles
+        subdirectories = [
+            item for item in listing['directories']
+            if item not in self.__exclude
+            ]
 
-        # read all from directory and filter excludes
-        folder_reads = os.listdir(directory_path)
+        return directory_content, subdirectories
 
-        for item in folder_reads:
-            if item not in self.__exclude:
-                filtered_content.append(item)
+    def __walk_directories(self, directories):
+        """
+        Read included directories in full depth, level by level
+
+        @param directories: relative paths of start directories
+        @type directories: list
+        """
 
-        # add filtered items into specific lists
-        for item in filtered_content:
-            item = directory_path + '/' + item
+        pool = ThreadPool(self.__concurrency)
 
-            # check for type file and add to list
-            if os.path.isfile(item):
-                item = item.replace(directory_path + '/', '')
-                directory_content['files'].append(item)
+        try:
+            pending = list(directories)
 
-            # check for type directory and add to list
-            if os.path.isdir(item):
-                item = item.replace(directory_path + '/', '')
-                directory_content['directories'].append(item)
+            while pending:
+                paths = [self.__project_path + '/' + item for item in pending]
+                results = pool.map(self.__get_dir_content, paths)
 
-        return directory_content
+                next_pending = list()
 
-    def set_reader_config(self, project_path, includes, excludes):
+                for item, result in zip(pending, results):
+                    self.__ansible_structure[item] = result[0]
+                    next_pending.extend(
+                        [item + '/' + subdir for subdir in result[1]])
+
+                pending = next_pending
+        finally:
+            pool.close()
+            pool.join()
+
+    def set_reader_config(self, project_path, includes, excludes,
+                          concurrency=DEFAULT_CONCURRENCY):
         """
         Settings for Ansible role reader
 
@@ -66,6 +99,8 @@ class AnsibleDirectoryReader(object):
         @type includes: list
         @param excludes: list with exclusions
         @type excludes: list
+        @param concurrency: number of parallel directory reads
+        @type concurrency: int
 
         @raise e: TypeError
         @raise e: ValueError
@@ -73,58 +108,159 @@ class AnsibleDirectoryReader(object):
 
         self.__logger.info('Set Ansible directory reader configuration')
 
-        if not isinstance(project_path, str):
-            msg = 'Parameter: project_path needs to a string'
-            self.__logger.error(msg)
-            raise TypeError(msg)
+        self._check_path('project_path', project_path)
 
-        if not project_path:
-            msg = 'Parameter: no project_path path provided'
-            self.__logger.error(msg)
-            raise ValueError(msg)
-
-        if not isinstance(includes, list):
-            msg = 'Parameter: includes needs to a list'
-            self.__logger.error(msg)
-            raise TypeError(msg)
+        self._check_instance('includes', includes, list)
 
         if not includes:
             msg = 'Parameter: no includes provided'
             self.__logger.error(msg)
             raise ValueError(msg)
 
-        if not isinstance(excludes, list):
-            msg = 'Parameter: exclude needs to a list'
-            self.__logger.error(msg)
-            raise TypeError(msg)
+        self._check_instance('excludes', excludes, list)
 
         if not excludes:
             msg = 'Parameter: no exclude provided'
             self.__logger.error(msg)
             raise ValueError(msg)
 
+        self._check_count('concurrency', concurrency)
+
         self.__project_path = str(project_path)
         self.__include = list(includes)
         self.__exclude = list(excludes)
+        self.__concurrency = concurrency
 
     def get_ansible_structure(self):
         """
         Return dictionary with Ansible directories and files list
 
+        Included directories are read in full depth, nested directories
+        are stored by their path relative to the project (e.g. roles/web).
+
         @return: dict
         """
 
         self.__logger.info('Read Ansible directory structure')
 
         # read root directory
-        root_content = self.__get_dir_content(self.__project_path)
+        root_content = self.__get_dir_content(self.__project_path)[0]
         self.__ansible_structure['root'] = root_content
 
         # read included subdirectories
-        for item in self.__include:
-            path = self.__project_path + '/' + item
-
-            if item in root_content['directories']:
-                self.__ansible_structure[item] = self.__get_dir_content(path)
+        included = [
+            item for item in self.__include
+            if item in root_content['directories']
+            ]
+        self.__walk_directories(included)
 
         return self.__ansible_structure
+
+    def __drop_directory(self, key):
+        """
+        Remove directory and all nested directories from structure
+
+        @param key: relative path of directory
+        @type key: str
+        """
+
+        removed = [
+            item for item in self.__ansible_structure
+            if item == key or item.startswith(key + '/')
+            ]
+
+        for item in removed:
+            del self.__ansible_structure[item]
+
+    def __get_structure_key(self, directory_path):
+        """
+        Return structure key for directory or None if not part of structure
+
+        @param directory_path: location of directory
+        @type directory_path: str
+
+        @return: str
+        """
+
+        relative = os.path.relpath(os.path.abspath(directory_path),
+                                   os.path.abspath(self.__project_path))
+
+        if relative == '.':
+            return 'root'
+
+        parts = relative.split(os.sep)
+
+        if parts[0] == '..' or parts[0] not in self.__include:
+            return None
+
+        if [item for item in parts if item in self.__exclude]:
+            return None
+
+        return '/'.join(parts)
+
+    def update_ansible_structure(self, directory_paths):
+        """
+        Re-read changed directories of structure returned before
+
+        The dictionary of get_ansible_structure is updated in place.
+
+        @param directory_paths: locations of directories with changed listing
+        @type directory_paths: list
+
+        @return: bool, True if structure changed
+        """
+
+        self.__logger.info('Update Ansible directory structure')
+
+        keys = set([self.__get_structure_key(item) for item in directory_paths])
+        keys.discard(None)
+        changed = False
+
+        # parents first, so dropped directories are not read again
+        for key in sorted(keys):
+            if key == 'root':
+                path = self.__project_path
+            else:
+                path = self.__project_path + '/' + key
+
+            if not os.path.isdir(path):
+                if key in self.__ansible_structure:
+                    self.__drop_directory(key)
+                    changed = True
+                continue
+
+            if key != 'root' and '/' in key and \
+                    key.rsplit('/', 1)[0] not in self.__ansible_structure:
+                continue
+
+            content, subdirectories = self.__get_dir_content(path)
+            previous = self.__ansible_structure.get(key)
+
+            if previous == content:
+                continue
+
+            changed = True
+            self.__ansible_structure[key] = content
+
+            if key == 'root':
+                subdirectories = [
+                    item for item in subdirectories if item in self.__include
+                    ]
+            else:
+                subdirectories = [
+                    key + '/' + item for item in subdirectories
+                    ]
+
+            # drop removed and read new subdirectories
+            if previous:
+                for item in previous['directories']:
+                    if item not in content['directories']:
+                        self.__drop_directory(
+                            item if key == 'root' else key + '/' + item)
+
+            self.__walk_directories([
+                item for item in subdirectories
+                if item not in self.__ansible_structure
+                ])
+
+        return changed
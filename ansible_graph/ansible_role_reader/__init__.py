@@ -1,71 +1,385 @@
 # -*- coding: utf-8 -*-
 """ Ansible role reader package """
 
+import fnmatch
 import logging
-import glob
-import yaml
+import os
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 
+from ..reader_base import ReaderBase, read_yaml_file
+from ..stage_timer import StageTimer
 
-class AnsibleRoleReader(object):
+
+def read_role_dependencies(yml_path):
+    """
+    Read Ansible role dependencies from yml file
+
+    Module level function, so it can be used by a process pool.
+
+    @param yml_path: Location for yml file
+    @type yml_path: str
+
+    @return: list
+    @raise e: ValueError
+    """
+
+    dependencies = list()
+    yml_content = read_yaml_file(yml_path)
+
+    if isinstance(yml_content, dict) and yml_content.get('dependencies'):
+        for item in yml_content['dependencies']:
+            if isinstance(item, dict):
+                dependencies.append(item['role'])
+            else:
+                dependencies.append(item)
+
+    return dependencies
+
+
+class AnsibleRoleReader(ReaderBase):
     """ Ansible role reader class """
 
+    # role roots of project, searched before and after roles_path
+    PROJECT_ROLE_ROOTS = ['roles']
+    VENDORED_ROLE_ROOTS = ['galaxy_roles']
+
+    # collection roots of project, roles named <namespace>.<collection>.<role>
+    COLLECTION_ROOTS = ['ansible_collections',
+                        'collections/ansible_collections']
+
+    # role roots listed side by side
+    DEFAULT_CONCURRENCY = 8
+
     def __init__(self):
         """ Ansible role reader constructor """
 
+        super(AnsibleRoleReader, self).__init__()
+
         self.__logger = logging.getLogger(__name__)
 
-        self.__project_path = str()
+        # project location, meta parsing processes, role root listings
+        self.__config = {'project_path': str(), 'jobs': 1,
+                         'concurrency': self.DEFAULT_CONCURRENCY}
+        self.__stage_timer = StageTimer()
+        # role locations by name, role roots and collections watched
+        self.__locations = {'roles': dict(), 'roots': set()}
         self.__ansible_roles = dict()
 
-    def __get_ansible_role_dependencies(self, role_name, yml_path):
+    def __get_ansible_role_dependencies(self, meta_files):
+        """
+        Read Ansible role dependencies from yml files
+
+        @param meta_files: list of tuples (role name, yml path)
+        @type meta_files: list
+        """
+
+        results = dict()
+        yml_paths = list()
+
+        # unchanged meta files are taken from parse cache
+        for role_name, yml_path in meta_files:
+            cached = self._parse_cache.get(yml_path, 'role_meta')
+
+            if cached is None:
+                self.__logger.debug('Read role %s - %s', role_name, yml_path)
+                yml_paths.append(yml_path)
+            else:
+                self.__logger.debug('Cached role %s - %s', role_name, yml_path)
+                results[yml_path] = cached
+
+        with self.__stage_timer.measure('yaml_parse'):
+            parsed = self.__parse_meta_files(yml_paths)
+
+        self.__stage_timer.add_count('yaml_parse', 'files', len(yml_paths))
+        self.__stage_timer.add_count('yaml_parse', 'cached',
+                                     len(meta_files) - len(yml_paths))
+
+        for yml_path, dependencies in zip(yml_paths, parsed):
+            self._parse_cache.set(yml_path, 'role_meta', dependencies)
+            results[yml_path] = dependencies
+
+        for role_name, yml_path in meta_files:
+            self.__ansible_roles[role_name].extend(results[yml_path])
+
+    def __parse_meta_files(self, yml_paths):
+        """
+        Parse meta files, in worker processes if configured
+
+        @param yml_paths: locations of meta files
+        @type yml_paths: list
+
+        @return: list of dependency lists
+        """
+
+        # parse in worker processes only if there is something to share
+        jobs = self.__config['jobs']
+
+        if jobs > 1 and len(yml_paths) > 1:
+            pool = Pool(min(jobs, len(yml_paths)))
+            chunk_size = max(1, len(yml_paths) // (jobs * 4))
+
+            try:
+                parsed = pool.map(read_role_dependencies, yml_paths,
+                                  chunk_size)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            parsed = [read_role_dependencies(item) for item in yml_paths]
+
+        if self.__stage_timer.is_enabled():
+            self.__stage_timer.add_count(
+                'yaml_parse', 'bytes',
+                sum([os.path.getsize(item) for item in yml_paths]))
+
+        return parsed
+
+    def __get_configured_paths(self, options):
+        """
+        Return locations of first path option set in ansible.cfg
+
+        @param options: option names of defaults section, in precedence
+        @type options: list
+
+        @return: list
+        """
+
+        project_path = self.__config['project_path']
+        value = self._get_config_option(project_path, options)
+
+        if value is None:
+            return list()
+
+        return [
+            os.path.normpath(os.path.join(
+                project_path, os.path.expanduser(item.strip())))
+            for item in value.split(os.pathsep) if item.strip()
+            ]
+
+    def __get_collection_roots(self, collection_root):
+        """
+        Return role roots of all collections in ansible_collections directory
+
+        @param collection_root: location of ansible_collections directory
+        @type collection_root: str
+
+        @return: list of tuples (role root, role name prefix)
+        """
+
+        role_roots = list()
+        listing = self._scan_index.read_directory(collection_root)
+
+        for namespace in sorted(listing['directories'] + listing['links']):
+            namespace_path = collection_root + '/' + namespace
+            namespace_listing = self._scan_index.read_directory(
+                namespace_path)
+            self.__locations['roots'].add(os.path.abspath(namespace_path))
+
+            for collection in sorted(namespace_listing['directories'] +
+                                     namespace_listing['links']):
+                collection_path = namespace_path + '/' + collection
+                self.__locations['roots'].add(
+                    os.path.abspath(collection_path))
+                role_roots.append((collection_path + '/roles',
+                                   '%s.%s.' % (namespace, collection)))
+
+        return role_roots
+
+    def __get_role_roots(self):
+        """
+        Return existing role roots in Ansible search order
+
+        Project roles come first, then roles_path of ansible.cfg, vendored
+        galaxy roles and roles of collections.
+
+        @return: list of tuples (role root, role name prefix)
+        """
+
+        project_path = self.__config['project_path']
+        self.__locations['roots'] = set([
+            os.path.abspath(project_path),
+            os.path.abspath(project_path + '/ansible.cfg')])
+
+        roots = [
+            project_path + '/' + item
+            for item in self.PROJECT_ROLE_ROOTS
+            ]
+        roots.extend(self.__get_configured_paths(['roles_path']))
+        roots.extend([
+            project_path + '/' + item
+            for item in self.VENDORED_ROLE_ROOTS
+            ])
+        role_roots = [(item, '') for item in roots]
+
+        collection_roots = [
+            project_path + '/' + item for item in self.COLLECTION_ROOTS
+            ]
+        collection_roots.extend([
+            item + '/ansible_collections'
+            for item in self.__get_configured_paths(['collections_path',
+                                                     'collections_paths'])
+            ])
+
+        for item in collection_roots:
+            if os.path.isdir(item):
+                self.__locations['roots'].add(os.path.abspath(item))
+                role_roots.extend(self.__get_collection_roots(item))
+
+        # directories configured twice are searched once
+        seen = set()
+        existing = list()
+
+        for root, prefix in role_roots:
+            real_path = os.path.realpath(root)
+            self.__locations['roots'].add(os.path.abspath(root))
+
+            if real_path not in seen and os.path.isdir(root):
+                seen.add(real_path)
+                existing.append((root, prefix))
+
+        return existing
+
+    def __scan_role_root(self, role_root):
         """
-        Read Ansible role dependencies from yml file
+        Return roles of role root with their meta yml files
 
-        @param role_name: Ansible role name
-        @type role_name: str
-        @param yml_path: Location for yml file
-        @type yml_path: str
+        @param role_root: tuple (role root, role name prefix)
+        @type role_root: tuple
+
+        @return: list of tuples (role name, role path, meta files)
+        """
+
+        root, prefix = role_root
+
+        self.__logger.debug('Read roles directory - %s', root)
+
+        listing = self._scan_index.read_directory(root)
+
+        return [
+            (prefix + item, root + '/' + item,
+             self.__get_role_meta_files(prefix + item, root + '/' + item))
+            for item in sorted(listing['directories'] + listing['links'])
+            ]
+
+    def __get_roles(self):
+        """
+        Return roles of all role roots, first root wins for equal names
+
+        @return: tuple (role paths by name, list of tuples (role name,
+            yml path))
+        """
+
+        role_roots = self.__get_role_roots()
+
+        # one listing pass per root, roots are independent
+        if len(role_roots) > 1:
+            pool = ThreadPool(min(self.__config['concurrency'],
+                                  len(role_roots)))
+
+            try:
+                scanned = pool.map(self.__scan_role_root, role_roots)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            scanned = [self.__scan_role_root(item) for item in role_roots]
+
+        role_paths = dict()
+        meta_files = list()
+
+        for roles in scanned:
+            for role, role_path, role_meta_files in roles:
+                if role in role_paths:
+                    self.__logger.info('Role %s shadowed by %s - %s', role,
+                                       role_paths[role], role_path)
+                    continue
+
+                role_paths[role] = role_path
+                meta_files.extend(role_meta_files)
+
+        return role_paths, meta_files
+
+    def __get_role_meta_files(self, role, role_path):
+        """
+        Return meta yml files of a role
+
+        @param role: Ansible role name
+        @type role: str
+        @param role_path: location of role
+        @type role_path: str
+
+        @return: list of tuples (role name, yml path)
         """
 
-        self.__logger.debug('Read role %s - %s', role_name, yml_path)
+        meta_files = list()
+
+        if not os.path.isdir(role_path):
+            return meta_files
+
+        role_listing = self._scan_index.read_directory(role_path)
+
+        if 'meta' not in role_listing['directories'] + role_listing['links']:
+            return meta_files
 
-        with open(yml_path, 'r') as yml_file:
-            yml_content = yaml.safe_load(yml_file)
+        meta_path = role_path + '/meta'
+        meta_listing = self._scan_index.read_directory(meta_path)
 
-        if 'dependencies' in yml_content:
-            for item in yml_content['dependencies']:
-                if isinstance(item, dict):
-                    self.__ansible_roles[role_name].append(item['role'])
-                else:
-                    self.__ansible_roles[role_name].append(item)
+        for item in sorted(meta_listing['files']):
+            if fnmatch.fnmatch(item, '*.y*ml'):
+                meta_files.append((role, meta_path + '/' + item))
+
+        return meta_files
 
     def __get_ansible_roles(self):
         """ Read Ansible meta directories for yml files """
 
-        # define pattern
-        glob_pattern = self.__project_path + '/roles/*/meta/*.y*ml'
-        replace_pattern = self.__project_path + '/roles/'
+        self.__locations['roles'], meta_files = self.__get_roles()
+
+        # add roles into dictionary
+        for role, _ in meta_files:
+            self.__ansible_roles[role] = []
+
+        # get dependencies
+        self.__get_ansible_role_dependencies(meta_files)
+
+    @staticmethod
+    def __get_affected_role(path, role_names):
+        """
+        Return role of changed role, meta directory or meta file location
 
-        self.__logger.debug('Glob pattern - %s', glob_pattern)
+        @param path: absolute location of changed directory or file
+        @type path: str
+        @param role_names: role names by absolute role location
+        @type role_names: dict
 
-        # read directories
-        for item in glob.glob(glob_pattern):
+        @return: str or None
+        """
 
-            # get Ansible role name
-            role = item.replace(replace_pattern, '').rsplit('/', 2)
+        for candidate in [path, os.path.dirname(path),
+                          os.path.dirname(os.path.dirname(path))]:
+            role = role_names.get(candidate)
 
-            # add role into dictionary
-            self.__ansible_roles[role[0]] = []
+            if role is not None:
+                if candidate == path or \
+                        os.path.relpath(path, candidate).split(os.sep)[0] == \
+                        'meta':
+                    return role
+                return None
 
-            # get dependencies
-            self.__get_ansible_role_dependencies(role[0], item)
+        return None
 
-    def set_reader_config(self, ansible_project_path):
+    def set_reader_config(self, ansible_project_path, jobs=1,
+                          concurrency=DEFAULT_CONCURRENCY):
         """
         Settings for Ansible role reader
 
         @param ansible_project_path: Ansible project location
         @type ansible_project_path: str
+        @param jobs: number of processes to parse meta files
+        @type jobs: int
+        @param concurrency: number of role roots listed in parallel
+        @type concurrency: int
 
         @raise e: TypeError
         @raise e: ValueError
@@ -73,22 +387,35 @@ class AnsibleRoleReader(object):
 
         self.__logger.info('Set Ansible role reader configuration')
 
-        if not isinstance(ansible_project_path, str):
-            msg = 'Parameter: ansible_project_path needs to a string'
-            self.__logger.error(msg)
-            raise TypeError(msg)
+        self._check_path('ansible_project_path', ansible_project_path)
+        self._check_count('jobs', jobs)
+        self._check_count('concurrency', concurrency)
+
+        self.__config = {'project_path': str(ansible_project_path),
+                         'jobs': jobs, 'concurrency': concurrency}
+
+    def set_stage_timer(self, stage_timer):
+        """
+        Set stage timer to record YAML parsing
+
+        @param stage_timer: stage timer
+        @type stage_timer: StageTimer
+
+        @raise e: TypeError
+        """
 
-        if not ansible_project_path:
-            msg = 'Parameter: no ansible_project_path path provided'
-            self.__logger.error(msg)
-            raise ValueError(msg)
+        self._check_instance('stage_timer', stage_timer, StageTimer)
 
-        self.__project_path = str(ansible_project_path)
+        self.__stage_timer = stage_timer
 
     def get_ansible_roles(self):
         """
         Return dictionary with Ansible roles and dependencies list
 
+        Roles are read from project roles, roles_path of ansible.cfg,
+        galaxy_roles and collections, the first role root wins for roles
+        with equal names.
+
         @return: dict
         """
 
@@ -97,3 +424,84 @@ class AnsibleRoleReader(object):
         self.__get_ansible_roles()
 
         return self.__ansible_roles
+
+    def get_role_paths(self):
+        """
+        Return locations of roles read by get_ansible_roles
+
+        Shadowed roles are left out, so every location is the role Ansible
+        would use.
+
+        @return: dict of role locations by role name
+        """
+
+        return dict(self.__locations['roles'])
+
+    def update_ansible_roles(self, changed_paths):
+        """
+        Re-read roles affected by changed directories or files
+
+        The dictionary of get_ansible_roles is updated in place.
+
+        @param changed_paths: locations of changed directories and files
+        @type changed_paths: list
+
+        @return: bool, True if roles or dependencies changed
+        """
+
+        self.__logger.info('Update Ansible roles')
+
+        role_names = dict([
+            (os.path.abspath(path), role)
+            for role, path in self.__locations['roles'].iteritems()
+            ])
+        affected = set()
+        refresh = False
+
+        for item in changed_paths:
+            path = os.path.abspath(item)
+
+            # role roots or collections: roles added, removed or shadowed
+            if path in self.__locations['roots']:
+                refresh = True
+                continue
+
+            role = AnsibleRoleReader.__get_affected_role(path, role_names)
+
+            if role is not None:
+                affected.add(role)
+
+        if refresh:
+            role_paths, _ = self.__get_roles()
+            affected.update([
+                role
+                for role in set(role_paths) | set(self.__locations['roles'])
+                if role_paths.get(role) != self.__locations['roles'].get(role)
+                ])
+            self.__locations['roles'] = role_paths
+
+        if not affected:
+            return False
+
+        previous = dict([
+            (role, self.__ansible_roles.pop(role))
+            for role in affected if role in self.__ansible_roles
+            ])
+
+        meta_files = list()
+        for role in sorted(affected):
+            if role in self.__locations['roles']:
+                meta_files.extend(self.__get_role_meta_files(
+                    role, self.__locations['roles'][role]))
+
+        for role, _ in meta_files:
+            self.__ansible_roles[role] = []
+
+        self.__get_ansible_role_dependencies(meta_files)
+
+        current = dict([
+            (role, self.__ansible_roles[role])
+            for role in affected if role in self.__ansible_roles
+            ])
+
+        return current != previous
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+""" Artifact cache package """
+
+import errno
+import hashlib
+import logging
+import os
+
+
+class ArtifactCache(object):
+    """ Artifact cache class """
+
+    def __init__(self, force=False):
+        """
+        Artifact cache constructor
+
+        @param force: always treat artifacts as outdated
+        @type force: bool
+        """
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__force = bool(force)
+
+    @staticmethod
+    def get_digest(*parts):
+        """
+        Return hash over all given input parts
+
+        @param parts: strings the artifact is generated from
+        @type parts: str
+
+        @return: str
+        """
+
+        digest = hashlib.sha1()
+
+        for part in parts:
+            if isinstance(part, unicode):
+                part = part.encode('utf-8')
+            digest.update(part)
+            digest.update(b'\0')
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def __get_digest_path(artifact_path):
+        """
+        Return location of hash file for artifact
+
+        @param artifact_path: location of artifact
+        @type artifact_path: str
+
+        @return: str
+        """
+
+        directory, name = os.path.split(artifact_path)
+
+        return os.path.join(directory, '.' + name + '.sha1')
+
+    def is_current(self, artifact_path, digest):
+        """
+        Check if artifact exists and was generated from same input
+
+        @param artifact_path: location of artifact
+        @type artifact_path: str
+        @param digest: hash of current input
+        @type digest: str
+
+        @return: bool
+        """
+
+        if self.__force or not os.path.isfile(artifact_path):
+            return False
+
+        try:
+            with open(ArtifactCache.__get_digest_path(artifact_path),
+                      'r') as digest_file:
+                current = digest_file.read().strip() == digest
+        except IOError as error:
+            if error.errno != errno.ENOENT:
+                self.__logger.error(error)
+            return False
+
+        self.__logger.debug('Artifact %s current - %s', artifact_path, current)
+
+        return current
+
+    def update(self, artifact_path, digest):
+        """
+        Record input hash for generated artifact
+
+        @param artifact_path: location of artifact
+        @type artifact_path: str
+        @param digest: hash of input
+        @type digest: str
+        """
+
+        try:
+            with open(ArtifactCache.__get_digest_path(artifact_path),
+                      'w') as digest_file:
+                digest_file.write(digest + '\n')
+        except IOError as error:
+            self.__logger.error(error)
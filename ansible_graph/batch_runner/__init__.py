@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+""" Ansible graph batch runner package """
+
+import json
+import logging
+import os
+import time
+from multiprocessing import Pool
+
+from .. import AnsibleGraphRunner
+from ..configuration_reader import ReadConfiguration
+from ..parse_cache import ParseCache
+from ..report_generator import ReportGenerator
+from ..report_output import ReportOutput
+from ..scan_index import ScanIndex
+
+
+def run_batch_project(task):
+    """
+    Run documentation of one project, failures are returned not raised
+
+    Module level function, so it can be used by a process pool. Caches
+    shared by all projects are loaded but not saved, their entries are
+    returned for the batch runner to save them once.
+
+    @param task: tuple (project path, configuration path, configuration
+        content, options)
+    @type task: tuple
+
+    @return: tuple (summary dict, cache entries or None)
+    """
+
+    project_path, configuration_path, configuration_content, arg_options = \
+        task
+    logger = logging.getLogger(__name__)
+    start = time.time()
+    cache_entries = None
+
+    summary = {'project': project_path,
+               'location': configuration_content['location'],
+               'status': 'ok',
+               'error': None}
+
+    try:
+        if not os.path.isdir(project_path):
+            raise IOError('%s not found' % project_path)
+
+        runner = AnsibleGraphRunner(project_path, configuration_path,
+                                    arg_options, configuration_content)
+        runner.run_project_parser()
+
+        # each project keeps its report next to its graphs
+        report_path = '%s/report.%s' % (
+            configuration_content['location'],
+            ReportGenerator.FILE_EXTENSION[arg_options['report']])
+
+        with ReportOutput(report_path) as output:
+            runner.write_report(output)
+
+        summary.update(runner.get_statistics())
+        cache_entries = runner.get_cache_entries()
+
+        # steps skipped with a logged error fail the project as well
+        if runner.get_errors():
+            summary['status'] = 'failed'
+            summary['error'] = '; '.join(runner.get_errors())
+    except Exception as error:  # pylint: disable=broad-except
+        logger.error('%s - %s', project_path, error)
+        summary['status'] = 'failed'
+        summary['error'] = str(error)
+
+    summary['seconds'] = round(time.time() - start, 3)
+
+    return summary, cache_entries
+
+
+class AnsibleGraphBatchRunner(object):
+    """ Ansible graph batch runner class """
+
+    __LOGGER = logging.getLogger(__name__)
+
+    def __init__(self, project_paths, configuration_path, arg_options,
+                 processes=1):
+        """
+        Ansible graph batch runner constructor
+
+        @param project_paths: Ansible project directory locations
+        @type project_paths: list
+        @param configuration_path: Configuration file location
+        @type configuration_path: str
+        @param arg_options: application options for all projects
+        @type arg_options: dict
+        @param processes: number of projects documented in parallel
+        @type processes: int
+
+        @raise e: TypeError
+        @raise e: ValueError
+        """
+
+        if not isinstance(project_paths, list):
+            msg = 'Parameter: project_paths needs to a list'
+            self.__LOGGER.error(msg)
+            raise TypeError(msg)
+
+        if not project_paths:
+            msg = 'Parameter: no project_paths provided'
+            self.__LOGGER.error(msg)
+            raise ValueError(msg)
+
+        if not isinstance(arg_options, dict):
+            msg = 'Parameter: shared arg_options needs to a dictionary'
+            self.__LOGGER.error(msg)
+            raise TypeError(msg)
+
+        if not isinstance(processes, int):
+            msg = 'Parameter: processes needs to an integer'
+            self.__LOGGER.error(msg)
+            raise TypeError(msg)
+
+        if processes < 1:
+            msg = 'Parameter: processes needs to be greater than zero'
+            self.__LOGGER.error(msg)
+            raise ValueError(msg)
+
+        # configuration reader checks configuration_path
+        config = ReadConfiguration()
+        config.set_configuration(configuration_path)
+
+        self.__project_paths = [str(item) for item in project_paths]
+        self.__configuration_path = configuration_path
+        self.__config_content = config.get_configuration()
+        self.__arg_options = dict(arg_options)
+        self.__processes = processes
+        self.__summaries = list()
+
+        if 'location' not in self.__config_content:
+            msg = 'Configuration: no graph location in %s' % configuration_path
+            self.__LOGGER.error(msg)
+            raise ValueError(msg)
+
+    def __get_tasks(self):
+        """
+        Return one task per project with own output location
+
+        @return: list
+        """
+
+        tasks = list()
+        names = dict()
+
+        # pool workers can not start role parsing processes themselves
+        arg_options = dict(self.__arg_options)
+        arg_options['jobs'] = 1
+
+        # caches of all projects in location, saved once by run_batch
+        arg_options['cache_location'] = str(self.__config_content['location'])
+        arg_options['save_caches'] = False
+
+        for project_path in self.__project_paths:
+            name = os.path.basename(os.path.abspath(project_path))
+
+            # keep outputs of projects with same directory name apart
+            names[name] = names.get(name, 0) + 1
+            if names[name] > 1:
+                name = '%s_%s' % (name, names[name])
+
+            configuration = dict(self.__config_content)
+            configuration['location'] = \
+                str(self.__config_content['location']) + '/' + name
+
+            tasks.append((project_path, self.__configuration_path,
+                          configuration, arg_options))
+
+        return tasks
+
+    def run_batch(self):
+        """
+        Document all projects, each failure affects only its project
+
+        @return: list of summaries per project
+        """
+
+        tasks = self.__get_tasks()
+
+        self.__LOGGER.info('Run batch of %s projects', len(tasks))
+
+        if self.__processes > 1 and len(tasks) > 1:
+            pool = Pool(min(self.__processes, len(tasks)))
+
+            try:
+                results = pool.map(run_batch_project, tasks, 1)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [run_batch_project(task) for task in tasks]
+
+        self.__summaries = [summary for summary, _ in results]
+
+        self.__save_caches([entries for _, entries in results if entries])
+        self.__write_summary_file()
+
+        return self.__summaries
+
+    def __save_caches(self, cache_entries):
+        """
+        Save scan index and parse cache shared by all projects
+
+        @param cache_entries: tuples (scan index entries, parse cache
+            entries) per project
+        @type cache_entries: list
+        """
+
+        location = str(self.__config_content['location'])
+        scan_index = ScanIndex()
+        parse_cache = ParseCache()
+
+        try:
+            scan_index.set_index_location(location)
+            parse_cache.set_cache_config(location)
+        except (TypeError, ValueError) as error:
+            self.__LOGGER.error(error)
+            return
+
+        for index_entries, parse_entries in cache_entries:
+            scan_index.add_entries(index_entries)
+            parse_cache.add_entries(parse_entries)
+
+        scan_index.save()
+        parse_cache.save()
+
+    def __write_summary_file(self):
+        """ Write summaries as JSON into configured location """
+
+        location = str(self.__config_content['location'])
+
+        try:
+            if not os.path.isdir(location):
+                os.makedirs(location)
+
+            with open(location + '/summary.json', 'w') as summary_file:
+                json.dump(self.__summaries, summary_file, indent=4,
+                          sort_keys=True)
+        except (IOError, OSError) as error:
+            self.__LOGGER.error(error)
+
+    def write_summary(self, stream):
+        """
+        Write plain text summary of all projects to file-like object
+
+        @param stream: file-like object with write method
+        @type stream: object
+        """
+
+        double_line = '=' * 80
+        row = '{:<32} {:<7} {:>7} {:>7} {:>6} {:>6} {:>8}\n'
+
+        stream.write(double_line + '\n')
+        stream.write(row.format('Project', 'Status', 'Dirs', 'Files',
+                                'Roles', 'Cycles', 'Seconds'))
+        stream.write(double_line + '\n')
+
+        for summary in self.__summaries:
+            stream.write(row.format(
+                os.path.basename(summary['location'])[:32],
+                summary['status'],
+                summary.get('directories', '-'),
+                summary.get('files', '-'),
+                summary.get('roles', '-'),
+                summary.get('cycles', '-'),
+                summary['seconds']))
+
+        failed = [item for item in self.__summaries
+                  if item['status'] != 'ok']
+
+        stream.write(double_line + '\n')
+        stream.write('%s projects, %s failed\n' % (
+            len(self.__summaries), len(failed)))
+
+        for summary in failed:
+            stream.write(' - %s: %s\n' % (summary['project'],
+                                          summary['error']))
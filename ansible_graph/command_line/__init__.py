@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+""" Command line package, arguments and logging shared by all scripts """
+
+import argparse
+import logging
+
+REPORT_FORMATS = ['default', 'xml', 'json', 'ndjson']
+GRAPH_FORMATS = ['svg', 'png', 'tif', 'gif', 'jpg']
+
+
+def get_argument_parser(description):
+    """
+    Return argument parser with description, epilog and verbosity
+
+    @param description: description of script
+    @type description: str
+
+    @return: ArgumentParser
+    """
+
+    epilog = 'Please read the README for detailed description!'
+    parser = argparse.ArgumentParser(description=description, epilog=epilog)
+
+    parser.add_argument("-v", "--verbosity",
+                        action="count",
+                        help="increase output verbosity")
+
+    return parser
+
+
+def add_format_arguments(parser, graph_format='png', report=True):
+    """
+    Add graph and report output format arguments
+
+    @param parser: argument parser
+    @type parser: ArgumentParser
+    @param graph_format: default graph output format
+    @type graph_format: str
+    @param report: add report output format too
+    @type report: bool
+    """
+
+    if report:
+        parser.add_argument("-r", "--report",
+                            choices=REPORT_FORMATS,
+                            default='default',
+                            help="set report output format")
+
+    parser.add_argument("-f", "--format",
+                        choices=GRAPH_FORMATS,
+                        default=graph_format,
+                        help="set graph output format")
+
+
+def set_logging_level(verbosity, level=logging.ERROR):
+    """
+    Set logging level by count of verbosity arguments
+
+    @param verbosity: count of verbosity arguments
+    @type verbosity: int
+    @param level: logging level without verbosity argument
+    @type level: int
+    """
+
+    if verbosity > 1:
+        logging.basicConfig(level=logging.DEBUG)
+    elif verbosity == 1:
+        logging.basicConfig(level=logging.INFO)
+    else:
+        logging.basicConfig(level=level)
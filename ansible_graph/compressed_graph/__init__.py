@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+""" Compressed graph package """
+
+from array import array
+
+
+class CompressedGraph(object):
+    """ Compressed graph class, edges of integer nodes in offset arrays """
+
+    def __init__(self):
+        """ Compressed graph constructor """
+
+        # targets of node i in targets[offsets[i]:offsets[i + 1]]
+        self.__offsets = array('i', [0])
+        self.__targets = array('i')
+
+        # same for reversed edges
+        self.__reverse_offsets = array('i', [0])
+        self.__reverse_targets = array('i')
+
+    @staticmethod
+    def __compress(node_count, edges):
+        """
+        Return offsets and targets arrays for edge list
+
+        @param node_count: number of nodes
+        @type node_count: int
+        @param edges: list of tuples (source id, target id)
+        @type edges: list
+
+        @return: tuple (offsets, targets)
+        """
+
+        offsets = array('i', [0] * (node_count + 1))
+
+        for source, _ in edges:
+            offsets[source + 1] += 1
+
+        for index in xrange(node_count):
+            offsets[index + 1] += offsets[index]
+
+        position = array('i', offsets[:-1])
+        targets = array('i', [0] * len(edges))
+
+        for source, target in edges:
+            targets[position[source]] = target
+            position[source] += 1
+
+        return offsets, targets
+
+    @staticmethod
+    def __pop_component(node, stack, on_stack):
+        """
+        Pop strongly connected component with root node from Tarjan stack
+
+        @param node: root node of component
+        @type node: int
+        @param stack: Tarjan stack
+        @type stack: list
+        @param on_stack: flag per node if on stack
+        @type on_stack: array
+
+        @return: list of nodes
+        """
+
+        component = list()
+
+        while True:
+            member = stack.pop()
+            on_stack[member] = 0
+            component.append(member)
+            if member == node:
+                return component
+
+    def set_edges(self, node_count, edges):
+        """
+        Build graph from edge list, nodes are 0 to node_count - 1
+
+        @param node_count: number of nodes
+        @type node_count: int
+        @param edges: list of tuples (source id, target id)
+        @type edges: list
+        """
+
+        self.__offsets, self.__targets = CompressedGraph.__compress(
+            node_count, edges)
+        self.__reverse_offsets, self.__reverse_targets = \
+            CompressedGraph.__compress(
+                node_count, [(target, source) for source, target in edges])
+
+    def get_node_count(self):
+        """
+        Return number of nodes
+
+        @return: int
+        """
+
+        return len(self.__offsets) - 1
+
+    def get_edge_count(self):
+        """
+        Return number of edges
+
+        @return: int
+        """
+
+        return len(self.__targets)
+
+    def get_targets(self, node):
+        """
+        Return targets of edges starting at node
+
+        @param node: node id
+        @type node: int
+
+        @return: array
+        """
+
+        return self.__targets[self.__offsets[node]:self.__offsets[node + 1]]
+
+    def get_sources(self, node):
+        """
+        Return sources of edges ending at node
+
+        @param node: node id
+        @type node: int
+
+        @return: array
+        """
+
+        return self.__reverse_targets[self.__reverse_offsets[node]:
+                                      self.__reverse_offsets[node + 1]]
+
+    def find_components(self):
+        """
+        Return strongly connected components with iterative Tarjan
+
+        Components are returned after all components they have edges to.
+
+        @return: list of node lists
+        """
+
+        node_count = self.get_node_count()
+        offsets = self.__offsets
+        index = array('i', [-1] * node_count)
+        lowlink = array('i', [0] * node_count)
+        on_stack = array('b', [0] * node_count)
+        stack = list()
+        components = list()
+        counter = 0
+
+        for root in xrange(node_count):
+            if index[root] != -1:
+                continue
+
+            # call stack of (node, next edge position)
+            work = [(root, offsets[root])]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+
+            while work:
+                node, edge = work[-1]
+
+                if edge < offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    target = self.__targets[edge]
+
+                    if index[target] == -1:
+                        index[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = 1
+                        work.append((target, offsets[target]))
+                    elif on_stack[target]:
+                        lowlink[node] = min(lowlink[node], index[target])
+                    continue
+
+                work.pop()
+
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    components.append(CompressedGraph.__pop_component(
+                        node, stack, on_stack))
+
+        return components
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+""" DOT writer package """
+
+import errno
+import hashlib
+import logging
+import subprocess
+
+
+class DotWriter(object):
+    """ DOT writer class """
+
+    # statements are collected and written in chunks of this size
+    CHUNK_STATEMENTS = 512
+
+    def __init__(self, stream, graph_name='g'):
+        """
+        DOT writer constructor, writes graph header
+
+        @param stream: file-like object with write method
+        @type stream: object
+        @param graph_name: name of digraph
+        @type graph_name: str
+
+        @raise e: TypeError
+        """
+
+        self.__logger = logging.getLogger(__name__)
+
+        if not hasattr(stream, 'write'):
+            msg = 'Parameter: stream needs to a file-like object'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        self.__stream = stream
+        self.__digest = hashlib.sha1()
+        self.__node_ids = dict()
+        self.__chunk = list()
+        self.__statements = 0
+        self.__closed = False
+
+        self.__write('digraph %s {\n' % DotWriter.quote(graph_name))
+
+    @staticmethod
+    def quote(value):
+        """
+        Return value as quoted DOT string
+
+        @param value: identifier or attribute value
+        @type value: str
+
+        @return: str
+        """
+
+        if isinstance(value, unicode):
+            value = value.encode('utf-8')
+
+        return '"%s"' % str(value).replace('\\', '\\\\').replace(
+            '"', '\\"').replace('\n', '\\n')
+
+    @staticmethod
+    def __get_attributes(attributes):
+        """
+        Return DOT attribute list of keyword arguments
+
+        @param attributes: attribute names and values
+        @type attributes: dict
+
+        @return: str
+        """
+
+        if not attributes:
+            return ''
+
+        return ' [%s]' % ' '.join([
+            '%s=%s' % (key, DotWriter.quote(value))
+            for key, value in sorted(attributes.iteritems())
+            ])
+
+    def __write(self, data):
+        """
+        Write data to stream and update source digest
+
+        @param data: DOT source
+        @type data: str
+        """
+
+        self.__digest.update(data)
+        self.__stream.write(data)
+
+    def __add_statement(self, statement):
+        """
+        Add statement to current chunk, write chunk if full
+
+        @param statement: DOT statement with indent and newline
+        @type statement: str
+        """
+
+        self.__chunk.append(statement)
+        self.__statements += 1
+
+        if len(self.__chunk) >= self.CHUNK_STATEMENTS:
+            self.flush()
+
+    def flush(self):
+        """ Write collected statements to stream """
+
+        if self.__chunk:
+            self.__write(''.join(self.__chunk))
+            self.__chunk = list()
+
+    def node(self, key, label=None, **attributes):
+        """
+        Add node once and return its compact identifier
+
+        Further calls with the same key only return the identifier.
+
+        @param key: unique key of node, e.g. relative path
+        @type key: str
+        @param label: displayed name, key if not given
+        @type label: str
+        @param attributes: further DOT attributes, e.g. shape
+        @type attributes: dict
+
+        @return: str
+        """
+
+        node_id = self.__node_ids.get(key)
+
+        if node_id is not None:
+            return node_id
+
+        node_id = 'n%d' % len(self.__node_ids)
+        self.__node_ids[key] = node_id
+        attributes['label'] = key if label is None else label
+        self.__add_statement('\t%s%s\n' % (
+            node_id, DotWriter.__get_attributes(attributes)))
+
+        return node_id
+
+    def edge(self, tail_key, head_key, **attributes):
+        """
+        Add edge between nodes, unknown nodes are added with key as label
+
+        @param tail_key: key of start node
+        @type tail_key: str
+        @param head_key: key of end node
+        @type head_key: str
+        @param attributes: DOT attributes, e.g. color
+        @type attributes: dict
+        """
+
+        self.__add_statement('\t%s -> %s%s\n' % (
+            self.node(tail_key), self.node(head_key),
+            DotWriter.__get_attributes(attributes)))
+
+    def close(self):
+        """ Write remaining statements and graph footer """
+
+        if self.__closed:
+            return
+
+        self.flush()
+        self.__write('}\n')
+        self.__closed = True
+
+    def get_node_count(self):
+        """
+        Return number of distinct nodes
+
+        @return: int
+        """
+
+        return len(self.__node_ids)
+
+    def get_statement_count(self):
+        """
+        Return number of node and edge statements
+
+        @return: int
+        """
+
+        return self.__statements
+
+    def get_digest(self):
+        """
+        Return hash of source written so far
+
+        @return: str
+        """
+
+        return self.__digest.hexdigest()
+
+    @staticmethod
+    def render(source_path, graph_format, artifact_path, engine='dot'):
+        """
+        Render DOT source file with Graphviz, source is fed via stdin
+
+        @param source_path: location of DOT source
+        @type source_path: str
+        @param graph_format: Graphviz output format, e.g. png
+        @type graph_format: str
+        @param artifact_path: location of rendered graph
+        @type artifact_path: str
+        @param engine: Graphviz layout command
+        @type engine: str
+
+        @raise e: OSError
+        """
+
+        command = [engine, '-T' + graph_format, '-o', artifact_path]
+
+        with open(source_path, 'rb') as source_file:
+            try:
+                process = subprocess.Popen(command, stdin=source_file)
+            except OSError as error:
+                if error.errno != errno.ENOENT:
+                    raise
+                msg = 'Graphviz %s not found, needs to be in PATH' % engine
+                logging.getLogger(__name__).error(msg)
+                raise OSError(msg)
+
+            status = process.wait()
+
+        if status != 0:
+            msg = 'Graphviz %s failed with exit status %s - %s' % (
+                engine, status, source_path)
+            logging.getLogger(__name__).error(msg)
+            raise OSError(msg)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+""" File scanner package """
+
+import logging
+import mmap
+import os
+from multiprocessing import Pool
+
+from ..reader_base import ReaderBase
+
+
+def scan_chunk(task):
+    """
+    Scan chunk of files with scan function of reader
+
+    Module level function, so it can be used by a process pool. Files are
+    memory-mapped, empty files are scanned as empty string.
+
+    @param task: tuple (scan function, list of tuples (location, argument)),
+        the scan function is called with content and argument
+    @type task: tuple
+
+    @return: list of tuples (location, scan result)
+    """
+
+    scan_content, files = task
+    results = list()
+
+    for file_path, argument in files:
+        try:
+            with open(file_path, 'rb') as scanned_file:
+                if os.fstat(scanned_file.fileno()).st_size == 0:
+                    results.append((file_path, scan_content(str(), argument)))
+                    continue
+
+                content = mmap.mmap(scanned_file.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError):
+            continue
+
+        try:
+            results.append((file_path, scan_content(content, argument)))
+        finally:
+            content.close()
+
+    return results
+
+
+class FileScannerBase(ReaderBase):
+    """ File scanner class, readers scan role files with a single pattern """
+
+    # files per task of worker pool
+    CHUNK_SIZE = 256
+
+    def __init__(self):
+        """ File scanner constructor """
+
+        super(FileScannerBase, self).__init__()
+
+        self.__logger = logging.getLogger(__name__)
+
+        self._project_path = str()
+        self._jobs = 1
+        self._role_paths = dict()
+
+    def _get_directory_files(self, directory_path, extensions=None):
+        """
+        Return files in directory and its subdirectories
+
+        @param directory_path: location of directory or file
+        @type directory_path: str
+        @param extensions: extensions of returned files, all if None
+        @type extensions: list
+
+        @return: list of locations
+        """
+
+        if os.path.isfile(directory_path):
+            return [directory_path]
+
+        files = list()
+        pending = [directory_path] if os.path.isdir(directory_path) else []
+
+        while pending:
+            path = pending.pop()
+            listing = self._scan_index.read_directory(path)
+
+            files.extend([
+                path + '/' + item for item in listing['files']
+                if extensions is None or
+                os.path.splitext(item)[1] in extensions
+                ])
+            pending.extend([
+                path + '/' + item for item in listing['directories']
+                if not item.startswith('.')
+                ])
+
+        return files
+
+    def _get_role_files(self, directories, extensions=None):
+        """
+        Return files in directories of all roles
+
+        @param directories: role directories, e.g. tasks
+        @type directories: list
+        @param extensions: extensions of returned files, all if None
+        @type extensions: list
+
+        @return: dict of locations with role location
+        """
+
+        files = dict()
+
+        for role_path in sorted(self._role_paths):
+            for directory in directories:
+                files.update(dict.fromkeys(self._get_directory_files(
+                    role_path + '/' + directory, extensions), role_path))
+
+        return files
+
+    def _scan_files(self, scan_content, files):
+        """
+        Scan files in chunks, in worker processes if configured
+
+        @param scan_content: module level function, called with content and
+            argument of file
+        @type scan_content: callable
+        @param files: dict of locations with argument
+        @type files: dict
+
+        @return: list of tuples (location, scan result)
+        """
+
+        items = sorted(files.items())
+        chunks = [
+            (scan_content, items[index:index + self.CHUNK_SIZE])
+            for index in xrange(0, len(items), self.CHUNK_SIZE)
+            ]
+        results = list()
+
+        # scan in worker processes only if there is something to share
+        if self._jobs > 1 and len(chunks) > 1:
+            pool = Pool(min(self._jobs, len(chunks)))
+
+            try:
+                for chunk in pool.imap_unordered(scan_chunk, chunks):
+                    results.extend(chunk)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for chunk in chunks:
+                results.extend(scan_chunk(chunk))
+
+        return results
+
+    def set_reader_config(self, ansible_project_path, jobs=1):
+        """
+        Settings for reader
+
+        @param ansible_project_path: Ansible project location
+        @type ansible_project_path: str
+        @param jobs: number of processes to scan files
+        @type jobs: int
+
+        @raise e: TypeError
+        @raise e: ValueError
+        """
+
+        self.__logger.info('Set %s configuration', self.__class__.__name__)
+
+        self._check_path('ansible_project_path', ansible_project_path)
+        self._check_count('jobs', jobs)
+
+        # absolute, so resolved references compare equal to scanned files
+        self._project_path = os.path.abspath(str(ansible_project_path))
+        self._jobs = jobs
+
+    def set_role_paths(self, role_paths):
+        """
+        Set roles to scan, roles outside of project included
+
+        @param role_paths: role locations by role name, see
+            AnsibleRoleReader
+        @type role_paths: dict
+
+        @raise e: TypeError
+        """
+
+        if not isinstance(role_paths, dict):
+            msg = 'Parameter: role_paths needs to a dictionary'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        # role names by absolute location, like locations below the project
+        self._role_paths = dict([
+            (os.path.abspath(value), key)
+            for key, value in role_paths.iteritems()
+            ])
@@ -1,14 +1,29 @@
 # -*- coding: utf-8 -*-
 """ Graph generator package """
 
+import cgi
 import logging
-from graphviz import Digraph
+import os
+import re
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+from StringIO import StringIO
+
+from ..artifact_cache import ArtifactCache
+from ..dot_writer import DotWriter
+from ..role_dependency_graph import RoleDependencyGraph
+from ..stage_timer import StageTimer
 
 
 class GraphGenerator(object):
     """ Graph generator class """
 
-    ALLOWED_GRAPH_TYPES = ['project', 'roles']
+    ALLOWED_GRAPH_TYPES = ['project', 'roles', 'playbooks', 'inventory',
+                           'includes']
+    ALLOWED_PARTITION_MODES = ['auto', 'always', 'never']
+
+    # graphs with more nodes are partitioned in auto mode
+    PARTITION_THRESHOLD = 2000
 
     def __init__(self):
         """ Graph generator constructor """
@@ -17,43 +32,564 @@ class GraphGenerator(object):
 
         self.__graph_format = 'png'
         self.__graph_location = 'report/graph'
-        self.__dot = Digraph('g')
-        self.__graph_type = str()
+        self.__artifact_cache = ArtifactCache()
+        self.__dependency_graph = None
+        self.__partition_mode = 'auto'
+        self.__stage_timer = StageTimer()
 
-    def __set_project_graph(self, graph_content):
+    @staticmethod
+    def __set_project_graph(writer, graph_content):
         """
         Set project graph content
 
+        @param writer: graph to add content to
+        @type writer: DotWriter
         @param graph_content: graph content
         @type graph_content: dict
         """
 
-        for key, value in graph_content.iteritems():
-            self.__dot.node(str(key), shape='folder')
-            if value['directories']:
-                for item in value['directories']:
-                    self.__dot.node(str(item), shape='folder')
-                    self.__dot.edge(key, item)
-            if value['files']:
-                for item in value['files']:
-                    self.__dot.node(str(item), shape='note')
-                    self.__dot.edge(key, item)
+        for key, value in sorted(graph_content.iteritems()):
+            key = str(key)
+            writer.node(key, label=key.rsplit('/', 1)[-1], shape='folder')
+
+            # nested directories and files are keyed by their relative path,
+            # equal names in different directories stay separate nodes
+            prefix = '' if key == 'root' else key + '/'
+
+            for item in value['directories']:
+                writer.node(prefix + str(item), label=str(item),
+                            shape='folder')
+                writer.edge(key, prefix + str(item))
 
-    def __set_role_graph(self, graph_content):
+            for item in value['files']:
+                writer.node(prefix + str(item), label=str(item), shape='note')
+                writer.edge(key, prefix + str(item))
+
+    @staticmethod
+    def __set_role_graph(writer, graph_content, dependency_graph):
         """
         Set role graph content
 
+        @param writer: graph to add content to
+        @type writer: DotWriter
         @param graph_content: graph content
         @type graph_content: dict
+        @param dependency_graph: graph built from all roles
+        @type dependency_graph: RoleDependencyGraph
         """
 
-        for key, value in graph_content.iteritems():
-            self.__dot.node(str(key))
+        for key, value in sorted(graph_content.iteritems()):
+            writer.node(str(key))
             if value:
                 for item in value:
-                    self.__dot.edge(key, item)
+                    # highlight dependency cycles
+                    if dependency_graph.is_cycle_edge(key, item):
+                        writer.edge(str(key), str(item), color='red')
+                    else:
+                        writer.edge(str(key), str(item))
+
+    @staticmethod
+    def __set_playbook_graph(writer, graph_content):
+        """
+        Set playbook graph content
+
+        @param writer: graph to add content to
+        @type writer: DotWriter
+        @param graph_content: graph content
+        @type graph_content: dict
+        """
+
+        for key, value in sorted(graph_content.iteritems()):
+            playbook = 'playbook:' + str(key)
+            writer.node(playbook, label=str(key), shape='note')
+
+            for index, play in enumerate(value['plays']):
+                node = '%s:play:%d' % (playbook, index)
+                writer.node(node, label=str(play['name'] or
+                                            'play %d' % (index + 1)),
+                            shape='box')
+                writer.edge(playbook, node)
+
+                for item in play['hosts']:
+                    writer.node('hosts:' + str(item), label=str(item),
+                                shape='ellipse')
+                    writer.edge(node, 'hosts:' + str(item))
+
+                for item in play['roles']:
+                    writer.node('role:' + str(item), label=str(item),
+                                shape='folder')
+                    writer.edge(node, 'role:' + str(item))
+
+            for item in value['imports']:
+                writer.node('playbook:' + str(item), label=str(item),
+                            shape='note')
+                writer.edge(playbook, 'playbook:' + str(item), style='dashed')
+
+    @staticmethod
+    def __set_inventory_graph(writer, graph_content):
+        """
+        Set inventory group hierarchy content, hosts are only counted
+
+        @param writer: graph to add content to
+        @type writer: DotWriter
+        @param graph_content: graph content, see InventoryIndex
+        @type graph_content: dict
+        """
+
+        for key, value in sorted(graph_content.iteritems()):
+            label = '%s\n%s hosts' % (key, value['hosts'])
+
+            # groups with group_vars are drawn bold
+            if value['group_vars']:
+                writer.node(str(key), label=label, shape='box', style='bold')
+            else:
+                writer.node(str(key), label=label, shape='box')
+
+        # edges after nodes, children are declared with their labels
+        for key, value in sorted(graph_content.iteritems()):
+            for item in value['children']:
+                writer.edge(str(key), str(item))
+
+    @staticmethod
+    def __set_include_graph(writer, graph_content):
+        """
+        Set task and template include content
+
+        @param writer: graph to add content to
+        @type writer: DotWriter
+        @param graph_content: graph content, see AnsibleIncludeReader
+        @type graph_content: dict
+        """
+
+        for key, value in sorted(graph_content.iteritems()):
+            writer.node(str(key), shape='note')
+
+            for item in value['includes']:
+                writer.node(str(item), shape='note')
+
+            for item in value['roles']:
+                writer.node('role:' + str(item), label=str(item),
+                            shape='folder')
+
+            # unresolved references stay visible
+            for item in value['missing']:
+                writer.node('missing:' + str(item), label=str(item),
+                            shape='note', style='dashed', color='red')
+
+        # edges after nodes, included files are declared with their shape
+        for key, value in sorted(graph_content.iteritems()):
+            for item in value['includes']:
+                writer.edge(str(key), str(item))
+
+            for item in value['roles']:
+                writer.edge(str(key), 'role:' + str(item), style='dashed')
+
+            for item in value['missing']:
+                writer.edge(str(key), 'missing:' + str(item), color='red')
+
+    def __write_source(self, graph_content, graph_type, stream):
+        """
+        Write DOT source of graph content to stream
+
+        @param graph_content: content for graph
+        @type graph_content: dict
+        @param graph_type: output type for graph
+        @type graph_type: str
+        @param stream: file-like object with write method
+        @type stream: object
+
+        @return: DotWriter, closed writer with digest and counts
+        """
+
+        writer = DotWriter(stream)
+
+        if graph_type == 'project':
+            GraphGenerator.__set_project_graph(writer, graph_content)
+        elif graph_type == 'playbooks':
+            GraphGenerator.__set_playbook_graph(writer, graph_content)
+        elif graph_type == 'inventory':
+            GraphGenerator.__set_inventory_graph(writer, graph_content)
+        elif graph_type == 'includes':
+            GraphGenerator.__set_include_graph(writer, graph_content)
+        else:
+            GraphGenerator.__set_role_graph(writer, graph_content,
+                                            self.__dependency_graph)
+
+        writer.close()
+
+        return writer
+
+    def __get_dependency_graph(self, graph_content):
+        """
+        Return role dependency graph, build it if not set
+
+        @param graph_content: roles graph content
+        @type graph_content: dict
+
+        @return: RoleDependencyGraph
+        """
+
+        if self.__dependency_graph is None:
+            self.__dependency_graph = RoleDependencyGraph()
+            self.__dependency_graph.set_role_content(graph_content)
+
+        return self.__dependency_graph
+
+    @staticmethod
+    def __count_nodes(graph_content, graph_type):
+        """
+        Return approximate number of nodes for graph content
+
+        @param graph_content: content for graph
+        @type graph_content: dict
+        @param graph_type: output type for graph
+        @type graph_type: str
+
+        @return: int
+        """
+
+        if graph_type == 'project':
+            return sum([
+                1 + len(value['files']) + len(value['directories'])
+                for value in graph_content.itervalues()
+                ])
+
+        if graph_type == 'inventory':
+            return len(graph_content)
+
+        if graph_type == 'includes':
+            return sum([
+                1 + len(value['includes']) + len(value['roles']) +
+                len(value['missing'])
+                for value in graph_content.itervalues()
+                ])
+
+        if graph_type == 'playbooks':
+            return sum([
+                1 + sum([1 + len(play['hosts']) + len(play['roles'])
+                         for play in value['plays']])
+                for value in graph_content.itervalues()
+                ])
+
+        return len(graph_content) + sum([
+            len(value or list()) for value in graph_content.itervalues()
+            ])
+
+    def __get_role_clusters(self, roles, graph_content, levels):
+        """
+        Split roles of a connected component into clusters of consecutive
+        dependency levels, each within the partition threshold
+
+        Roles of a level larger than the threshold are split in name order.
+        Dependencies into other clusters stay as edges.
+
+        @param roles: roles of component
+        @type roles: list
+        @param graph_content: roles graph content
+        @type graph_content: dict
+        @param levels: dependency level by role
+        @type levels: dict
+
+        @return: list of role lists
+        """
+
+        by_level = dict()
+
+        for role in roles:
+            by_level.setdefault(levels[role], list()).append(role)
 
-    def set_graph_config(self, graph_format, graph_location):
+        clusters = [list()]
+        size = 0
+
+        for level in sorted(by_level):
+            level_roles = sorted(by_level[level])
+            level_size = sum([
+                1 + len(graph_content[role] or list()) for role in level_roles
+                ])
+
+            # whole level into next cluster if it does not fit anymore
+            if size and size + level_size > self.PARTITION_THRESHOLD:
+                clusters.append(list())
+                size = 0
+
+            for role in level_roles:
+                role_size = 1 + len(graph_content[role] or list())
+
+                # oversized level, split in name order
+                if size and size + role_size > self.PARTITION_THRESHOLD:
+                    clusters.append(list())
+                    size = 0
+
+                clusters[-1].append(role)
+                size += role_size
+
+        return clusters
+
+    def __get_role_partitions(self, graph_content):
+        """
+        Split roles graph content per connected component, huge components
+        per cluster of dependency levels
+
+        @param graph_content: roles graph content
+        @type graph_content: dict
+
+        @return: list of tuples (partition name, partition content)
+        """
+
+        partitions = dict()
+        dependency_graph = self.__get_dependency_graph(graph_content)
+        levels = dependency_graph.get_levels()
+
+        for index, component in enumerate(
+                dependency_graph.get_connected_components()):
+            roles = [role for role in component if role in graph_content]
+            clusters = self.__get_role_clusters(roles, graph_content, levels)
+
+            for cluster_index, cluster in enumerate(clusters):
+                name = '%03d_%s' % (index, component[0])
+                if len(clusters) > 1:
+                    name += '_%03d' % cluster_index
+                partitions[name] = dict([
+                    (role, graph_content[role]) for role in cluster
+                    ])
+
+        return sorted([item for item in partitions.items() if item[1]])
+
+    def __get_partitions(self, graph_content, graph_type):
+        """
+        Split graph content per directory, playbook, group, role files or
+        role component, huge components per cluster of dependency levels
+
+        @param graph_content: content for graph
+        @type graph_content: dict
+        @param graph_type: output type for graph
+        @type graph_type: str
+
+        @return: list of tuples (partition name, partition content)
+        """
+
+        partitions = dict()
+
+        if graph_type == 'project':
+            for key, value in graph_content.iteritems():
+                partitions.setdefault(key.split('/', 1)[0], dict())[key] = value
+
+            return sorted(partitions.items())
+
+        # each playbook with its plays, imports stay as edges
+        if graph_type == 'playbooks':
+            return sorted([
+                (key, {key: value}) for key, value in graph_content.iteritems()
+                ])
+
+        # files of each role, includes of other roles stay as edges
+        if graph_type == 'includes':
+            for key, value in graph_content.iteritems():
+                partitions.setdefault(value['role'], dict())[key] = value
+
+            return sorted(partitions.items())
+
+        # each top level group with all its descendants
+        if graph_type == 'inventory':
+            for name in graph_content.get('all', dict()).get('children', []):
+                partition = dict()
+                pending = [name]
+
+                while pending:
+                    group = pending.pop()
+                    if group not in partition:
+                        partition[group] = graph_content[group]
+                        pending.extend(graph_content[group]['children'])
+
+                partitions[name] = partition
+
+            return sorted(partitions.items())
+
+        return self.__get_role_partitions(graph_content)
+
+    def __write_source_file(self, graph_content, graph_type, location):
+        """
+        Write DOT source of graph content into file
+
+        @param graph_content: content for graph
+        @type graph_content: dict
+        @param graph_type: output type for graph
+        @type graph_type: str
+        @param location: location of DOT source
+        @type location: str
+
+        @return: DotWriter, closed writer with digest and counts
+        """
+
+        directory = os.path.dirname(location)
+
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(location, 'wb') as source_file:
+            return self.__write_source(graph_content, graph_type, source_file)
+
+    def __render_graph(self, writer, location):
+        """
+        Render graph source, unless same source was rendered before
+
+        @param writer: closed writer of DOT source in location
+        @type writer: DotWriter
+        @param location: location of DOT source, without format extension
+        @type location: str
+
+        @return: str, location of rendered artifact
+        """
+
+        artifact = location + '.' + self.__graph_format
+        digest = ArtifactCache.get_digest(writer.get_digest(),
+                                          self.__graph_format, 'dot')
+
+        if self.__artifact_cache.is_current(artifact, digest):
+            self.__logger.info('Graph unchanged - %s', artifact)
+            return artifact
+
+        DotWriter.render(location, self.__graph_format, artifact)
+        self.__artifact_cache.update(artifact, digest)
+
+        return artifact
+
+    @staticmethod
+    def __get_partition_location(directory, name):
+        """
+        Return location of partition source inside partition directory
+
+        Names are made safe for file names and get a hash of the partition
+        name, so distinct partitions never share files.
+
+        @param directory: location of partitions
+        @type directory: str
+        @param name: partition name
+        @type name: str
+
+        @return: str
+        """
+
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', name).lstrip('.')
+
+        return '%s/%s_%s' % (directory, safe_name or 'partition',
+                             ArtifactCache.get_digest(name)[:8])
+
+    def __render_partition(self, partition):
+        """
+        Build and render single partition
+
+        @param partition: tuple (graph type, partition name, content, directory)
+        @type partition: tuple
+
+        @return: str, location of rendered artifact
+        """
+
+        graph_type, name, content, directory = partition
+        location = GraphGenerator.__get_partition_location(directory, name)
+
+        writer = self.__write_source_file(content, graph_type, location)
+
+        return self.__render_graph(writer, location)
+
+    def __remove_stale_partitions(self, directory, artifacts):
+        """
+        Remove sources, artifacts and digests of former partitions
+
+        @param directory: location of partitions
+        @type directory: str
+        @param artifacts: locations of rendered artifacts of all partitions
+        @type artifacts: list
+        """
+
+        current = set(['index.html'])
+
+        for artifact in artifacts:
+            name = os.path.basename(artifact)
+            current.update([name, os.path.splitext(name)[0],
+                            '.' + name + '.sha1'])
+
+        for name in os.listdir(directory):
+            path = directory + '/' + name
+
+            if name not in current and os.path.isfile(path):
+                self.__logger.debug('Remove stale partition file - %s', path)
+                os.remove(path)
+
+    def __write_partition_index(self, directory, graph_type, artifacts):
+        """
+        Write html page linking all partitions
+
+        @param directory: location of partitions
+        @type directory: str
+        @param graph_type: output type for graph
+        @type graph_type: str
+        @param artifacts: list of tuples (partition name, artifact location)
+        @type artifacts: list
+        """
+
+        title = cgi.escape('%s graph' % graph_type)
+
+        with open(directory + '/index.html', 'w') as index_file:
+            index_file.write('<!DOCTYPE html>\n<html>\n<head>\n'
+                             '<meta charset="utf-8">\n'
+                             '<title>%s</title>\n</head>\n<body>\n'
+                             '<h1>%s</h1>\n<ul>\n' % (title, title))
+
+            for name, artifact in artifacts:
+                index_file.write('<li><a href="%s">%s</a></li>\n' % (
+                    cgi.escape(os.path.basename(artifact), True),
+                    cgi.escape(name)))
+
+            index_file.write('</ul>\n</body>\n</html>\n')
+
+        self.__logger.info('Graph index - %s/index.html', directory)
+
+    def __generate_partitioned_graph(self, graph_content, graph_type):
+        """
+        Render each partition as own file in parallel and write index
+
+        @param graph_content: content for graph
+        @type graph_content: dict
+        @param graph_type: output type for graph
+        @type graph_type: str
+
+        @return: str, location of partition index
+        """
+
+        if graph_type == 'roles':
+            self.__get_dependency_graph(graph_content)
+
+        # graph source of unpartitioned graph is stored as <location>/<type>
+        directory = self.__graph_location + '/' + graph_type + '_partitions'
+        partitions = [
+            (graph_type, name, content, directory)
+            for name, content in self.__get_partitions(graph_content,
+                                                       graph_type)
+            ]
+
+        self.__logger.info('Render %s %s partitions', len(partitions),
+                           graph_type)
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        pool = ThreadPool(max(1, min(len(partitions), cpu_count())))
+
+        try:
+            artifacts = pool.map(self.__render_partition, partitions)
+        finally:
+            pool.close()
+            pool.join()
+
+        self.__write_partition_index(
+            directory, graph_type,
+            zip([partition[1] for partition in partitions], artifacts))
+        self.__remove_stale_partitions(directory, artifacts)
+
+        return directory + '/index.html'
+
+    def set_graph_config(self, graph_format, graph_location, force=False):
         """
         Configuration for graph
 
@@ -61,6 +597,8 @@ class GraphGenerator(object):
         @type graph_format: str
         @param graph_location: define location for generated graph
         @type graph_location: str
+        @param force: render graph even if source did not change
+        @type force: bool
 
         @raise e: TypeError
         @raise e: ValueError
@@ -85,35 +623,87 @@ class GraphGenerator(object):
 
         self.__graph_format = str(graph_format)
         self.__graph_location = str(graph_location)
+        self.__artifact_cache = ArtifactCache(force)
+
+    def set_partition_mode(self, partition_mode):
+        """
+        Set partitioning of graphs into one file per part
+
+        @param partition_mode: partition mode [auto, always, never]
+        @type partition_mode: str
+
+        @raise e: TypeError
+        @raise e: ValueError
+        """
+
+        if not isinstance(partition_mode, str):
+            msg = 'Parameter: partition_mode needs to a string'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        if partition_mode.lower() not in self.ALLOWED_PARTITION_MODES:
+            msg = 'Parameter: partition_mode not allowed'
+            self.__logger.error(msg)
+            raise ValueError(msg)
 
-    def __run_graph_generation(self, graph_content):
+        self.__partition_mode = partition_mode.lower()
+
+    def set_stage_timer(self, stage_timer):
+        """
+        Set stage timer to record DOT build and render
+
+        @param stage_timer: stage timer
+        @type stage_timer: StageTimer
+
+        @raise e: TypeError
+        """
+
+        if not isinstance(stage_timer, StageTimer):
+            msg = 'Parameter: stage_timer needs to a StageTimer'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        self.__stage_timer = stage_timer
+
+    def set_dependency_graph(self, dependency_graph):
         """
-        Run Graphviz generation
+        Set role dependency graph, built from roles graph content
+
+        @param dependency_graph: role dependency graph
+        @type dependency_graph: RoleDependencyGraph
+
+        @raise e: TypeError
+        """
+
+        if not isinstance(dependency_graph, RoleDependencyGraph):
+            msg = 'Parameter: dependency_graph needs to a RoleDependencyGraph'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        self.__dependency_graph = dependency_graph
+
+    def get_graph_source(self, graph_content, graph_type):
+        """
+        Return DOT source of unpartitioned graph without rendering
 
         @param graph_content: content for graph
         @type graph_content: dict
+        @param graph_type: output type for graph
+            [project, roles, playbooks, inventory, includes]
+        @type graph_type: str
+
+        @return: str
         """
 
-        for key, value in graph_content.iteritems():
+        graph_type = graph_type.lower()
+        source = StringIO()
 
-            # generate role graph
-            if self.__graph_type == 'roles':
-                self.__dot.node(str(key))
-                if value:
-                    for item in value:
-                        self.__dot.edge(key, item)
+        if graph_type == 'roles':
+            self.__get_dependency_graph(graph_content)
 
-            # generate directory graph
-            if self.__graph_type == 'project':
-                self.__dot.node(str(key), shape='folder')
-                if value['directories']:
-                    for item in value['directories']:
-                        self.__dot.node(str(item), shape='folder')
-                        self.__dot.edge(key, item)
-                if value['files']:
-                    for item in value['files']:
-                        self.__dot.node(str(item), shape='note')
-                        self.__dot.edge(key, item)
+        self.__write_source(graph_content, graph_type, source)
+
+        return source.getvalue()
 
     def generate_graph(self, graph_content, graph_type):
         """
@@ -124,6 +714,7 @@ class GraphGenerator(object):
         @param graph_type: output type for graph
         @type graph_type: str
 
+        @return: str, location of rendered graph or partition index
         @raise e: TypeError
         @raise e: ValueError
         """
@@ -155,18 +746,32 @@ class GraphGenerator(object):
 
         self.__logger.debug('%s', graph_content)
 
-        # set graph content
-        if graph_type.lower() == 'project':
-            self.__set_project_graph(graph_content)
+        graph_type = graph_type.lower()
+
+        # split huge graphs, layout of a single graph would not finish
+        if self.__partition_mode == 'always' or (
+                self.__partition_mode == 'auto' and
+                GraphGenerator.__count_nodes(graph_content, graph_type) >
+                self.PARTITION_THRESHOLD):
+            with self.__stage_timer.measure('dot_partitions_' + graph_type):
+                return self.__generate_partitioned_graph(graph_content,
+                                                         graph_type)
+
+        if graph_type == 'roles':
+            self.__get_dependency_graph(graph_content)
 
-        if graph_type.lower() == 'roles':
-            self.__set_role_graph(graph_content)
+        location = self.__graph_location + '/' + graph_type
 
-        self.__logger.debug(self.__dot.source)
+        # stream graph source into file
+        with self.__stage_timer.measure('dot_build_' + graph_type):
+            writer = self.__write_source_file(graph_content, graph_type,
+                                              location)
 
-        # set graph format
-        self.__dot.format = self.__graph_format
+        self.__stage_timer.add_count('dot_build_' + graph_type, 'nodes',
+                                     writer.get_node_count())
+        self.__stage_timer.add_count('dot_build_' + graph_type, 'statements',
+                                     writer.get_statement_count())
 
         # render graph
-        location = self.__graph_location + '/' + graph_type.lower()
-        self.__dot.render(location)
+        with self.__stage_timer.measure('dot_render_' + graph_type):
+            return self.__render_graph(writer, location)
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+""" Ansible include reader package """
+
+import logging
+import os
+import re
+
+from ..file_scanner import FileScannerBase
+
+
+# single pattern for all files, the group name tells the kind of reference
+INCLUDE_PATTERN = re.compile(
+    # first two characters of all alternatives, most positions fail here
+    r'(?=[ait{][nme%])(?:'
+    # included or imported task files, free-form or with file parameter
+    r'\b(?:ansible\.builtin\.)?(?:include_tasks|import_tasks|include):'
+    r'[ \t]*(?:\n(?:[ \t]+[^\n]*\n){0,3}?[ \t]+file:[ \t]*|file=)?'
+    r'["\']?(?P<tasks>[^"\'\s#]+)'
+    # included or imported roles
+    r'|\b(?:ansible\.builtin\.)?(?:include_role|import_role):'
+    r'[ \t]*(?:\n(?:[ \t]+[^\n]*\n){0,3}?[ \t]+name:[ \t]*|name=)'
+    r'["\']?(?P<role>[^"\'\s#]+)'
+    # template sources
+    r'|\b(?:ansible\.builtin\.)?template:'
+    r'[ \t]*(?:\n(?:[ \t]+[^\n]*\n){0,3}?[ \t]+src:[ \t]*|[^\n]*?\bsrc=)'
+    r'["\']?(?P<template>[^"\'\s#]+)'
+    # jinja includes, parent templates and macro imports
+    r'|\{%-?[ \t]*(?:include|extends|import|from)[ \t]+["\']'
+    r'(?P<jinja>[^"\']+)["\'])')
+
+# role directory per kind of reference, relative references resolve there
+REFERENCE_DIRECTORIES = {'tasks': 'tasks', 'template': 'templates',
+                         'jinja': 'templates'}
+
+
+def scan_include_content(content, _):
+    """
+    Scan content for task, role, template and jinja references
+
+    Module level function, so it can be used by a process pool. Content is
+    matched with a single pattern, nothing is parsed.
+
+    @param content: file content, string or memory map
+    @type content: str
+
+    @return: list of tuples (kind, reference)
+    """
+
+    references = list()
+
+    for match in INCLUDE_PATTERN.finditer(content):
+        reference = (match.lastgroup, match.group(match.lastgroup))
+
+        # references with variables are only known at runtime
+        if '{{' not in reference[1] and reference not in references:
+            references.append(reference)
+
+    return references
+
+
+class AnsibleIncludeReader(FileScannerBase):
+    """ Ansible include reader class """
+
+    # role directories with task and template references
+    SCANNED_DIRECTORIES = ['tasks', 'handlers', 'templates']
+
+    def __init__(self):
+        """ Ansible include reader constructor """
+
+        super(AnsibleIncludeReader, self).__init__()
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__files = dict()
+        self.__references = dict()
+        self.__ansible_includes = dict()
+
+    def __get_files(self):
+        """
+        Return task, handler and template files of all roles
+
+        @return: dict of locations with role location
+        """
+
+        return self._get_role_files(self.SCANNED_DIRECTORIES)
+
+    def __scan_files(self, files):
+        """
+        Scan files for references
+
+        @param files: locations of files
+        @type files: list
+
+        @return: list of tuples (location, references)
+        """
+
+        return self._scan_files(scan_include_content, dict.fromkeys(files))
+
+    def __resolve(self, file_path, kind, reference):
+        """
+        Return location of referenced file, None if not found
+
+        Relative references are looked up next to the referencing file and
+        in the matching directory of its role, like Ansible does.
+
+        @param file_path: location of referencing file
+        @type file_path: str
+        @param kind: kind of reference [tasks, template, jinja]
+        @type kind: str
+        @param reference: referenced file as written
+        @type reference: str
+
+        @return: str or None
+        """
+
+        candidates = [
+            os.path.normpath(os.path.join(os.path.dirname(file_path),
+                                          reference)),
+            os.path.normpath(os.path.join(
+                self.__files[file_path], REFERENCE_DIRECTORIES[kind],
+                reference))
+            ]
+
+        for candidate in candidates:
+            if candidate in self.__files:
+                return candidate
+
+        return None
+
+    def __set_includes(self):
+        """ Resolve references of all files into include content """
+
+        includes = dict()
+
+        for file_path, references in sorted(self.__references.iteritems()):
+            if not references:
+                continue
+
+            value = {'role': self._role_paths[self.__files[file_path]],
+                     'includes': list(), 'roles': list(), 'missing': list()}
+
+            for kind, reference in references:
+                if kind == 'role':
+                    value['roles'].append(reference)
+                    continue
+
+                target = self.__resolve(file_path, kind, reference)
+
+                if target is None:
+                    value['missing'].append(reference)
+                else:
+                    value['includes'].append(
+                        os.path.relpath(target, self._project_path))
+
+            includes[os.path.relpath(file_path, self._project_path)] = value
+
+        # keep dictionary returned by get_ansible_includes up to date
+        self.__ansible_includes.clear()
+        self.__ansible_includes.update(includes)
+
+    def get_ansible_includes(self):
+        """
+        Return dictionary with files of roles and their references
+
+        Files are keyed by location relative to project, each with its role,
+        resolved included task files and templates, included roles and
+        references which could not be resolved.
+
+        @return: dict
+        """
+
+        self.__logger.info('Read Ansible includes')
+
+        self.__files = self.__get_files()
+        self.__references = dict(self.__scan_files(self.__files))
+        self.__set_includes()
+
+        return self.__ansible_includes
+
+    def update_ansible_includes(self, changed_paths):
+        """
+        Re-scan changed files and files added to scanned directories
+
+        The dictionary of get_ansible_includes is updated in place.
+
+        @param changed_paths: locations of changed directories and files
+        @type changed_paths: list
+
+        @return: bool, True if includes changed
+        """
+
+        changed = set([os.path.abspath(item) for item in changed_paths])
+        files = self.__get_files()
+
+        rescanned = [
+            path for path in files
+            if path not in self.__files or os.path.abspath(path) in changed
+            ]
+        removed = [path for path in self.__files if path not in files]
+
+        if not rescanned and not removed:
+            return False
+
+        self.__logger.info('Update Ansible includes')
+
+        previous = dict(self.__ansible_includes)
+
+        for path in removed:
+            self.__references.pop(path, None)
+
+        # added or removed files change resolution of other references
+        self.__files = files
+        self.__references.update(self.__scan_files(rescanned))
+        self.__set_includes()
+
+        return self.__ansible_includes != previous
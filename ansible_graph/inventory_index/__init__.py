@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+""" Inventory index package """
+
+import logging
+
+from ..compressed_graph import CompressedGraph
+
+
+class InventoryIndex(object):
+    """ Inventory index class """
+
+    # implicit groups of every inventory
+    ALL_GROUP = 'all'
+    UNGROUPED_GROUP = 'ungrouped'
+
+    def __init__(self):
+        """ Inventory index constructor """
+
+        self.__logger = logging.getLogger(__name__)
+
+        # interned group and host names, index in names is the id
+        self.__groups = {'names': list(), 'ids': dict()}
+        self.__hosts = {'names': list(), 'ids': dict()}
+
+        # membership from group id to host id, hierarchy parent to child
+        self.__membership = CompressedGraph()
+        self.__hierarchy = CompressedGraph()
+
+        # vars files by group and host id, files without match
+        self.__vars = {'group': dict(), 'host': dict(), 'unmatched': list()}
+
+    @staticmethod
+    def __intern(name, interned):
+        """
+        Return id of name, add name if unknown
+
+        @param name: group or host name
+        @type name: str
+        @param interned: names and ids by name
+        @type interned: dict
+
+        @return: int
+        """
+
+        name_id = interned['ids'].get(name)
+
+        if name_id is None:
+            name_id = len(interned['names'])
+            interned['ids'][name] = name_id
+            interned['names'].append(name)
+
+        return name_id
+
+    def __get_group_id(self, name):
+        """
+        Return id of group name
+
+        @param name: group name
+        @type name: str
+
+        @return: int
+        """
+
+        return InventoryIndex.__intern(name, self.__groups)
+
+    def __get_host_id(self, name):
+        """
+        Return id of host name
+
+        @param name: host name
+        @type name: str
+
+        @return: int
+        """
+
+        return InventoryIndex.__intern(name, self.__hosts)
+
+    def __get_group_names(self, group_ids):
+        """
+        Return group names of group ids
+
+        @param group_ids: group ids
+        @type group_ids: array
+
+        @return: list
+        """
+
+        return [self.__groups['names'][item] for item in group_ids]
+
+    def __read_groups(self, groups):
+        """
+        Return deduplicated membership and hierarchy edges of groups
+
+        @param groups: groups with hosts and children lists
+        @type groups: dict
+
+        @return: tuple (membership edges, hierarchy edges)
+        """
+
+        all_id = self.__get_group_id(self.ALL_GROUP)
+        ungrouped_id = self.__get_group_id(self.UNGROUPED_GROUP)
+
+        membership = set()
+        hierarchy = set()
+
+        for name in sorted(groups):
+            group_id = self.__get_group_id(name)
+
+            for host in groups[name].get('hosts') or list():
+                membership.add((group_id, self.__get_host_id(host)))
+
+            for child in groups[name].get('children') or list():
+                child_id = self.__get_group_id(child)
+                if child_id != group_id and child_id != all_id:
+                    hierarchy.add((group_id, child_id))
+
+        # hosts of all and ungrouped, top level ini lines included, belong
+        # to ungrouped only, unless in another group
+        membership = set([(group_id, host_id)
+                          for group_id, host_id in membership
+                          if group_id not in (all_id, ungrouped_id)])
+        grouped = set([host_id for _, host_id in membership])
+
+        for host_id in xrange(len(self.__hosts['names'])):
+            if host_id not in grouped:
+                membership.add((ungrouped_id, host_id))
+
+        # groups without parent are children of all
+        has_parent = set([child_id for _, child_id in hierarchy])
+
+        for group_id in xrange(len(self.__groups['names'])):
+            if group_id != all_id and group_id not in has_parent:
+                hierarchy.add((all_id, group_id))
+
+        return sorted(membership), sorted(hierarchy)
+
+    def __link_vars(self, vars_files, ids):
+        """
+        Return vars files by id of matching group or host
+
+        Files without matching group or host are added to unmatched vars.
+
+        @param vars_files: vars files by group or host name
+        @type vars_files: dict
+        @param ids: ids by group or host name
+        @type ids: dict
+
+        @return: dict
+        """
+
+        linked = dict()
+
+        for name, files in sorted(vars_files.iteritems()):
+            name_id = ids.get(name)
+
+            if name_id is None:
+                self.__vars['unmatched'].extend(files)
+            else:
+                linked.setdefault(name_id, list()).extend(files)
+
+        return linked
+
+    def set_inventory_content(self, inventory_content):
+        """
+        Build index from groups and group_vars/host_vars files
+
+        @param inventory_content: groups with hosts and children lists,
+            vars files by group and host name, see AnsibleInventoryReader
+        @type inventory_content: dict
+
+        @raise e: TypeError
+        """
+
+        if not isinstance(inventory_content, dict):
+            msg = 'Parameter: inventory_content needs to a dictionary'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        self.__groups = {'names': list(), 'ids': dict()}
+        self.__hosts = {'names': list(), 'ids': dict()}
+        self.__vars = {'group': dict(), 'host': dict(), 'unmatched': list()}
+
+        membership, hierarchy = self.__read_groups(
+            inventory_content.get('groups') or dict())
+
+        group_count = len(self.__groups['names'])
+        host_count = len(self.__hosts['names'])
+
+        # group and host ids share nodes, targets are hosts, sources groups
+        self.__membership.set_edges(max(group_count, host_count), membership)
+        self.__hierarchy.set_edges(group_count, hierarchy)
+
+        self.__vars['group'] = self.__link_vars(
+            inventory_content.get('group_vars') or dict(),
+            self.__groups['ids'])
+        self.__vars['host'] = self.__link_vars(
+            inventory_content.get('host_vars') or dict(),
+            self.__hosts['ids'])
+        self.__vars['unmatched'].sort()
+
+        self.__logger.debug('Inventory index - %s groups, %s hosts, '
+                            '%s memberships', group_count, host_count,
+                            len(membership))
+
+    def get_group_names(self):
+        """
+        Return all group names, including implicit all and ungrouped
+
+        @return: list
+        """
+
+        return list(self.__groups['names'])
+
+    def get_host_count(self):
+        """
+        Return number of distinct hosts
+
+        @return: int
+        """
+
+        return len(self.__hosts['names'])
+
+    def get_hosts(self, group):
+        """
+        Return hosts directly in group
+
+        @param group: group name
+        @type group: str
+
+        @return: list
+        """
+
+        return [
+            self.__hosts['names'][item]
+            for item in self.__membership.get_targets(
+                self.__groups['ids'][group])
+            ]
+
+    def get_groups(self, host):
+        """
+        Return groups the host is directly in
+
+        @param host: host name
+        @type host: str
+
+        @return: list
+        """
+
+        return self.__get_group_names(
+            self.__membership.get_sources(self.__hosts['ids'][host]))
+
+    def get_children(self, group):
+        """
+        Return child groups of group
+
+        @param group: group name
+        @type group: str
+
+        @return: list
+        """
+
+        return self.__get_group_names(
+            self.__hierarchy.get_targets(self.__groups['ids'][group]))
+
+    def get_parents(self, group):
+        """
+        Return parent groups of group
+
+        @param group: group name
+        @type group: str
+
+        @return: list
+        """
+
+        return self.__get_group_names(
+            self.__hierarchy.get_sources(self.__groups['ids'][group]))
+
+    def get_host_vars(self, host):
+        """
+        Return host_vars files of host
+
+        @param host: host name
+        @type host: str
+
+        @return: list
+        """
+
+        return list(self.__vars['host'].get(self.__hosts['ids'][host],
+                                            list()))
+
+    def get_group_hierarchy(self):
+        """
+        Return children, direct host count and group_vars files per group
+
+        @return: dict
+        """
+
+        hierarchy = dict()
+
+        for group_id, name in enumerate(self.__groups['names']):
+            hierarchy[name] = {
+                'children': sorted(self.__get_group_names(
+                    self.__hierarchy.get_targets(group_id))),
+                'hosts': len(self.__membership.get_targets(group_id)),
+                'group_vars': list(self.__vars['group'].get(group_id,
+                                                            list()))}
+
+        return hierarchy
+
+    def get_host_vars_count(self):
+        """
+        Return number of hosts with host_vars files
+
+        @return: int
+        """
+
+        return len(self.__vars['host'])
+
+    def get_unmatched_vars(self):
+        """
+        Return group_vars/host_vars files without matching group or host
+
+        @return: list
+        """
+
+        return list(self.__vars['unmatched'])
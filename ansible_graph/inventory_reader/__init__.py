@@ -0,0 +1,471 @@
+# -*- coding: utf-8 -*-
+""" Ansible inventory reader package """
+
+import logging
+import os
+import re
+import string
+
+from ..reader_base import ReaderBase, read_yaml_file
+
+
+class AnsibleInventoryReader(ReaderBase):
+    """ Ansible inventory reader class """
+
+    # inventory files and directories looked up in project root
+    DEFAULT_SOURCES = ['hosts', 'hosts.ini', 'hosts.yml', 'hosts.yaml',
+                       'inventory', 'inventory.ini', 'inventory.yml',
+                       'inventory.yaml', 'inventories']
+
+    # files in inventory directories with other extensions are skipped
+    SOURCE_EXTENSIONS = ['', '.ini', '.yml', '.yaml']
+
+    VARS_DIRECTORIES = ['group_vars', 'host_vars']
+    VARS_EXTENSIONS = ['', '.yml', '.yaml', '.json']
+
+    # host range, e.g. web[01:20].example.com or db-[a:f]
+    __HOST_RANGE = re.compile(r'\[([^\]:]*):([^\]:]*)(?::([0-9]+))?\]')
+
+    def __init__(self):
+        """ Ansible inventory reader constructor """
+
+        super(AnsibleInventoryReader, self).__init__()
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__project_path = str()
+        self.__sources = list()
+        self.__vars_paths = list()
+        self.__ansible_inventory = dict()
+
+    @staticmethod
+    def __expand_hosts(pattern):
+        """
+        Yield host names of pattern with numeric or alphabetic ranges
+
+        @param pattern: host pattern, e.g. web[01:20:2].example.com
+        @type pattern: str
+
+        @return: generator
+        @raise e: ValueError
+        """
+
+        match = AnsibleInventoryReader.__HOST_RANGE.search(pattern)
+
+        if match is None:
+            yield pattern
+            return
+
+        begin, end, step = match.groups()
+        begin = begin or '0'
+        step = int(step or 1)
+        head = pattern[:match.start()]
+
+        if not end or step < 1:
+            raise ValueError('Invalid host range - %s' % pattern)
+
+        if begin.isdigit() and end.isdigit():
+            # leading zeros define width of all names
+            width = len(begin) if begin.startswith('0') else 0
+            sequence = [str(item).zfill(width)
+                        for item in xrange(int(begin), int(end) + 1, step)]
+        elif begin in string.ascii_letters and end in string.ascii_letters:
+            sequence = list(string.ascii_letters[
+                string.ascii_letters.index(begin):
+                string.ascii_letters.index(end) + 1:step])
+        else:
+            raise ValueError('Invalid host range - %s' % pattern)
+
+        # further ranges of the tail are expanded once, not per item
+        tails = list(AnsibleInventoryReader.__expand_hosts(
+            pattern[match.end():]))
+
+        for item in sequence:
+            for tail in tails:
+                yield head + item + tail
+
+    @staticmethod
+    def __get_host_name(entry):
+        """
+        Return host name of inventory host entry without port
+
+        @param entry: host entry, e.g. db1:2222
+        @type entry: str
+
+        @return: str
+        """
+
+        if entry.count(':') == 1:
+            return entry.split(':', 1)[0]
+
+        return entry
+
+    @staticmethod
+    def __get_group(groups, name):
+        """
+        Return group of parse result, add group if unknown
+
+        @param groups: parsed groups
+        @type groups: dict
+        @param name: group name
+        @type name: str
+
+        @return: dict with hosts and children list
+        """
+
+        group = groups.get(name)
+
+        if group is None:
+            group = groups[name] = {'hosts': list(), 'children': list()}
+
+        return group
+
+    @staticmethod
+    def __parse_ini(source_path):
+        """
+        Return groups of INI inventory, single pass over lines
+
+        @param source_path: location of inventory file
+        @type source_path: str
+
+        @return: dict
+        """
+
+        groups = dict()
+        group = AnsibleInventoryReader.__get_group(groups, 'ungrouped')
+        section = 'hosts'
+
+        with open(source_path, 'r') as source_file:
+            for line in source_file:
+                line = line.strip()
+
+                if not line or line[0] in '#;':
+                    continue
+
+                if line.startswith('[') and line.endswith(']'):
+                    name = line[1:-1].strip()
+                    section = 'hosts'
+
+                    if ':' in name:
+                        name, section = name.rsplit(':', 1)
+
+                    group = AnsibleInventoryReader.__get_group(groups, name)
+                    continue
+
+                entry = line.split()[0]
+
+                if section == 'hosts':
+                    hosts = AnsibleInventoryReader.__expand_hosts(entry)
+                    group['hosts'].extend([
+                        AnsibleInventoryReader.__get_host_name(item)
+                        for item in hosts
+                        ])
+                elif section == 'children':
+                    group['children'].append(entry)
+                    AnsibleInventoryReader.__get_group(groups, entry)
+
+        return groups
+
+    @staticmethod
+    def __parse_yaml(source_path):
+        """
+        Return groups of YAML inventory
+
+        @param source_path: location of inventory file
+        @type source_path: str
+
+        @return: dict
+        @raise e: ValueError
+        """
+
+        content = read_yaml_file(source_path)
+
+        groups = dict()
+
+        if not isinstance(content, dict):
+            return groups
+
+        pending = [(str(name), value) for name, value in content.iteritems()]
+
+        while pending:
+            name, value = pending.pop()
+            group = AnsibleInventoryReader.__get_group(groups, name)
+
+            if not isinstance(value, dict):
+                continue
+
+            if isinstance(value.get('hosts'), dict):
+                for entry in value['hosts']:
+                    group['hosts'].extend([
+                        AnsibleInventoryReader.__get_host_name(item)
+                        for item in AnsibleInventoryReader.__expand_hosts(
+                            str(entry))
+                        ])
+
+            if isinstance(value.get('children'), dict):
+                for child, child_value in value['children'].iteritems():
+                    group['children'].append(str(child))
+                    pending.append((str(child), child_value))
+
+        return groups
+
+    @staticmethod
+    def __is_yaml(source_path):
+        """
+        Check if inventory file is YAML by extension or first line
+
+        @param source_path: location of inventory file
+        @type source_path: str
+
+        @return: bool
+        """
+
+        if os.path.splitext(source_path)[1] in ['.yml', '.yaml']:
+            return True
+
+        with open(source_path, 'r') as source_file:
+            for line in source_file:
+                line = line.strip()
+                if line and line[0] not in '#;':
+                    return line == '---' or line.endswith(':')
+
+        return False
+
+    def __parse_source(self, source_path):
+        """
+        Return groups of inventory file, cached if unchanged
+
+        @param source_path: location of inventory file
+        @type source_path: str
+
+        @return: dict
+        @raise e: ValueError
+        """
+
+        cached = self._parse_cache.get(source_path, 'inventory')
+
+        if cached is not None:
+            self.__logger.debug('Cached inventory - %s', source_path)
+            return cached
+
+        self.__logger.debug('Read inventory - %s', source_path)
+
+        if AnsibleInventoryReader.__is_yaml(source_path):
+            groups = AnsibleInventoryReader.__parse_yaml(source_path)
+        else:
+            groups = AnsibleInventoryReader.__parse_ini(source_path)
+
+        self._parse_cache.set(source_path, 'inventory', groups)
+
+        return groups
+
+    def __get_configured_sources(self):
+        """
+        Return inventory locations of ansible.cfg in project root
+
+        @return: list
+        """
+
+        value = self._get_config_option(self.__project_path, ['inventory'])
+
+        if value is None:
+            return list()
+
+        return [
+            os.path.join(self.__project_path, item.strip())
+            for item in value.split(',') if item.strip()
+            ]
+
+    def __get_directory_sources(self, directory_path):
+        """
+        Return inventory files in directory and its subdirectories
+
+        @param directory_path: location of inventory directory
+        @type directory_path: str
+
+        @return: list
+        """
+
+        sources = list()
+        pending = [directory_path]
+
+        while pending:
+            path = pending.pop()
+            listing = self._scan_index.read_directory(path)
+
+            for item in sorted(listing['files']):
+                if not item.startswith('.') and \
+                        os.path.splitext(item)[1] in self.SOURCE_EXTENSIONS:
+                    sources.append(path + '/' + item)
+
+            for item in sorted(listing['directories'], reverse=True):
+                if not item.startswith('.') and \
+                        item not in self.VARS_DIRECTORIES:
+                    pending.append(path + '/' + item)
+
+        return sorted(sources)
+
+    def __get_sources(self):
+        """
+        Return inventory files of ansible.cfg or default locations
+
+        @return: list
+        """
+
+        candidates = self.__get_configured_sources() or [
+            self.__project_path + '/' + item for item in self.DEFAULT_SOURCES
+            ]
+        sources = list()
+
+        for item in candidates:
+            if os.path.isdir(item):
+                sources.extend(self.__get_directory_sources(item))
+            elif os.path.isfile(item):
+                sources.append(item)
+
+        return sources
+
+    def __get_vars_files(self, sources):
+        """
+        Return group_vars and host_vars files by group or host name
+
+        Vars directories are looked up in project root and next to each
+        inventory file.
+
+        @param sources: locations of inventory files
+        @type sources: list
+
+        @return: dict with group_vars and host_vars
+        """
+
+        directories = set([self.__project_path] + [
+            os.path.dirname(item) for item in sources
+            ])
+        vars_files = dict([(item, dict()) for item in self.VARS_DIRECTORIES])
+        self.__vars_paths = list()
+
+        for directory in sorted(directories):
+            for vars_directory in self.VARS_DIRECTORIES:
+                vars_path = directory + '/' + vars_directory
+
+                if not os.path.isdir(vars_path):
+                    continue
+
+                self.__vars_paths.append(vars_path)
+                listing = self._scan_index.read_directory(vars_path)
+                key = os.path.relpath(vars_path, self.__project_path)
+
+                # vars file per name or vars directory with several files
+                for item in listing['files'] + listing['directories']:
+                    name, extension = os.path.splitext(item)
+                    if item in listing['directories'] or \
+                            extension not in self.VARS_EXTENSIONS:
+                        name = item
+                    vars_files[vars_directory].setdefault(
+                        name, list()).append(key + '/' + item)
+
+        return vars_files
+
+    def __get_ansible_inventory(self):
+        """ Read inventory files and vars files into dictionary """
+
+        self.__sources = self.__get_sources()
+        groups = dict()
+
+        for source_path in self.__sources:
+            try:
+                source_groups = self.__parse_source(source_path)
+            except (ValueError, IOError) as error:
+                self.__logger.error(error)
+                continue
+
+            for name, value in source_groups.iteritems():
+                group = AnsibleInventoryReader.__get_group(groups, name)
+                group['hosts'].extend(value['hosts'])
+                group['children'].extend(value['children'])
+
+        inventory = self.__get_vars_files(self.__sources)
+        inventory['groups'] = groups
+        inventory['sources'] = [
+            os.path.relpath(item, self.__project_path)
+            for item in self.__sources
+            ]
+
+        # keep dictionary returned by get_ansible_inventory up to date
+        self.__ansible_inventory.clear()
+        self.__ansible_inventory.update(inventory)
+
+    def set_reader_config(self, ansible_project_path):
+        """
+        Settings for Ansible inventory reader
+
+        @param ansible_project_path: Ansible project location
+        @type ansible_project_path: str
+
+        @raise e: TypeError
+        @raise e: ValueError
+        """
+
+        self.__logger.info('Set Ansible inventory reader configuration')
+
+        self._check_path('ansible_project_path', ansible_project_path)
+
+        self.__project_path = str(ansible_project_path)
+
+    def get_ansible_inventory(self):
+        """
+        Return dictionary with inventory groups and vars files
+
+        Groups have hosts and children lists, group_vars and host_vars map
+        group or host names to vars files relative to project.
+
+        @return: dict
+        """
+
+        self.__logger.info('Read Ansible inventory')
+
+        self.__get_ansible_inventory()
+
+        return self.__ansible_inventory
+
+    def update_ansible_inventory(self, changed_paths):
+        """
+        Re-read inventory if project root, inventory or vars files changed
+
+        The dictionary of get_ansible_inventory is updated in place,
+        unchanged inventory files are taken from parse cache.
+
+        @param changed_paths: locations of changed directories and files
+        @type changed_paths: list
+
+        @return: bool, True if inventory changed
+        """
+
+        project_path = os.path.abspath(self.__project_path)
+        roots = [
+            os.path.abspath(item)
+            for item in self.__vars_paths + self.__sources + [
+                self.__project_path + '/' + source
+                for source in self.DEFAULT_SOURCES
+                ]
+            ]
+
+        # project root, ansible.cfg, inventories or vars directories
+        affected = [
+            item for item in changed_paths
+            if os.path.abspath(item) == project_path or
+            os.path.abspath(item) == project_path + '/ansible.cfg' or
+            [root for root in roots
+             if os.path.abspath(item) == root or
+             os.path.abspath(item).startswith(root + '/')]
+            ]
+
+        if not affected:
+            return False
+
+        self.__logger.info('Update Ansible inventory')
+
+        previous = dict(self.__ansible_inventory)
+        self.__get_ansible_inventory()
+
+        return self.__ansible_inventory != previous
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+""" Parse cache package """
+
+import errno
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+
+class ParseCache(object):
+    """ Parse cache class """
+
+    CACHE_VERSION = 3
+    CACHE_NAME = '.ansible_graph_cache'
+    DEFAULT_MAX_ENTRIES = 10000
+
+    # files modified within this window may still change unnoticed
+    RACY_SECONDS = 2
+
+    def __init__(self):
+        """ Parse cache constructor """
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__cache_path = str()
+        self.__max_entries = self.DEFAULT_MAX_ENTRIES
+        self.__verify_content = False
+        self.__entries = OrderedDict()
+        self.__changed = False
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def __get_digest(file_path):
+        """
+        Return content hash of file
+
+        @param file_path: location of file
+        @type file_path: str
+
+        @return: str
+        """
+
+        digest = hashlib.sha1()
+
+        with open(file_path, 'rb') as content_file:
+            for chunk in iter(lambda: content_file.read(65536), b''):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def __encode(value):
+        """
+        Return parse result loaded from cache with utf-8 strings
+
+        @param value: parse result loaded from cache
+        @type value: object
+
+        @return: object
+        """
+
+        if isinstance(value, unicode):
+            return value.encode('utf-8')
+
+        if isinstance(value, list):
+            return [ParseCache.__encode(item) for item in value]
+
+        if isinstance(value, dict):
+            return dict([
+                (ParseCache.__encode(key), ParseCache.__encode(item))
+                for key, item in value.iteritems()
+                ])
+
+        return value
+
+    def __load_cache(self):
+        """ Load cache file if available and compatible """
+
+        try:
+            with open(self.__cache_path, 'rb') as cache_file:
+                content = json.loads(zlib.decompress(cache_file.read()))
+        except IOError as error:
+            if error.errno != errno.ENOENT:
+                self.__logger.error(error)
+            return
+        except (ValueError, zlib.error) as error:
+            self.__logger.error('Cache %s ignored - %s',
+                                self.__cache_path, error)
+            return
+
+        if content.get('version') != self.CACHE_VERSION:
+            self.__logger.info('Cache %s outdated', self.__cache_path)
+            return
+
+        # entries are stored from least to most recently used, parse
+        # results are returned with the str values readers produce
+        for key, value in content.get('entries', list()):
+            self.__entries[key.encode('utf-8')] = ParseCache.__encode(value)
+
+        # cache size may be smaller than in the last run
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last=False)
+            self.__changed = True
+
+    def set_cache_config(self, cache_location,
+                         max_entries=DEFAULT_MAX_ENTRIES,
+                         verify_content=False):
+        """
+        Settings for parse cache and load existing cache
+
+        @param cache_location: directory for cache file
+        @type cache_location: str
+        @param max_entries: number of entries kept, least recently used first out
+        @type max_entries: int
+        @param verify_content: compare content hash on each lookup
+        @type verify_content: bool
+
+        @raise e: TypeError
+        @raise e: ValueError
+        """
+
+        self.__logger.info('Set parse cache location - %s', cache_location)
+
+        if not isinstance(cache_location, str):
+            msg = 'Parameter: cache_location needs to a string'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        if not cache_location:
+            msg = 'Parameter: no cache_location provided'
+            self.__logger.error(msg)
+            raise ValueError(msg)
+
+        if not isinstance(max_entries, int):
+            msg = 'Parameter: max_entries needs to an integer'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        if max_entries < 1:
+            msg = 'Parameter: max_entries needs to be greater than zero'
+            self.__logger.error(msg)
+            raise ValueError(msg)
+
+        self.__cache_path = str(cache_location) + '/' + self.CACHE_NAME
+        self.__max_entries = max_entries
+        self.__verify_content = bool(verify_content)
+        self.__entries = OrderedDict()
+        self.__changed = False
+        self.__load_cache()
+
+    @staticmethod
+    def __get_key(file_path, kind):
+        """
+        Return entry key of file, one file may be parsed by several readers
+
+        @param file_path: location of parsed file
+        @type file_path: str
+        @param kind: kind of parse result, e.g. playbook
+        @type kind: str
+
+        @return: str
+        """
+
+        return '%s:%s' % (kind, os.path.abspath(file_path))
+
+    def get(self, file_path, kind):
+        """
+        Return cached parse result if file is unchanged
+
+        @param file_path: location of parsed file
+        @type file_path: str
+        @param kind: kind of parse result, e.g. playbook
+        @type kind: str
+
+        @return: parse result or None
+        """
+
+        if not self.__cache_path:
+            return None
+
+        key = ParseCache.__get_key(file_path, kind)
+        entry = self.__entries.get(key)
+
+        if not entry:
+            return None
+
+        file_stat = os.stat(file_path)
+
+        if entry[0] != file_stat.st_size or entry[1] != file_stat.st_mtime:
+            return None
+
+        if self.__verify_content and \
+                entry[2] != ParseCache.__get_digest(file_path):
+            return None
+
+        # mark as most recently used
+        with self.__lock:
+            self.__entries[key] = self.__entries.pop(key)
+            self.__changed = True
+
+        return entry[3]
+
+    def set(self, file_path, kind, value):
+        """
+        Store parse result for file
+
+        @param file_path: location of parsed file
+        @type file_path: str
+        @param kind: kind of parse result, e.g. playbook
+        @type kind: str
+        @param value: json serializable parse result
+        @type value: object
+        """
+
+        if not self.__cache_path:
+            return
+
+        file_stat = os.stat(file_path)
+
+        # skip files that may change within mtime granularity
+        if time.time() - file_stat.st_mtime < self.RACY_SECONDS:
+            return
+
+        digest = None
+        if self.__verify_content:
+            digest = ParseCache.__get_digest(file_path)
+
+        key = ParseCache.__get_key(file_path, kind)
+
+        with self.__lock:
+            self.__entries.pop(key, None)
+            self.__entries[key] = [file_stat.st_size, file_stat.st_mtime,
+                                   digest, value]
+
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+            self.__changed = True
+
+    def get_entries(self):
+        """
+        Return entries from least to most recently used
+
+        @return: list of tuples (location, entry)
+        """
+
+        with self.__lock:
+            return self.__entries.items()
+
+    def add_entries(self, entries):
+        """
+        Add entries of another cache as most recently used
+
+        @param entries: entries, see get_entries
+        @type entries: list
+        """
+
+        with self.__lock:
+            for key, value in entries:
+                self.__entries.pop(key, None)
+                self.__entries[key] = value
+
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+            self.__changed = True
+
+    def save(self):
+        """ Write cache if entries changed """
+
+        if not self.__cache_path or not self.__changed:
+            return
+
+        self.__logger.info('Write parse cache - %s', self.__cache_path)
+
+        cache_dir = os.path.dirname(self.__cache_path)
+        content = json.dumps({'version': self.CACHE_VERSION,
+                              'entries': self.__entries.items()},
+                             separators=(',', ':'))
+
+        try:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+
+            temp_path = self.__cache_path + '.tmp'
+            with open(temp_path, 'wb') as cache_file:
+                cache_file.write(zlib.compress(content))
+            os.rename(temp_path, self.__cache_path)
+        except (IOError, OSError) as error:
+            self.__logger.error(error)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+""" Ansible playbook reader package """
+
+import fnmatch
+import logging
+import os
+
+from ..reader_base import ReaderBase
+
+
+class AnsiblePlaybookReader(ReaderBase):
+    """ Ansible playbook reader class """
+
+    def __init__(self):
+        """ Ansible playbook reader constructor """
+
+        super(AnsiblePlaybookReader, self).__init__()
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__project_path = str()
+        self.__ansible_playbooks = dict()
+
+    def __scan_playbook(self, yml_path):
+        """
+        Return plays and imports of playbook, cached if unchanged
+
+        @param yml_path: location of playbook
+        @type yml_path: str
+
+        @return: dict
+        @raise e: ValueError
+        """
+
+        cached = self._parse_cache.get(yml_path, 'playbook')
+
+        if cached is not None:
+            self.__logger.debug('Cached playbook - %s', yml_path)
+            return cached
+
+        # scanner needs YAML, imported only if a playbook has to be read
+        from .playbook_scanner import scan_playbook
+
+        playbook = scan_playbook(yml_path)
+        self._parse_cache.set(yml_path, 'playbook', playbook)
+
+        return playbook
+
+    def __get_root_files(self):
+        """
+        Return yml files in project root, candidates for playbooks
+
+        @return: list of locations
+        """
+
+        listing = self._scan_index.read_directory(self.__project_path)
+
+        return [
+            self.__project_path + '/' + item
+            for item in sorted(listing['files'])
+            if fnmatch.fnmatch(item, '*.y*ml')
+            ]
+
+    def __get_import_path(self, playbook_path, import_name):
+        """
+        Return location of imported playbook, None if not resolvable
+
+        @param playbook_path: location of importing playbook
+        @type playbook_path: str
+        @param import_name: imported playbook as written in playbook
+        @type import_name: str
+
+        @return: str or None
+        """
+
+        # imports with variables are only known at runtime
+        if '{{' in import_name or '{%' in import_name:
+            return None
+
+        import_path = os.path.normpath(os.path.join(
+            os.path.dirname(playbook_path), import_name))
+
+        if not os.path.isfile(import_path):
+            self.__logger.warning('Imported playbook not found - %s',
+                                  import_path)
+            return None
+
+        return import_path
+
+    def __get_playbook_key(self, playbook_path):
+        """
+        Return playbook location relative to project
+
+        @param playbook_path: location of playbook
+        @type playbook_path: str
+
+        @return: str
+        """
+
+        return os.path.relpath(playbook_path, self.__project_path)
+
+    def __get_ansible_playbooks(self):
+        """ Read root playbooks and their imported playbooks """
+
+        playbooks = dict()
+        root_files = self.__get_root_files()
+        queue = list(reversed(root_files))
+        seen = set(root_files)
+
+        while queue:
+            playbook_path = queue.pop()
+
+            try:
+                playbook = self.__scan_playbook(playbook_path)
+            except ValueError as error:
+                self.__logger.error(error)
+                continue
+
+            # yml files in project root without plays are no playbooks
+            if playbook_path in root_files and not playbook['plays'] and \
+                    not playbook['imports']:
+                continue
+
+            imports = list()
+
+            for import_name in playbook['imports']:
+                import_path = self.__get_import_path(playbook_path,
+                                                     import_name)
+
+                if import_path is None:
+                    continue
+
+                imports.append(self.__get_playbook_key(import_path))
+
+                if import_path not in seen:
+                    seen.add(import_path)
+                    queue.append(import_path)
+
+            playbooks[self.__get_playbook_key(playbook_path)] = {
+                'plays': playbook['plays'], 'imports': imports}
+
+        # keep dictionary returned by get_ansible_playbooks up to date
+        self.__ansible_playbooks.clear()
+        self.__ansible_playbooks.update(playbooks)
+
+    def set_reader_config(self, ansible_project_path):
+        """
+        Settings for Ansible playbook reader
+
+        @param ansible_project_path: Ansible project location
+        @type ansible_project_path: str
+
+        @raise e: TypeError
+        @raise e: ValueError
+        """
+
+        self.__logger.info('Set Ansible playbook reader configuration')
+
+        self._check_path('ansible_project_path', ansible_project_path)
+
+        self.__project_path = str(ansible_project_path)
+
+    def get_ansible_playbooks(self):
+        """
+        Return dictionary with playbooks, their plays and imports
+
+        Playbooks are keyed by location relative to project, each play has
+        name, hosts and roles, including roles of include/import_role tasks.
+
+        @return: dict
+        """
+
+        self.__logger.info('Read Ansible playbooks')
+
+        self.__get_ansible_playbooks()
+
+        return self.__ansible_playbooks
+
+    def update_ansible_playbooks(self, changed_paths):
+        """
+        Re-read playbooks if project root or a known playbook changed
+
+        The dictionary of get_ansible_playbooks is updated in place,
+        unchanged playbooks are taken from parse cache.
+
+        @param changed_paths: locations of changed directories and files
+        @type changed_paths: list
+
+        @return: bool, True if playbooks changed
+        """
+
+        project_path = os.path.abspath(self.__project_path)
+        known = set([project_path] + [
+            os.path.join(project_path, item)
+            for item in self.__ansible_playbooks
+            ])
+
+        # project root itself, files in root or imported playbooks
+        affected = [
+            item for item in changed_paths
+            if os.path.abspath(item) in known or
+            os.path.dirname(os.path.abspath(item)) == project_path
+            ]
+
+        if not affected:
+            return False
+
+        self.__logger.info('Update Ansible playbooks')
+
+        previous = dict(self.__ansible_playbooks)
+        self.__get_ansible_playbooks()
+
+        return self.__ansible_playbooks != previous
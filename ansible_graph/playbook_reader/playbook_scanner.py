@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+""" Playbook scanner module """
+
+import logging
+import yaml
+
+from ..reader_base import get_yaml_loader
+
+
+# task keys with nested task lists
+BLOCK_KEYS = ['block', 'rescue', 'always']
+
+# play keys with task lists
+TASK_KEYS = ['pre_tasks', 'tasks', 'post_tasks', 'handlers']
+
+# prefixes of fully qualified module names
+MODULE_PREFIXES = ['ansible.builtin.', 'ansible.legacy.']
+
+
+def get_module_name(key):
+    """
+    Return short module name of task key
+
+    @param key: task key, e.g. ansible.builtin.import_role
+    @type key: str
+
+    @return: str
+    """
+
+    for prefix in MODULE_PREFIXES:
+        if key.startswith(prefix):
+            return key[len(prefix):]
+
+    return key
+
+
+def get_scalar(event):
+    """
+    Return value of scalar event as utf-8 string
+
+    @param event: scalar event
+    @type event: ScalarEvent
+
+    @return: str
+    """
+
+    value = event.value
+
+    if isinstance(value, unicode):
+        value = value.encode('utf-8')
+
+    return value
+
+
+def skip_node(events, event):
+    """
+    Consume node starting with event without building it
+
+    @param events: event iterator
+    @type events: iterator
+    @param event: first event of node
+    @type event: Event
+    """
+
+    depth = 0
+
+    while True:
+        if isinstance(event, yaml.CollectionStartEvent):
+            depth += 1
+        elif isinstance(event, yaml.CollectionEndEvent):
+            depth -= 1
+
+        if depth == 0:
+            return
+
+        event = next(events)
+
+
+def iter_mapping(events):
+    """
+    Yield scalar keys and first value event of mapping
+
+    Values not consumed by the caller are skipped. Called after the
+    mapping start event, consumes the mapping end event.
+
+    @param events: event iterator
+    @type events: iterator
+
+    @return: generator of tuples (key, value event, consumed flag list)
+    """
+
+    while True:
+        event = next(events)
+
+        if isinstance(event, yaml.MappingEndEvent):
+            return
+
+        if isinstance(event, yaml.ScalarEvent):
+            key = get_scalar(event)
+        else:
+            skip_node(events, event)
+            key = None
+
+        value = next(events)
+        consumed = [False]
+
+        yield key, value, consumed
+
+        if not consumed[0]:
+            skip_node(events, value)
+
+
+def iter_sequence(events, event):
+    """
+    Yield item events of sequence, scalars if event is a scalar
+
+    Items not consumed by the caller are skipped.
+
+    @param events: event iterator
+    @type events: iterator
+    @param event: first event of node
+    @type event: Event
+
+    @return: generator of tuples (item event, consumed flag list)
+    """
+
+    if not isinstance(event, yaml.SequenceStartEvent):
+        consumed = [False]
+        yield event, consumed
+        if not consumed[0]:
+            skip_node(events, event)
+        return
+
+    while True:
+        item = next(events)
+
+        if isinstance(item, yaml.SequenceEndEvent):
+            return
+
+        consumed = [False]
+        yield item, consumed
+
+        if not consumed[0]:
+            skip_node(events, item)
+
+
+def read_scalars(events, event):
+    """
+    Return scalar or scalar sequence as list, other items are skipped
+
+    @param events: event iterator
+    @type events: iterator
+    @param event: first event of node
+    @type event: Event
+
+    @return: list
+    """
+
+    values = list()
+
+    for item, _ in iter_sequence(events, event):
+        if isinstance(item, yaml.ScalarEvent):
+            values.append(get_scalar(item))
+
+    return values
+
+
+def read_role_name(events, event, keys):
+    """
+    Return role name of scalar or of mapping by first matching key
+
+    @param events: event iterator
+    @type events: iterator
+    @param event: first event of node
+    @type event: Event
+    @param keys: mapping keys holding the role name
+    @type keys: list
+
+    @return: str or None
+    """
+
+    if isinstance(event, yaml.ScalarEvent):
+        value = get_scalar(event)
+
+        # free-form arguments, e.g. "name=common"
+        for item in value.split():
+            if item.startswith('name='):
+                return item[len('name='):]
+
+        return value or None
+
+    if not isinstance(event, yaml.MappingStartEvent):
+        skip_node(events, event)
+        return None
+
+    name = None
+
+    for key, value, consumed in iter_mapping(events):
+        if key in keys and name is None and \
+                isinstance(value, yaml.ScalarEvent):
+            name = get_scalar(value)
+            consumed[0] = True
+
+    return name
+
+
+def read_tasks(events, event, roles):
+    """
+    Add roles of include_role and import_role tasks
+
+    @param events: event iterator
+    @type events: iterator
+    @param event: first event of task list
+    @type event: Event
+    @param roles: list to add role names to
+    @type roles: list
+    """
+
+    for item, consumed in iter_sequence(events, event):
+        if not isinstance(item, yaml.MappingStartEvent):
+            continue
+
+        consumed[0] = True
+
+        for key, value, value_consumed in iter_mapping(events):
+            module = get_module_name(key or '')
+
+            if module in ['include_role', 'import_role']:
+                name = read_role_name(events, value, ['name'])
+                value_consumed[0] = True
+                if name:
+                    roles.append(name)
+            elif module in BLOCK_KEYS:
+                read_tasks(events, value, roles)
+                value_consumed[0] = True
+
+
+def read_play(events, playbook):
+    """
+    Add play or playbook import of mapping to playbook
+
+    @param events: event iterator, after mapping start of play
+    @type events: iterator
+    @param playbook: playbook with plays and imports lists
+    @type playbook: dict
+    """
+
+    play = {'name': None, 'hosts': list(), 'roles': list()}
+    is_play = False
+
+    for key, value, consumed in iter_mapping(events):
+        module = get_module_name(key or '')
+
+        if module in ['import_playbook', 'include'] and \
+                isinstance(value, yaml.ScalarEvent):
+            playbook['imports'].append(get_scalar(value))
+            consumed[0] = True
+        elif key == 'name' and isinstance(value, yaml.ScalarEvent):
+            play['name'] = get_scalar(value)
+            consumed[0] = True
+        elif key == 'hosts':
+            play['hosts'] = read_scalars(events, value)
+            consumed[0] = True
+            is_play = True
+        elif key == 'roles':
+            for item, item_consumed in iter_sequence(events, value):
+                name = read_role_name(events, item, ['role', 'name'])
+                item_consumed[0] = True
+                if name:
+                    play['roles'].append(name)
+            consumed[0] = True
+        elif key in TASK_KEYS:
+            read_tasks(events, value, play['roles'])
+            consumed[0] = True
+
+    if is_play:
+        playbook['plays'].append(play)
+
+
+def scan_playbook(yml_path):
+    """
+    Return plays and playbook imports of playbook
+
+    Only hosts, roles, role include/import tasks and playbook imports
+    are read from the YAML event stream, all other values are skipped
+    without building them.
+
+    @param yml_path: location of playbook
+    @type yml_path: str
+
+    @return: dict with plays and imports list
+    @raise e: ValueError
+    """
+
+    logging.getLogger(__name__).debug('Scan playbook - %s', yml_path)
+
+    playbook = {'plays': list(), 'imports': list()}
+
+    try:
+        with open(yml_path, 'r') as yml_file:
+            events = yaml.parse(yml_file, Loader=get_yaml_loader())
+
+            for event in events:
+                if not isinstance(event, yaml.DocumentStartEvent):
+                    continue
+
+                # plays are mappings in top level sequence
+                root = next(events)
+
+                if not isinstance(root, yaml.SequenceStartEvent):
+                    skip_node(events, root)
+                    continue
+
+                for item, consumed in iter_sequence(events, root):
+                    if isinstance(item, yaml.MappingStartEvent):
+                        read_play(events, playbook)
+                        consumed[0] = True
+    except yaml.YAMLError as error:
+        raise ValueError('%s - %s' % (yml_path, error))
+
+    return playbook
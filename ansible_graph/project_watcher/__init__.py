@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+""" Project watcher package """
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+
+
+class ProjectWatcher(object):
+    """ Project watcher class, based on Linux inotify """
+
+    DEFAULT_DEBOUNCE = 0.2
+
+    # inotify event flags, see inotify(7)
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_CLOEXEC = 0x00080000
+
+    __WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | \
+        IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    __LISTING_MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    __EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self):
+        """ Project watcher constructor """
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__exclude = list()
+        self.__ignore_paths = list()
+        self.__debounce = self.DEFAULT_DEBOUNCE
+        self.__libc = None
+        self.__inotify_fd = -1
+        self.__watches = dict()
+
+    def __add_watch(self, directory_path):
+        """
+        Watch directory and all its subdirectories
+
+        @param directory_path: location of directory
+        @type directory_path: str
+        """
+
+        for root, directories, _ in os.walk(directory_path):
+            directories[:] = [
+                item for item in directories
+                if item not in self.__exclude and
+                not self.__is_ignored(os.path.join(root, item))
+                ]
+
+            descriptor = self.__libc.inotify_add_watch(
+                self.__inotify_fd, root, self.__WATCH_MASK)
+
+            if descriptor < 0:
+                error = ctypes.get_errno()
+                self.__logger.error('Cannot watch %s - %s', root,
+                                    os.strerror(error))
+                continue
+
+            self.__watches[descriptor] = root
+
+    def __is_ignored(self, path):
+        """
+        Check if path is inside of an ignored location
+
+        @param path: absolute location
+        @type path: str
+
+        @return: bool
+        """
+
+        for item in self.__ignore_paths:
+            if path == item or path.startswith(item + '/'):
+                return True
+
+        return False
+
+    def __read_events(self, changes):
+        """
+        Read pending inotify events into changes
+
+        @param changes: dictionary with directories, files and overflow
+        @type changes: dict
+        """
+
+        try:
+            buf = os.read(self.__inotify_fd, 65536)
+        except OSError as error:
+            if error.errno == errno.EINTR:
+                return
+            raise
+
+        offset = 0
+        header_size = self.__EVENT_HEADER.size
+
+        while offset + header_size <= len(buf):
+            descriptor, mask, _, length = self.__EVENT_HEADER.unpack_from(
+                buf, offset)
+            name = buf[offset + header_size:offset + header_size + length]
+            name = name.rstrip('\0')
+            offset += header_size + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                changes['overflow'] = True
+                continue
+
+            directory = self.__watches.get(descriptor)
+
+            if directory is None:
+                continue
+
+            if mask & self.IN_IGNORED:
+                del self.__watches[descriptor]
+                continue
+
+            if mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                changes['directories'].add(os.path.dirname(directory))
+                continue
+
+            if name in self.__exclude:
+                continue
+
+            path = os.path.join(directory, name)
+
+            if self.__is_ignored(path):
+                continue
+
+            if mask & self.__LISTING_MASK:
+                changes['directories'].add(directory)
+
+                # new directories need watches as well
+                if mask & self.IN_ISDIR and \
+                        mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self.__add_watch(path)
+                    changes['directories'].add(path)
+
+            if mask & self.IN_CLOSE_WRITE:
+                changes['files'].add(path)
+
+    def set_watch_config(self, project_path, excludes, ignore_paths=None,
+                         debounce=DEFAULT_DEBOUNCE):
+        """
+        Settings for project watcher and start watching
+
+        @param project_path: Ansible project location
+        @type project_path: str
+        @param excludes: list with exclusions
+        @type excludes: list
+        @param ignore_paths: locations without watch (e.g. output location)
+        @type ignore_paths: list
+        @param debounce: seconds without events before changes are returned
+        @type debounce: float
+
+        @raise e: TypeError
+        @raise e: ValueError
+        @raise e: OSError
+        """
+
+        self.__logger.info('Set project watcher configuration')
+
+        if not isinstance(project_path, str):
+            msg = 'Parameter: project_path needs to a string'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        if not project_path:
+            msg = 'Parameter: no project_path path provided'
+            self.__logger.error(msg)
+            raise ValueError(msg)
+
+        if not isinstance(excludes, list):
+            msg = 'Parameter: exclude needs to a list'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        if not isinstance(debounce, (int, float)):
+            msg = 'Parameter: debounce needs to a number'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        library = ctypes.util.find_library('c')
+        self.__libc = ctypes.CDLL(library, use_errno=True)
+
+        if not hasattr(self.__libc, 'inotify_init1'):
+            msg = 'Watch mode needs Linux inotify support'
+            self.__logger.error(msg)
+            raise OSError(errno.ENOSYS, msg)
+
+        self.__inotify_fd = self.__libc.inotify_init1(self.IN_CLOEXEC)
+
+        if self.__inotify_fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        self.__exclude = list(excludes)
+        self.__ignore_paths = [
+            os.path.abspath(item) for item in ignore_paths or list()
+            ]
+        self.__debounce = float(debounce)
+
+        self.__add_watch(os.path.abspath(project_path))
+        self.__logger.info('Watch %s directories', len(self.__watches))
+
+    def wait_for_changes(self):
+        """
+        Block until changes happened and no further events follow in time
+
+        @return: dict with changed directories (listing) and files (content)
+        """
+
+        changes = {'directories': set(), 'files': set(), 'overflow': False}
+
+        # wait for first event, then until events stop for debounce time
+        timeout = None
+
+        while True:
+            try:
+                readable = select.select([self.__inotify_fd], [], [],
+                                         timeout)[0]
+            except select.error as error:
+                if error.args[0] == errno.EINTR:
+                    continue
+                raise
+
+            if not readable:
+                break
+
+            self.__read_events(changes)
+
+            if changes['directories'] or changes['files'] or \
+                    changes['overflow']:
+                timeout = self.__debounce
+
+        self.__logger.debug('Changes - %s', changes)
+
+        return changes
+
+    def close(self):
+        """ Stop watching """
+
+        if self.__inotify_fd >= 0:
+            os.close(self.__inotify_fd)
+            self.__inotify_fd = -1
+            self.__watches = dict()
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+""" Reader base package """
+
+import ConfigParser
+import logging
+import os
+
+from ..parse_cache import ParseCache
+from ..scan_index import ScanIndex
+
+
+def get_yaml_loader():
+    """
+    Return safe YAML loader, based on libyaml if available
+
+    @return: loader class
+    """
+
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+    return SafeLoader
+
+
+def read_yaml_file(yml_path):
+    """
+    Return content of YAML file, parsed with libyaml if available
+
+    Module level function, so it can be used by a process pool. YAML is
+    imported on first use, runs served by the parse cache do not need it.
+
+    @param yml_path: location of YAML file
+    @type yml_path: str
+
+    @return: object
+    @raise e: ValueError
+    """
+
+    import yaml
+
+    try:
+        with open(yml_path, 'r') as yml_file:
+            return yaml.load(yml_file, Loader=get_yaml_loader())
+    except yaml.YAMLError as error:
+        raise ValueError('%s - %s' % (yml_path, error))
+
+
+class ReaderBase(object):
+    """ Reader base class, parameter checks and caches of readers """
+
+    def __init__(self):
+        """ Reader base constructor """
+
+        self.__logger = logging.getLogger(__name__)
+
+        self._scan_index = ScanIndex()
+        self._parse_cache = ParseCache()
+
+    def _check_instance(self, name, value, value_type):
+        """
+        Check type of parameter
+
+        @param name: parameter name
+        @type name: str
+        @param value: parameter value
+        @type value: object
+        @param value_type: expected class
+        @type value_type: type
+
+        @raise e: TypeError
+        """
+
+        if not isinstance(value, value_type):
+            msg = 'Parameter: %s needs to a %s' % (name, value_type.__name__)
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+    def _check_path(self, name, value):
+        """
+        Check parameter is a location
+
+        @param name: parameter name
+        @type name: str
+        @param value: parameter value
+        @type value: str
+
+        @raise e: TypeError
+        @raise e: ValueError
+        """
+
+        if not isinstance(value, str):
+            msg = 'Parameter: %s needs to a string' % name
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        if not value:
+            msg = 'Parameter: no %s path provided' % name
+            self.__logger.error(msg)
+            raise ValueError(msg)
+
+    def _check_count(self, name, value):
+        """
+        Check parameter is a number of processes or threads
+
+        @param name: parameter name
+        @type name: str
+        @param value: parameter value
+        @type value: int
+
+        @raise e: TypeError
+        @raise e: ValueError
+        """
+
+        if not isinstance(value, int):
+            msg = 'Parameter: %s needs to an integer' % name
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        if value < 1:
+            msg = 'Parameter: %s needs to be greater than zero' % name
+            self.__logger.error(msg)
+            raise ValueError(msg)
+
+    def _get_config_option(self, project_path, options):
+        """
+        Return value of first option set in defaults section of ansible.cfg
+
+        @param project_path: Ansible project location
+        @type project_path: str
+        @param options: option names, in precedence
+        @type options: list
+
+        @return: str or None
+        """
+
+        config_path = project_path + '/ansible.cfg'
+
+        if not os.path.isfile(config_path):
+            return None
+
+        parser = ConfigParser.RawConfigParser()
+
+        try:
+            parser.read(config_path)
+        except (ConfigParser.Error, IOError) as error:
+            self.__logger.debug('Unreadable %s - %s', config_path, error)
+            return None
+
+        for option in options:
+            if parser.has_option('defaults', option):
+                return parser.get('defaults', option)
+
+        return None
+
+    def set_scan_index(self, scan_index):
+        """
+        Set scan index to reuse listings of unchanged directories
+
+        @param scan_index: scan index
+        @type scan_index: ScanIndex
+
+        @raise e: TypeError
+        """
+
+        self._check_instance('scan_index', scan_index, ScanIndex)
+
+        self._scan_index = scan_index
+
+    def set_parse_cache(self, parse_cache):
+        """
+        Set parse cache to skip parsing of unchanged files
+
+        @param parse_cache: parse cache
+        @type parse_cache: ParseCache
+
+        @raise e: TypeError
+        """
+
+        self._check_instance('parse_cache', parse_cache, ParseCache)
+
+        self._parse_cache = parse_cache
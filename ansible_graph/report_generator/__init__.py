@@ -1,23 +1,44 @@
 # -*- coding: utf-8 -*-
 """ Report generator package """
 
+import importlib
+import json
 import logging
+from StringIO import StringIO
 
-from .report_plain import ReportPlain
-from .report_xml import ReportXML
-from .report_json import ReportJSON
+from ..artifact_cache import ArtifactCache
+from ..report_output import ReportOutput
+from ..inventory_index import InventoryIndex
+from ..variable_index import VariableIndex
+from ..role_dependency_graph import RoleDependencyGraph
 
 
 class ReportGenerator(object):
     """ Report generator class """
 
-    __ALLOWED_FORMAT = ['default', 'xml', 'json']
+    __ALLOWED_FORMAT = ['default', 'xml', 'json', 'ndjson']
+
+    # file extension of report by format
+    FILE_EXTENSION = {'default': 'txt', 'xml': 'xml', 'json': 'json',
+                      'ndjson': 'ndjson'}
+
+    # report writers are imported on use, only one format is written per run
+    __REPORT_WRITER = {'default': ('.report_plain', 'ReportPlain'),
+                       'xml': ('.report_xml', 'ReportXML'),
+                       'json': ('.report_json', 'ReportJSON'),
+                       'ndjson': ('.report_ndjson', 'ReportNDJSON')}
+
+    # increase on report layout changes, invalidates cached reports
+    __LAYOUT_VERSION = '5'
+
+    # cached report body, header with date, time and user is rendered per run
+    __CACHE_NAME = '.ansible_graph_report'
 
     def __init__(self, report='default'):
         """
         Report generator constructor
 
-        @param report: report output format [default, xml, json]
+        @param report: report output format [default, xml, json, ndjson]
         @type report: str
 
         @raise e: TypeError
@@ -43,9 +64,14 @@ class ReportGenerator(object):
 
         self.__report_format = str(report.lower())
         self.__meta = dict()
-        self.__project_content = dict()
-        self.__role_content = dict()
+
+        # report input, sections of unset indexes are left out
+        self.__content = {'project': dict(), 'roles': dict(),
+                          'dependency_graph': None, 'inventory_index': None,
+                          'variable_index': None}
         self.__report = str()
+        self.__cache_location = str()
+        self.__artifact_cache = ArtifactCache()
 
     def set_report_header(self, meta):
         """
@@ -72,7 +98,8 @@ class ReportGenerator(object):
 
         self.__meta = meta
 
-    def set_report_content(self, project_content, role_content):
+    def set_report_content(self, project_content, role_content,
+                           dependency_graph=None):
         """
         Set report content values
 
@@ -80,6 +107,8 @@ class ReportGenerator(object):
         @type project_content: dict
         @param role_content: role content for report
         @type role_content: dict
+        @param dependency_graph: graph built from role content (optional)
+        @type dependency_graph: RoleDependencyGraph
 
         @raise e: TypeError
         @raise e: ValueError
@@ -97,8 +126,172 @@ class ReportGenerator(object):
             self.__logger.error(msg)
             raise ValueError(msg)
 
-        self.__project_content = dict(project_content)
-        self.__role_content = dict(role_content)
+        if dependency_graph is not None and \
+                not isinstance(dependency_graph, RoleDependencyGraph):
+            msg = 'Parameter: dependency_graph needs to a RoleDependencyGraph'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        self.__content['project'] = dict(project_content)
+        self.__content['roles'] = dict(role_content)
+        self.__content['dependency_graph'] = dependency_graph
+
+    def set_inventory_index(self, inventory_index):
+        """
+        Set inventory index for inventory section
+
+        @param inventory_index: index of inventory groups and hosts
+        @type inventory_index: InventoryIndex
+
+        @raise e: TypeError
+        """
+
+        if not isinstance(inventory_index, InventoryIndex):
+            msg = 'Parameter: inventory_index needs to a InventoryIndex'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        self.__content['inventory_index'] = inventory_index
+
+    def set_variable_index(self, variable_index):
+        """
+        Set variable index for unused and undefined variables section
+
+        @param variable_index: index of variable definitions and references
+        @type variable_index: VariableIndex
+
+        @raise e: TypeError
+        """
+
+        if not isinstance(variable_index, VariableIndex):
+            msg = 'Parameter: variable_index needs to a VariableIndex'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        self.__content['variable_index'] = variable_index
+
+    def set_report_cache(self, cache_location, force=False):
+        """
+        Keep generated report body in location, reuse it for unchanged input
+
+        @param cache_location: directory for cached report body
+        @type cache_location: str
+        @param force: generate report even if input did not change
+        @type force: bool
+
+        @raise e: ValueError
+        """
+
+        self.__logger.debug('Set report cache - %s', cache_location)
+
+        if not cache_location:
+            msg = 'Parameter: no cache_location path provided'
+            self.__logger.error(msg)
+            raise ValueError(msg)
+
+        self.__cache_location = str(cache_location)
+        self.__artifact_cache = ArtifactCache(force)
+
+    def __get_input_digest(self):
+        """
+        Return hash over report format and input of report body
+
+        @return: str
+        """
+
+        inventory_index = self.__content['inventory_index']
+        variable_index = self.__content['variable_index']
+        content = [self.__content['project'], self.__content['roles']]
+
+        if inventory_index is not None:
+            content.extend([inventory_index.get_group_hierarchy(),
+                            inventory_index.get_host_count(),
+                            inventory_index.get_host_vars_count(),
+                            inventory_index.get_unmatched_vars()])
+
+        if variable_index is not None:
+            content.extend([variable_index.get_unused(),
+                            variable_index.get_undefined()])
+
+        content = json.dumps(content, sort_keys=True)
+
+        return ArtifactCache.get_digest(self.__LAYOUT_VERSION,
+                                        self.__report_format, content)
+
+    def __get_cached_artifact(self):
+        """
+        Return location and input hash of cached report body
+
+        @return: tuple (location, hash), empty strings without cache
+        """
+
+        if not self.__cache_location:
+            return str(), str()
+
+        artifact = self.__cache_location + '/' + self.__CACHE_NAME + '.' + \
+            self.FILE_EXTENSION[self.__report_format]
+
+        return artifact, self.__get_input_digest()
+
+    def __get_report_writer(self):
+        """
+        Return report writer for configured format
+
+        @return: ReportBase
+        """
+
+        module_name, class_name = self.__REPORT_WRITER[self.__report_format]
+
+        self.__logger.info('Parse %s report', self.__report_format)
+
+        module = importlib.import_module(module_name, __name__)
+        writer = getattr(module, class_name)()
+
+        writer.set_report_meta(self.__meta)
+        writer.set_report_content(self.__content['project'],
+                                  self.__content['roles'],
+                                  self.__content['dependency_graph'])
+        writer.set_inventory_index(self.__content['inventory_index'])
+        writer.set_variable_index(self.__content['variable_index'])
+
+        return writer
+
+    def write_report(self, stream):
+        """
+        Write full report chunk by chunk to file-like object
+
+        @param stream: file-like object with write method
+        @type stream: object
+        """
+
+        writer = self.__get_report_writer()
+        artifact, digest = self.__get_cached_artifact()
+
+        for chunk in writer.iter_header():
+            stream.write(chunk)
+
+        # reuse report body generated from same input
+        if artifact and self.__artifact_cache.is_current(artifact, digest):
+            self.__logger.info('Report unchanged - %s', artifact)
+
+            with open(artifact, 'rb') as report_file:
+                for chunk in iter(lambda: report_file.read(65536), b''):
+                    stream.write(chunk)
+            return
+
+        if not artifact:
+            for chunk in writer.iter_body():
+                stream.write(chunk)
+            return
+
+        # keep a copy of the report body in cache location, replaced only
+        # when complete, an interrupted run leaves the previous body
+        with ReportOutput(artifact) as report_file:
+            for chunk in writer.iter_body():
+                stream.write(chunk)
+                report_file.write(chunk)
+
+        self.__artifact_cache.update(artifact, digest)
 
     def get_report(self):
         """
@@ -107,32 +300,8 @@ class ReportGenerator(object):
         @return: str
         """
 
-        if self.__report_format == 'json':
-            self.__logger.info('Parse JSON report')
-
-            json = ReportJSON()
-            json.set_report_meta(self.__meta)
-            json.set_report_content(self.__project_content,
-                                    self.__role_content)
-            json.render_report()
-            self.__report = json.get_report()
-        elif self.__report_format == 'xml':
-            self.__logger.info('Parse XML report')
-
-            xml = ReportXML()
-            xml.set_report_meta(self.__meta)
-            xml.set_report_content(self.__project_content,
-                                   self.__role_content)
-            xml.render_report()
-            self.__report = xml.get_report()
-        else:
-            self.__logger.info('Parse plain text report')
-
-            plain = ReportPlain()
-            plain.set_report_meta(self.__meta)
-            plain.set_report_content(self.__project_content,
-                                     self.__role_content)
-            plain.render_report()
-            self.__report = plain.get_report()
+        report = StringIO()
+        self.write_report(report)
+        self.__report = report.getvalue()
 
         return self.__report
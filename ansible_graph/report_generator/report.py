@@ -4,20 +4,29 @@
 import time
 import os
 import pwd
+from abc import ABCMeta, abstractmethod
+
+from ..role_dependency_graph import RoleDependencyGraph
 
 
 class ReportBase(object):
-    """Report generator class"""
+    """Report generator class, writers implement header and body"""
+
+    __metaclass__ = ABCMeta
 
     def __init__(self):
         """
         Basic report constructor
         """
 
-        self._report = str()
         self._report_meta = dict()
         self._project_content = dict()
         self._role_content = dict()
+        self._dependency_graph = RoleDependencyGraph()
+
+        # sections of unset indexes are left out of the report
+        self._inventory_index = None
+        self._variable_index = None
 
     def set_report_meta(self, meta):
         """
@@ -32,7 +41,8 @@ class ReportBase(object):
         self._report_meta['date'] = time.strftime("%Y-%m-%d")
         self._report_meta['time'] = time.strftime("%I:%M:%S")
 
-    def set_report_content(self, project_content, role_content):
+    def set_report_content(self, project_content, role_content,
+                           dependency_graph=None):
         """
         Set report content
 
@@ -40,16 +50,123 @@ class ReportBase(object):
         @type project_content: dict
         @param role_content: content for report
         @type role_content: dict
+        @param dependency_graph: graph built from role content
+        @type dependency_graph: RoleDependencyGraph
         """
 
         self._project_content = dict(project_content)
         self._role_content = dict(role_content)
 
+        if dependency_graph is None:
+            dependency_graph = RoleDependencyGraph()
+            dependency_graph.set_role_content(self._role_content)
+
+        self._dependency_graph = dependency_graph
+
+    def set_inventory_index(self, inventory_index):
+        """
+        Set inventory index
+
+        @param inventory_index: index of inventory groups and hosts
+        @type inventory_index: InventoryIndex
+        """
+
+        self._inventory_index = inventory_index
+
+    def _get_inventory_analysis(self):
+        """
+        Return group hierarchy, host count and unmatched vars of inventory
+
+        @return: dict, None without inventory index
+        """
+
+        if self._inventory_index is None:
+            return None
+
+        return {'groups': self._inventory_index.get_group_hierarchy(),
+                'hosts': self._inventory_index.get_host_count(),
+                'hosts_with_vars': self._inventory_index.get_host_vars_count(),
+                'unmatched_vars': self._inventory_index.get_unmatched_vars()}
+
+    def set_variable_index(self, variable_index):
+        """
+        Set variable index
+
+        @param variable_index: index of variable definitions and references
+        @type variable_index: VariableIndex
+        """
+
+        self._variable_index = variable_index
+
+    def _get_variable_analysis(self):
+        """
+        Return unused and undefined variables with their files
+
+        @return: dict, None without variable index
+        """
+
+        if self._variable_index is None:
+            return None
+
+        return {'unused': self._variable_index.get_unused(),
+                'undefined': self._variable_index.get_undefined()}
+
+    def _get_role_analysis(self):
+        """
+        Return dependency order, levels and cycles of roles
+
+        @return: dict
+        """
+
+        return {'dependency_order':
+                    self._dependency_graph.get_topological_order(),
+                'levels': self._dependency_graph.get_levels(),
+                'dependency_cycles': self._dependency_graph.get_cycles()}
+
+    @abstractmethod
+    def iter_header(self):
+        """
+        Yield report start with meta, the only part which changes per run
+
+        @return: generator
+        """
+
+    @abstractmethod
+    def iter_body(self):
+        """
+        Yield report content following the header
+
+        @return: generator
+        """
+
+    def iter_report(self):
+        """
+        Yield report in chunks, header followed by body
+
+        @return: generator
+        """
+
+        for chunk in self.iter_header():
+            yield chunk
+        for chunk in self.iter_body():
+            yield chunk
+
+    def write_report(self, stream):
+        """
+        Write report chunk by chunk to file-like object
+
+        @param stream: file-like object with write method
+        @type stream: object
+        """
+
+        for chunk in self.iter_report():
+            stream.write(chunk)
+
     def get_report(self):
         """
-        Return full report
+        Return full report as one string
 
         @return: str
         """
 
-        return self._report
+        return ''.join(self.iter_report())
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """ JSON report generator """
 
+import json
+
 from .report import ReportBase
 
 
@@ -12,16 +14,51 @@ class ReportJSON(ReportBase):
 
         ReportBase.__init__(self)
 
-    def render_report(self):
-        """ Create JSON report """
+    @staticmethod
+    def _get_encoder():
+        """
+        Return encoder for indented JSON with sorted keys
+
+        @return: JSONEncoder
+        """
+
+        return json.JSONEncoder(indent=4, sort_keys=True,
+                                separators=(',', ': '))
+
+    def iter_header(self):
+        """
+        Yield document start with project meta as first member
+
+        @return: generator
+        """
+
+        meta = ReportJSON._get_encoder().encode(self._report_meta)
 
-        pass
+        yield '{\n    "project_meta": %s,' % meta.replace('\n', '\n    ')
 
-    def get_report(self):
+    def iter_body(self):
         """
-        Return full JSON report
+        Yield further members of JSON report as encoded chunks
 
-        @return: str
+        @return: generator
         """
 
-        return self._report
+        document = {'project_structure': self._project_content,
+                    'ansible_roles': self._role_content,
+                    'role_analysis': self._get_role_analysis()}
+
+        # sections without data are left out
+        for key, value in [('inventory', self._get_inventory_analysis()),
+                           ('variable_analysis',
+                            self._get_variable_analysis())]:
+            if value is not None:
+                document[key] = value
+
+        chunks = ReportJSON._get_encoder().iterencode(document)
+
+        # document was opened by header
+        next(chunks)
+
+        for chunk in chunks:
+            yield chunk
+        yield '\n'
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+""" NDJSON report generator """
+
+import json
+
+from .report import ReportBase
+
+
+class ReportNDJSON(ReportBase):
+    """NDJSON report generator class """
+
+    def __init__(self):
+        """ NDJSON report constructor """
+
+        ReportBase.__init__(self)
+
+    @staticmethod
+    def _record(record_type, **values):
+        """
+        Return single JSON record line
+
+        @param record_type: record type [meta, directory, role,
+            dependency_cycle, inventory, inventory_group, unused_variable,
+            undefined_variable]
+        @type record_type: str
+        @param values: record values
+        @type values: dict
+
+        @return: str
+        """
+
+        values['type'] = record_type
+
+        return json.dumps(values, sort_keys=True, separators=(',', ':')) + '\n'
+
+    def iter_header(self):
+        """
+        Yield meta record
+
+        @return: generator
+        """
+
+        yield ReportNDJSON._record('meta', **self._report_meta)
+
+    def __iter_inventory_records(self):
+        """
+        Yield inventory and inventory group records, none without inventory
+
+        @return: generator
+        """
+
+        inventory = self._get_inventory_analysis()
+
+        if inventory is None:
+            return
+
+        yield ReportNDJSON._record(
+            'inventory',
+            hosts=inventory['hosts'],
+            hosts_with_vars=inventory['hosts_with_vars'],
+            unmatched_vars=inventory['unmatched_vars'])
+
+        for key, value in sorted(inventory['groups'].iteritems()):
+            yield ReportNDJSON._record('inventory_group',
+                                       name=key,
+                                       hosts=value['hosts'],
+                                       children=value['children'],
+                                       group_vars=value['group_vars'])
+
+    def __iter_variable_records(self):
+        """
+        Yield unused and undefined variable records, none without variables
+
+        @return: generator
+        """
+
+        variables = self._get_variable_analysis()
+
+        if variables is None:
+            return
+
+        for key, value in sorted(variables['unused'].iteritems()):
+            yield ReportNDJSON._record('unused_variable', name=key,
+                                       files=value)
+
+        for key, value in sorted(variables['undefined'].iteritems()):
+            yield ReportNDJSON._record('undefined_variable', name=key,
+                                       files=value)
+
+    def iter_body(self):
+        """
+        Yield one JSON record per line, for directory, role, cycle,
+        inventory, inventory group, unused and undefined variable
+
+        @return: generator
+        """
+
+        for key, value in self._project_content.iteritems():
+            yield ReportNDJSON._record('directory',
+                                       name=key,
+                                       files=value['files'],
+                                       directories=value['directories'])
+
+        analysis = self._get_role_analysis()
+
+        # roles in dependency order, dependencies first
+        for key in analysis['dependency_order']:
+            if key not in self._role_content:
+                continue
+
+            yield ReportNDJSON._record('role',
+                                       name=key,
+                                       dependencies=self._role_content[key],
+                                       level=analysis['levels'][key])
+
+        for item in analysis['dependency_cycles']:
+            yield ReportNDJSON._record('dependency_cycle', roles=item)
+
+        for record in self.__iter_inventory_records():
+            yield record
+
+        for record in self.__iter_variable_records():
+            yield record
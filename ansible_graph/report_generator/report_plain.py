@@ -20,80 +20,140 @@ class ReportPlain(ReportBase):
         @param project_content: project content dictionary with lists
         @type project_content: dict
 
-        @return: str
+        @return: generator
         """
 
-        content = str()
-
-        content += '\n\nFiles:'
+        yield '\n\nFiles:'
         for item in project_content['files']:
-            content += '\n - %s' % item
-        content += '\n\nSubdirectories:'
+            yield '\n - %s' % item
+        yield '\n\nSubdirectories:'
         for item in project_content['directories']:
-            content += '\n - %s' % item
-
-        return content
+            yield '\n - %s' % item
 
     @staticmethod
     def _iterate_roles(roles_content):
         """
+        Iterate over roles dictionary
 
         @param roles_content: roles content dictionary with lists
         @type roles_content: dict
 
-        @return: str
+        @return: generator
         """
 
-        content = str()
-
         for key, value in roles_content.iteritems():
-            content += '\n' + key + ':\n'
+            yield '\n' + key + ':\n'
             if value:
                 for item in value:
-                    content += ' - ' + item + '\n'
+                    yield ' - ' + item + '\n'
 
-        return content
+    def iter_header(self):
+        """
+        Yield plain text meta block
 
-    def render_report(self):
-        """ Create plain text report """
+        @return: generator
+        """
 
         double_line = '=' * 80
-        simple_line = '-' * 80
 
         # define meta
-        meta = double_line
+        yield double_line
         for key, value in self._report_meta.iteritems():
             if value:
-                meta += "\n{:<15} {:<30}".format(key.title() + ':', value)
-        meta += "\n" + double_line
+                yield "\n{:<15} {:<30}".format(key.title() + ':', value)
+        yield "\n" + double_line
 
-        # define project content
-        project = str()
+    def __iter_inventory(self):
+        """
+        Yield inventory groups and unmatched vars, nothing without inventory
 
-        project += '\nDirectory: root'
-        project += ReportPlain._iterate_project(self._project_content['root'])
-        del self._project_content['root']
-        project += '\n' + simple_line
+        @return: generator
+        """
 
-        for key, value in self._project_content.iteritems():
-            project += '\nDirectory: %s' % key
-            project += ReportPlain._iterate_project(value)
-            project += "\n" + simple_line
+        inventory = self._get_inventory_analysis()
 
-        # define roles content
-        roles = str()
+        if inventory is None:
+            return
+
+        yield '-' * 80
+        yield '\nInventory Groups: (%s hosts, %s with host_vars)\n' % (
+            inventory['hosts'], inventory['hosts_with_vars'])
+        for key, value in sorted(inventory['groups'].iteritems()):
+            yield ' - %s (%s hosts)\n' % (key, value['hosts'])
+            for item in value['children']:
+                yield '   child: %s\n' % item
+            for item in value['group_vars']:
+                yield '   group_vars: %s\n' % item
+
+        yield '\nVars without Group or Host:\n'
+        for item in inventory['unmatched_vars']:
+            yield ' - %s\n' % item
+
+    def __iter_variables(self):
+        """
+        Yield unused and undefined variables, nothing without variables
+
+        @return: generator
+        """
+
+        variables = self._get_variable_analysis()
 
-        roles += '\nRoles and Dependencies:\n'
-        roles += ReportPlain._iterate_roles(self._role_content)
+        if variables is None:
+            return
 
-        # combine reports
-        self._report = meta + project + roles
+        yield '-' * 80
+        yield '\nUnused Variables:\n'
+        for key, value in sorted(variables['unused'].iteritems()):
+            yield ' - %s (%s)\n' % (key, ', '.join(value))
 
-    def get_report(self):
+        yield '\nUndefined Variables:\n'
+        for key, value in sorted(variables['undefined'].iteritems()):
+            yield ' - %s (%s)\n' % (key, ', '.join(value))
+
+    def iter_body(self):
         """
-        Return full plain report
+        Yield plain text report content in chunks
 
-        @return: str
+        @return: generator
         """
 
-        return self._report
+        simple_line = '-' * 80
+
+        # define project content
+        yield '\nDirectory: root'
+        for chunk in ReportPlain._iterate_project(
+                self._project_content['root']):
+            yield chunk
+        yield '\n' + simple_line
+
+        for key, value in self._project_content.iteritems():
+            if key == 'root':
+                continue
+
+            yield '\nDirectory: %s' % key
+            for chunk in ReportPlain._iterate_project(value):
+                yield chunk
+            yield "\n" + simple_line
+
+        # define roles content
+        yield '\nRoles and Dependencies:\n'
+        for chunk in ReportPlain._iterate_roles(self._role_content):
+            yield chunk
+
+        # define roles analysis
+        analysis = self._get_role_analysis()
+
+        yield '\n' + simple_line
+        yield '\nDependency Order:\n'
+        for item in analysis['dependency_order']:
+            yield ' - %s (level %s)\n' % (item, analysis['levels'][item])
+
+        yield '\nDependency Cycles:\n'
+        for item in analysis['dependency_cycles']:
+            yield ' - %s\n' % ', '.join(item)
+
+        for chunk in self.__iter_inventory():
+            yield chunk
+
+        for chunk in self.__iter_variables():
+            yield chunk
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 """ XML report generator """
 
-from xml.etree.ElementTree import Element, SubElement
-from defusedxml import minidom, ElementTree
+from xml.sax.saxutils import escape, quoteattr
 
 from .report import ReportBase
 
@@ -16,106 +15,259 @@ class ReportXML(ReportBase):
         ReportBase.__init__(self)
 
     @staticmethod
-    def _prettify_raw_xml(raw_xml):
+    def _encode(value):
         """
-        Return a pretty-printed XML string for the Element
+        Return value as utf-8 encoded string
 
-        @param raw_xml: raw xml object
-        @type raw_xml: object
+        @param value: text value
+        @type value: str
 
         @return: str
         """
-        rough_string = ElementTree.tostring(raw_xml, 'utf-8')
-        re_parsed = minidom.parseString(rough_string)
 
-        return re_parsed.toprettyxml(indent="\t", encoding='utf-8')
+        if isinstance(value, unicode):
+            return value.encode('utf-8')
 
-    def __set_meta_nodes(self):
+        return str(value)
+
+    @staticmethod
+    def _tag(depth, tag, name=None, closed=False, end=False, **attributes):
         """
-        Define all project meta nodes
+        Return indented tag line
+
+        @param depth: nesting depth of tag
+        @type depth: int
+        @param tag: tag name
+        @type tag: str
+        @param name: optional value for name attribute
+        @type name: str
+        @param closed: self-closing tag
+        @type closed: bool
+        @param end: end tag
+        @type end: bool
+        @param attributes: further attributes, after name in sorted order
+        @type attributes: dict
+
+        @return: str
+        """
+
+        line = '\t' * depth + ('</' if end else '<') + tag
+
+        if name is not None:
+            line += ' name=' + quoteattr(ReportXML._encode(name))
 
-        @return: object
+        for key in sorted(attributes):
+            line += ' %s=%s' % (key,
+                                quoteattr(ReportXML._encode(attributes[key])))
+
+        return line + ('/>\n' if closed else '>\n')
+
+    @staticmethod
+    def _list_nodes(depth, tag, child_tag, names):
+        """
+        Yield list node with one named child node per item
+
+        @param depth: nesting depth of list node
+        @type depth: int
+        @param tag: tag name of list node
+        @type tag: str
+        @param child_tag: tag name of child nodes
+        @type child_tag: str
+        @param names: names of child nodes
+        @type names: list
+
+        @return: generator
         """
 
-        root = Element('root')
-        meta_node = SubElement(root, 'project_meta')
+        if not names:
+            yield ReportXML._tag(depth, tag, closed=True)
+            return
+
+        yield ReportXML._tag(depth, tag)
+        for name in names:
+            yield ReportXML._tag(depth + 1, child_tag, name, closed=True)
+        yield ReportXML._tag(depth, tag, end=True)
+
+    def __iter_meta_nodes(self):
+        """
+        Yield all project meta nodes
+
+        @return: generator
+        """
+
+        yield ReportXML._tag(1, 'project_meta')
 
         for key, value in self._report_meta.iteritems():
             if value:
-                item_node = SubElement(meta_node, key)
-                item_node.text = value
+                yield '\t\t<%s>%s</%s>\n' % (
+                    key, escape(ReportXML._encode(value)), key)
 
-        return root
+        yield ReportXML._tag(1, 'project_meta', end=True)
 
-    def __set_project_nodes(self):
+    def __iter_project_nodes(self):
         """
-        Define all project structure nodes
+        Yield all project structure nodes
 
-        @return: object
+        @return: generator
         """
 
-        root = Element('root')
-        structure_node = SubElement(root, 'project_structure')
+        yield ReportXML._tag(1, 'project_structure')
 
         for key, value in self._project_content.iteritems():
-            item_node = SubElement(structure_node, key)
-
-            files_node = SubElement(item_node, 'files')
-            directories_node = SubElement(item_node, 'directories')
+            yield ReportXML._tag(2, 'location', key)
 
-            if value['files']:
-                children = [
-                    Element('file', name=file_value)
-                    for file_value in value['files']
-                    ]
-                files_node.extend(children)
+            for chunk in ReportXML._list_nodes(3, 'files', 'file',
+                                               value['files']):
+                yield chunk
+            for chunk in ReportXML._list_nodes(3, 'directories', 'directory',
+                                               value['directories']):
+                yield chunk
 
-            if value['directories']:
-                children = [
-                    Element('directory', name=dir_value)
-                    for dir_value in value['directories']
-                    ]
-                directories_node.extend(children)
+            yield ReportXML._tag(2, 'location', end=True)
 
-        return root
+        yield ReportXML._tag(1, 'project_structure', end=True)
 
-    def __set_roles_nodes(self):
+    def __iter_roles_nodes(self):
         """
-        Define all roles structure nodes
+        Yield all roles structure nodes
 
-        @return: object
+        @return: generator
         """
 
-        root = Element('root')
-        roles_node = SubElement(root, 'ansible_roles')
+        yield ReportXML._tag(1, 'ansible_roles')
 
         for key, value in self._role_content.iteritems():
-            role_node = SubElement(roles_node, 'ansible_role', name=key)
+            if not value:
+                yield ReportXML._tag(2, 'ansible_role', key, closed=True)
+                continue
 
-            if value:
-                children = [
-                    Element('dependency', name=dependency)
-                    for dependency in value
-                    ]
-                role_node.extend(children)
+            yield ReportXML._tag(2, 'ansible_role', key)
+            for dependency in value:
+                yield ReportXML._tag(3, 'dependency', dependency, closed=True)
+            yield ReportXML._tag(2, 'ansible_role', end=True)
 
-        return root
+        yield ReportXML._tag(1, 'ansible_roles', end=True)
 
-    def render_report(self):
-        """ Create XML report """
+    def __iter_analysis_nodes(self):
+        """
+        Yield roles dependency order and cycles nodes
 
-        root_node = Element('project')
-        root_node.extend(self.__set_meta_nodes())
-        root_node.extend(self.__set_project_nodes())
-        root_node.extend(self.__set_roles_nodes())
+        @return: generator
+        """
 
-        self._report = ReportXML._prettify_raw_xml(root_node)
+        analysis = self._get_role_analysis()
 
-    def get_report(self):
+        yield ReportXML._tag(1, 'role_analysis')
+        yield ReportXML._tag(2, 'dependency_order')
+
+        for item in analysis['dependency_order']:
+            yield ReportXML._tag(3, 'ansible_role', item, closed=True,
+                                 level=analysis['levels'][item])
+
+        yield ReportXML._tag(2, 'dependency_order', end=True)
+
+        if not analysis['dependency_cycles']:
+            yield ReportXML._tag(2, 'dependency_cycles', closed=True)
+        else:
+            yield ReportXML._tag(2, 'dependency_cycles')
+            for item in analysis['dependency_cycles']:
+                for chunk in ReportXML._list_nodes(3, 'cycle', 'ansible_role',
+                                                   item):
+                    yield chunk
+            yield ReportXML._tag(2, 'dependency_cycles', end=True)
+
+        yield ReportXML._tag(1, 'role_analysis', end=True)
+
+    def __iter_inventory_nodes(self):
         """
-        Return full XML report
+        Yield inventory group hierarchy and unmatched vars nodes, none
+        without inventory
 
-        @return: str
+        @return: generator
+        """
+
+        inventory = self._get_inventory_analysis()
+
+        if inventory is None:
+            return
+
+        yield ReportXML._tag(1, 'inventory', hosts=inventory['hosts'],
+                             hosts_with_vars=inventory['hosts_with_vars'])
+
+        for key, value in sorted(inventory['groups'].iteritems()):
+            if not value['children'] and not value['group_vars']:
+                yield ReportXML._tag(2, 'group', key, closed=True,
+                                     hosts=value['hosts'])
+                continue
+
+            yield ReportXML._tag(2, 'group', key, hosts=value['hosts'])
+            for item in value['children']:
+                yield ReportXML._tag(3, 'child', item, closed=True)
+            for item in value['group_vars']:
+                yield ReportXML._tag(3, 'group_vars', item, closed=True)
+            yield ReportXML._tag(2, 'group', end=True)
+
+        for chunk in ReportXML._list_nodes(2, 'unmatched_vars', 'file',
+                                           inventory['unmatched_vars']):
+            yield chunk
+
+        yield ReportXML._tag(1, 'inventory', end=True)
+
+    def __iter_variable_nodes(self):
+        """
+        Yield unused and undefined variable nodes with their files, none
+        without variables
+
+        @return: generator
+        """
+
+        variables = self._get_variable_analysis()
+
+        if variables is None:
+            return
+
+        yield ReportXML._tag(1, 'variable_analysis')
+
+        for tag in ['unused', 'undefined']:
+            yield ReportXML._tag(2, tag)
+            for key, value in sorted(variables[tag].iteritems()):
+                yield ReportXML._tag(3, 'variable', key)
+                for item in value:
+                    yield ReportXML._tag(4, 'file', item, closed=True)
+                yield ReportXML._tag(3, 'variable', end=True)
+            yield ReportXML._tag(2, tag, end=True)
+
+        yield ReportXML._tag(1, 'variable_analysis', end=True)
+
+    def iter_header(self):
+        """
+        Yield XML declaration, project start and meta nodes
+
+        @return: generator
+        """
+
+        yield '<?xml version="1.0" encoding="utf-8"?>\n'
+        yield ReportXML._tag(0, 'project')
+
+        for chunk in self.__iter_meta_nodes():
+            yield chunk
+
+    def iter_body(self):
+        """
+        Yield indented XML content nodes in a single pass
+
+        @return: generator
         """
 
-        return self._report
+        for chunk in self.__iter_project_nodes():
+            yield chunk
+        for chunk in self.__iter_roles_nodes():
+            yield chunk
+        for chunk in self.__iter_analysis_nodes():
+            yield chunk
+        for chunk in self.__iter_inventory_nodes():
+            yield chunk
+        for chunk in self.__iter_variable_nodes():
+            yield chunk
+
+        yield ReportXML._tag(0, 'project', end=True)
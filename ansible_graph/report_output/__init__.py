@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+""" Report output package """
+
+import errno
+import gzip
+import logging
+import os
+
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+
+class ReportOutput(object):
+    """ Report output class, buffered and atomic file output """
+
+    # small report chunks are collected and written in blocks of this size
+    BUFFER_SIZE = 1 << 20
+
+    # compression by file extension of output location
+    COMPRESSION = {'.gz': 'gzip', '.xz': 'xz'}
+
+    def __init__(self, output_path):
+        """
+        Report output constructor
+
+        @param output_path: location of report file, compressed for
+            .gz and .xz extensions
+        @type output_path: str
+
+        @raise e: TypeError
+        @raise e: ValueError
+        """
+
+        self.__logger = logging.getLogger(__name__)
+
+        if not isinstance(output_path, str):
+            msg = 'Parameter: output_path needs to a string'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        if not output_path:
+            msg = 'Parameter: no output_path provided'
+            self.__logger.error(msg)
+            raise ValueError(msg)
+
+        self.__output_path = os.path.abspath(output_path)
+        self.__compression = self.COMPRESSION.get(
+            os.path.splitext(output_path)[1].lower())
+
+        if self.__compression == 'xz' and lzma is None:
+            msg = 'Parameter: xz compression needs lzma (backports.lzma)'
+            self.__logger.error(msg)
+            raise ValueError(msg)
+
+        self.__temp_path = str()
+        self.__file = None
+
+        # GzipFile wrapping file or LZMACompressor, None if uncompressed
+        self.__compressor = None
+
+        # chunks not written yet and their size
+        self.__buffer = {'chunks': list(), 'size': 0}
+
+    def __enter__(self):
+        """
+        Open temporary file next to output location
+
+        @return: ReportOutput
+        """
+
+        self.open()
+
+        return self
+
+    def __exit__(self, error_type, error, trace):
+        """ Publish report on success, remove temporary file on error """
+
+        if error_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def __write_block(self, block):
+        """
+        Write block to temporary file, compressed if configured
+
+        @param block: report data
+        @type block: str
+        """
+
+        if self.__compression == 'gzip':
+            self.__compressor.write(block)
+        elif self.__compression == 'xz':
+            self.__file.write(self.__compressor.compress(block))
+        else:
+            self.__file.write(block)
+
+    def open(self):
+        """
+        Open temporary file next to output location
+
+        @raise e: OSError
+        """
+
+        directory = os.path.dirname(self.__output_path)
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        # same directory as output, so rename replaces it atomically
+        self.__temp_path = '%s/.%s.%d.tmp' % (
+            directory, os.path.basename(self.__output_path), os.getpid())
+        descriptor = os.open(self.__temp_path,
+                             os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0666)
+        self.__file = os.fdopen(descriptor, 'wb')
+
+        if self.__compression == 'gzip':
+            self.__compressor = gzip.GzipFile(
+                os.path.basename(self.__output_path)[:-3], 'wb', 6,
+                self.__file)
+        elif self.__compression == 'xz':
+            self.__compressor = lzma.LZMACompressor()
+
+        self.__logger.debug('Write report - %s', self.__temp_path)
+
+    def write(self, chunk):
+        """
+        Add chunk to buffer, write buffer if full
+
+        @param chunk: report data
+        @type chunk: str
+        """
+
+        self.__buffer['chunks'].append(chunk)
+        self.__buffer['size'] += len(chunk)
+
+        if self.__buffer['size'] >= self.BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        """ Write buffered chunks as one block """
+
+        if self.__buffer['chunks']:
+            self.__write_block(''.join(self.__buffer['chunks']))
+            self.__buffer = {'chunks': list(), 'size': 0}
+
+    def close(self):
+        """
+        Write remaining data and replace output with finished report
+
+        @raise e: IOError
+        @raise e: OSError
+        """
+
+        try:
+            self.flush()
+
+            if self.__compression == 'gzip':
+                self.__compressor.close()
+            elif self.__compression == 'xz':
+                self.__file.write(self.__compressor.flush())
+
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+            self.__file.close()
+        except (IOError, OSError):
+            self.discard()
+            raise
+
+        os.rename(self.__temp_path, self.__output_path)
+
+        self.__logger.info('Report written - %s', self.__output_path)
+
+    def discard(self):
+        """ Close and remove temporary file, output stays unchanged """
+
+        self.__buffer = {'chunks': list(), 'size': 0}
+
+        # compressed stream writes its trailer on close, ignored for discard
+        if self.__compression == 'gzip' and self.__compressor is not None:
+            try:
+                self.__compressor.close()
+            except (IOError, ValueError):
+                pass
+
+        if self.__file is not None and not self.__file.closed:
+            self.__file.close()
+
+        try:
+            os.remove(self.__temp_path)
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
+
+        self.__logger.info('Report discarded - %s', self.__output_path)
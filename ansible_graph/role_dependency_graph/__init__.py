@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+""" Role dependency graph package """
+
+import logging
+from array import array
+
+from ..compressed_graph import CompressedGraph
+
+
+class RoleDependencyGraph(object):
+    """ Role dependency graph class """
+
+    def __init__(self):
+        """ Role dependency graph constructor """
+
+        self.__logger = logging.getLogger(__name__)
+
+        # interned role names, index is the role id
+        self.__names = list()
+        self.__ids = dict()
+
+        # dependencies by role id, in both directions
+        self.__graph = CompressedGraph()
+
+        # analysis results by strongly connected component
+        self.__components = list()
+        self.__component_of = array('i')
+        self.__levels = array('i')
+
+    def __intern(self, name):
+        """
+        Return id of role name, add name if unknown
+
+        @param name: Ansible role name
+        @type name: str
+
+        @return: int
+        """
+
+        role_id = self.__ids.get(name)
+
+        if role_id is None:
+            role_id = len(self.__names)
+            self.__ids[name] = role_id
+            self.__names.append(name)
+
+        return role_id
+
+    def __find_components(self):
+        """ Find strongly connected components, dependencies first """
+
+        self.__components = self.__graph.find_components()
+        self.__component_of = array('i', [-1] * len(self.__names))
+
+        for component_id, component in enumerate(self.__components):
+            for node in component:
+                self.__component_of[node] = component_id
+
+    def __compute_levels(self):
+        """ Compute level per component, dependencies first """
+
+        component_of = self.__component_of
+        levels = array('i', [0] * len(self.__components))
+
+        # Tarjan emits components after all components they depend on
+        for component_id, component in enumerate(self.__components):
+            level = 0
+
+            for node in component:
+                for item in self.__graph.get_targets(node):
+                    target = component_of[item]
+                    if target != component_id:
+                        level = max(level, levels[target] + 1)
+
+            levels[component_id] = level
+
+        self.__levels = levels
+
+    def set_role_content(self, role_content):
+        """
+        Build graph from roles and dependencies
+
+        @param role_content: roles with list of dependencies
+        @type role_content: dict
+
+        @raise e: TypeError
+        """
+
+        if not isinstance(role_content, dict):
+            msg = 'Parameter: role_content needs to a dictionary'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        self.__names = list()
+        self.__ids = dict()
+        edges = list()
+
+        for name in sorted(role_content):
+            self.__intern(name)
+
+        for name in sorted(role_content):
+            source = self.__ids[name]
+            for dependency in role_content[name] or list():
+                edges.append((source, self.__intern(dependency)))
+
+        node_count = len(self.__names)
+        self.__graph.set_edges(node_count, edges)
+
+        self.__find_components()
+        self.__compute_levels()
+
+        self.__logger.debug('Role graph - %s roles, %s dependencies, '
+                            '%s components', node_count, len(edges),
+                            len(self.__components))
+
+    def get_role_names(self):
+        """
+        Return all role names, including referenced but unknown roles
+
+        @return: list
+        """
+
+        return list(self.__names)
+
+    def get_dependencies(self, name):
+        """
+        Return direct dependencies of role
+
+        @param name: Ansible role name
+        @type name: str
+
+        @return: list
+        """
+
+        role_id = self.__ids[name]
+
+        return [
+            self.__names[item] for item in self.__graph.get_targets(role_id)
+            ]
+
+    def get_dependents(self, name):
+        """
+        Return roles which directly depend on role
+
+        @param name: Ansible role name
+        @type name: str
+
+        @return: list
+        """
+
+        role_id = self.__ids[name]
+
+        return [
+            self.__names[item] for item in self.__graph.get_sources(role_id)
+            ]
+
+    def get_cycles(self):
+        """
+        Return dependency cycles, each as list of role names
+
+        @return: list
+        """
+
+        cycles = list()
+
+        for component in self.__components:
+            node = component[0]
+            self_loop = node in self.__graph.get_targets(node)
+
+            if len(component) > 1 or self_loop:
+                cycles.append(sorted([self.__names[item]
+                                      for item in component]))
+
+        return cycles
+
+    def get_connected_components(self):
+        """
+        Return groups of roles connected by dependencies in any direction
+
+        @return: list of sorted role name lists
+        """
+
+        node_count = len(self.__names)
+        component_of = array('i', [-1] * node_count)
+        components = list()
+
+        for root in xrange(node_count):
+            if component_of[root] != -1:
+                continue
+
+            component_of[root] = len(components)
+            component = [root]
+            pending = [root]
+
+            while pending:
+                node = pending.pop()
+                neighbours = self.__graph.get_targets(node) + \
+                    self.__graph.get_sources(node)
+
+                for target in neighbours:
+                    if component_of[target] == -1:
+                        component_of[target] = len(components)
+                        component.append(target)
+                        pending.append(target)
+
+            components.append(sorted([self.__names[item]
+                                      for item in component]))
+
+        return sorted(components)
+
+    def is_cycle_edge(self, name, dependency):
+        """
+        Check if dependency edge is part of a cycle
+
+        @param name: Ansible role name
+        @type name: str
+        @param dependency: Ansible role name of dependency
+        @type dependency: str
+
+        @return: bool
+        """
+
+        return self.__component_of[self.__ids[name]] == \
+            self.__component_of[self.__ids[dependency]]
+
+    def get_topological_order(self):
+        """
+        Return role names with dependencies before dependent roles
+
+        Roles in a cycle are kept next to each other.
+
+        @return: list
+        """
+
+        return [
+            self.__names[node]
+            for component in self.__components
+            for node in sorted(component)
+            ]
+
+    def get_levels(self):
+        """
+        Return dependency level per role, 0 for roles without dependencies
+
+        @return: dict
+        """
+
+        return dict([
+            (name, self.__levels[self.__component_of[role_id]])
+            for role_id, name in enumerate(self.__names)
+            ])
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+""" Scan index package """
+
+import errno
+import json
+import logging
+import os
+try:
+    from os import scandir
+except ImportError:
+    from scandir import scandir
+import threading
+import time
+
+
+class ScanIndex(object):
+    """ Scan index class """
+
+    INDEX_VERSION = 1
+    INDEX_NAME = '.ansible_graph_index'
+
+    # directories modified within this window may still change unnoticed
+    RACY_SECONDS = 2
+
+    def __init__(self):
+        """ Scan index constructor """
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__index_path = str()
+        self.__entries = dict()
+        self.__seen = dict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def __encode_names(names):
+        """
+        Return names as utf-8 byte strings
+
+        @param names: names loaded from index file
+        @type names: list
+
+        @return: list
+        """
+
+        return [
+            name.encode('utf-8') if isinstance(name, unicode) else name
+            for name in names
+            ]
+
+    @staticmethod
+    def __list_directory(directory_path):
+        """
+        Read directory entries with a single scandir pass
+
+        @param directory_path: location of directory
+        @type directory_path: str
+
+        @return: dict
+        """
+
+        listing = {'files': [], 'directories': [], 'links': []}
+
+        for entry in scandir(directory_path):
+            if entry.is_file():
+                listing['files'].append(entry.name)
+
+            if entry.is_dir():
+                if entry.is_symlink():
+                    listing['links'].append(entry.name)
+                else:
+                    listing['directories'].append(entry.name)
+
+        return listing
+
+    def __load_index(self):
+        """ Load index file if available and compatible """
+
+        try:
+            with open(self.__index_path, 'r') as index_file:
+                content = json.load(index_file)
+        except IOError as error:
+            if error.errno != errno.ENOENT:
+                self.__logger.error(error)
+            return
+        except ValueError as error:
+            self.__logger.error('Index %s ignored - %s',
+                                self.__index_path, error)
+            return
+
+        if content.get('version') != self.INDEX_VERSION:
+            self.__logger.info('Index %s outdated', self.__index_path)
+            return
+
+        for key, value in content.get('entries', dict()).iteritems():
+            self.__entries[key.encode('utf-8')] = value
+
+    def set_index_location(self, index_location):
+        """
+        Set directory for index file and load existing index
+
+        @param index_location: directory for index file
+        @type index_location: str
+
+        @raise e: TypeError
+        @raise e: ValueError
+        """
+
+        self.__logger.info('Set scan index location - %s', index_location)
+
+        if not isinstance(index_location, str):
+            msg = 'Parameter: index_location needs to a string'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        if not index_location:
+            msg = 'Parameter: no index_location provided'
+            self.__logger.error(msg)
+            raise ValueError(msg)
+
+        self.__index_path = str(index_location) + '/' + self.INDEX_NAME
+        self.__entries = dict()
+        self.__seen = dict()
+        self.__load_index()
+
+    def read_directory(self, directory_path):
+        """
+        Return directory listing, re-read only if directory metadata changed
+
+        @param directory_path: location of directory
+        @type directory_path: str
+
+        @return: dict with files, directories and links (directory symlinks)
+        """
+
+        # without index location every directory is simply read
+        if not self.__index_path:
+            return ScanIndex.__list_directory(directory_path)
+
+        dir_stat = os.stat(directory_path)
+        key = os.path.abspath(directory_path)
+        entry = self.__seen.get(key) or self.__entries.get(key)
+
+        if entry and entry[0] == dir_stat.st_mtime \
+                and entry[1] == dir_stat.st_ino:
+            self.__logger.debug('Index hit - %s', directory_path)
+            listing = dict([
+                (name, ScanIndex.__encode_names(names))
+                for name, names in entry[2].iteritems()
+                ])
+        else:
+            self.__logger.debug('Index miss - %s', directory_path)
+            listing = ScanIndex.__list_directory(directory_path)
+            entry = [dir_stat.st_mtime, dir_stat.st_ino, listing]
+
+            # skip directories that may change within mtime granularity
+            if time.time() - dir_stat.st_mtime < self.RACY_SECONDS:
+                entry = None
+
+        with self.__lock:
+            if entry:
+                self.__seen[key] = entry
+
+        return listing
+
+    def get_entries(self):
+        """
+        Return entries of all directories read in this run
+
+        @return: dict
+        """
+
+        with self.__lock:
+            return dict(self.__seen)
+
+    def add_entries(self, entries):
+        """
+        Add entries read by another index, saved with own entries
+
+        @param entries: entries, see get_entries
+        @type entries: dict
+        """
+
+        with self.__lock:
+            self.__seen.update(entries)
+
+    def save(self):
+        """ Write index with all directories read in this run """
+
+        if not self.__index_path:
+            return
+
+        self.__logger.info('Write scan index - %s', self.__index_path)
+
+        index_dir = os.path.dirname(self.__index_path)
+
+        try:
+            if not os.path.isdir(index_dir):
+                os.makedirs(index_dir)
+
+            temp_path = self.__index_path + '.tmp'
+            with open(temp_path, 'w') as index_file:
+                json.dump({'version': self.INDEX_VERSION,
+                           'entries': self.__seen},
+                          index_file, separators=(',', ':'))
+            os.rename(temp_path, self.__index_path)
+        except (IOError, OSError) as error:
+            self.__logger.error(error)
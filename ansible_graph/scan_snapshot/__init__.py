@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+""" Scan snapshot package """
+
+import logging
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+
+class ScanSnapshot(object):
+    """ Scan snapshot class, project structure and roles in binary form """
+
+    SNAPSHOT_MAGIC = 'AGSNAP'
+    SNAPSHOT_VERSION = 1
+
+    # magic, version and number of strings
+    HEADER_FORMAT = '<6sHI'
+
+    # typecode and number of items in front of each array
+    ARRAY_FORMAT = '<cI'
+
+    # order of integer arrays after string table
+    ARRAY_NAMES = ['directory_names', 'file_offsets', 'files',
+                   'subdirectory_offsets', 'subdirectories', 'role_names',
+                   'dependency_offsets', 'dependencies']
+
+    def __init__(self):
+        """ Scan snapshot constructor """
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__project_content = dict()
+        self.__role_content = dict()
+
+    @staticmethod
+    def __encode(value):
+        """
+        Return value as utf-8 encoded string
+
+        @param value: text value
+        @type value: str
+
+        @return: str
+        """
+
+        if isinstance(value, unicode):
+            return value.encode('utf-8')
+
+        return str(value)
+
+    @staticmethod
+    def __compress(names, lists, get_string_id):
+        """
+        Return offsets and interned ids of lists in order of names
+
+        @param names: keys of lists
+        @type names: list
+        @param lists: lists of strings by key
+        @type lists: dict
+        @param get_string_id: returns id of string
+        @type get_string_id: callable
+
+        @return: tuple (offsets, ids)
+        """
+
+        offsets = array('i', [0])
+        ids = array('i')
+
+        for name in names:
+            ids.extend([get_string_id(item) for item in lists[name] or list()])
+            offsets.append(len(ids))
+
+        return offsets, ids
+
+    @staticmethod
+    def __expand(strings, names, offsets, ids):
+        """
+        Return lists of strings by name, reverse of __compress
+
+        @param strings: string table
+        @type strings: list
+        @param names: string ids of keys
+        @type names: array
+        @param offsets: offsets of lists in ids
+        @type offsets: array
+        @param ids: string ids of all lists
+        @type ids: array
+
+        @return: dict
+        """
+
+        return dict([
+            (strings[name_id], [
+                strings[item]
+                for item in ids[offsets[index]:offsets[index + 1]]
+                ])
+            for index, name_id in enumerate(names)
+            ])
+
+    @staticmethod
+    def __write_array(snapshot_file, values):
+        """
+        Write array as typecode, item count and little-endian items
+
+        @param snapshot_file: opened snapshot
+        @type snapshot_file: file
+        @param values: integer array
+        @type values: array
+        """
+
+        if sys.byteorder == 'big':
+            values = array(values.typecode, values)
+            values.byteswap()
+
+        snapshot_file.write(struct.pack(ScanSnapshot.ARRAY_FORMAT,
+                                        values.typecode, len(values)))
+        snapshot_file.write(values.tostring())
+
+    @staticmethod
+    def __read_array(content, position):
+        """
+        Read array written by __write_array
+
+        @param content: snapshot content
+        @type content: str
+        @param position: offset of array in content
+        @type position: int
+
+        @return: tuple (array, offset after array)
+        @raise e: ValueError
+        """
+
+        header_size = struct.calcsize(ScanSnapshot.ARRAY_FORMAT)
+
+        if position + header_size > len(content):
+            raise ValueError('Snapshot truncated')
+
+        typecode, count = struct.unpack_from(ScanSnapshot.ARRAY_FORMAT,
+                                             content, position)
+        position += header_size
+
+        values = array(typecode)
+        end = position + count * values.itemsize
+
+        if end > len(content):
+            raise ValueError('Snapshot truncated')
+
+        values.fromstring(content[position:end])
+
+        if sys.byteorder == 'big':
+            values.byteswap()
+
+        return values, end
+
+    def set_snapshot_content(self, project_content, role_content):
+        """
+        Set project structure and roles of snapshot
+
+        @param project_content: directories with files and directories,
+            see AnsibleDirectoryReader
+        @type project_content: dict
+        @param role_content: roles with dependencies, see AnsibleRoleReader
+        @type role_content: dict
+
+        @raise e: TypeError
+        """
+
+        if not isinstance(project_content, dict):
+            msg = 'Parameter: project_content needs to a dictionary'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        if not isinstance(role_content, dict):
+            msg = 'Parameter: role_content needs to a dictionary'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        self.__project_content = project_content
+        self.__role_content = role_content
+
+    def get_project_content(self):
+        """
+        Return project structure of snapshot
+
+        @return: dict
+        """
+
+        return self.__project_content
+
+    def get_role_content(self):
+        """
+        Return roles and dependencies of snapshot
+
+        @return: dict
+        """
+
+        return self.__role_content
+
+    def __build_arrays(self):
+        """
+        Return string table and integer arrays of snapshot content
+
+        @return: tuple (list of strings, dict of arrays by name)
+        """
+
+        strings = list()
+        ids = dict()
+
+        def get_string_id(value):
+            """ Return id of string, add string if unknown """
+
+            value = ScanSnapshot.__encode(value)
+            string_id = ids.get(value)
+
+            if string_id is None:
+                string_id = len(strings)
+                ids[value] = string_id
+                strings.append(value)
+
+            return string_id
+
+        # sorted, so same content gives same snapshot
+        directories = sorted(self.__project_content)
+        roles = sorted(self.__role_content)
+
+        arrays = dict()
+        arrays['directory_names'] = array('i', [
+            get_string_id(item) for item in directories
+            ])
+        arrays['file_offsets'], arrays['files'] = ScanSnapshot.__compress(
+            directories, dict([
+                (key, value['files'])
+                for key, value in self.__project_content.iteritems()
+                ]), get_string_id)
+        arrays['subdirectory_offsets'], arrays['subdirectories'] = \
+            ScanSnapshot.__compress(directories, dict([
+                (key, value['directories'])
+                for key, value in self.__project_content.iteritems()
+                ]), get_string_id)
+        arrays['role_names'] = array('i', [
+            get_string_id(item) for item in roles
+            ])
+        arrays['dependency_offsets'], arrays['dependencies'] = \
+            ScanSnapshot.__compress(roles, self.__role_content,
+                                    get_string_id)
+
+        return strings, arrays
+
+    def __read_arrays(self, content, snapshot_path):
+        """
+        Return string table and integer arrays of snapshot content
+
+        @param content: snapshot content
+        @type content: str
+        @param snapshot_path: location of snapshot, for messages
+        @type snapshot_path: str
+
+        @return: tuple (list of strings, dict of arrays by name)
+        @raise e: ValueError
+        """
+
+        header_size = struct.calcsize(self.HEADER_FORMAT)
+
+        if len(content) < header_size + 4:
+            raise ValueError('Snapshot truncated - %s' % snapshot_path)
+
+        magic, version, string_count = struct.unpack_from(
+            self.HEADER_FORMAT, content)
+
+        if magic != self.SNAPSHOT_MAGIC:
+            raise ValueError('No snapshot - %s' % snapshot_path)
+
+        if version != self.SNAPSHOT_VERSION:
+            raise ValueError('Snapshot version %s not supported - %s' % (
+                version, snapshot_path))
+
+        lengths, position = ScanSnapshot.__read_array(content, header_size)
+
+        if len(lengths) != string_count:
+            raise ValueError('Snapshot corrupt - %s' % snapshot_path)
+
+        strings = list()
+        checksum = zlib.crc32(content[position:position + sum(lengths)])
+
+        for length in lengths:
+            strings.append(content[position:position + length])
+            position += length
+
+        arrays = dict()
+
+        for name in self.ARRAY_NAMES:
+            arrays[name], position = ScanSnapshot.__read_array(content,
+                                                               position)
+            checksum = zlib.crc32(arrays[name].tostring(), checksum)
+
+        if len(content) != position + 4 or \
+                struct.unpack_from('<I', content, position)[0] != \
+                checksum & 0xffffffff:
+            raise ValueError('Snapshot corrupt - %s' % snapshot_path)
+
+        return strings, arrays
+
+    def save(self, snapshot_path):
+        """
+        Write snapshot, replaced only when complete
+
+        @param snapshot_path: location of snapshot
+        @type snapshot_path: str
+
+        @raise e: IOError
+        @raise e: OSError
+        """
+
+        strings, arrays = self.__build_arrays()
+        directory = os.path.dirname(os.path.abspath(snapshot_path))
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        temp_path = '%s.%d.tmp' % (snapshot_path, os.getpid())
+
+        with open(temp_path, 'wb') as snapshot_file:
+            snapshot_file.write(struct.pack(
+                self.HEADER_FORMAT, self.SNAPSHOT_MAGIC,
+                self.SNAPSHOT_VERSION, len(strings)))
+
+            # string table, lengths followed by concatenated strings
+            ScanSnapshot.__write_array(
+                snapshot_file, array('I', [len(item) for item in strings]))
+            blob = ''.join(strings)
+            snapshot_file.write(blob)
+            checksum = zlib.crc32(blob)
+
+            for name in self.ARRAY_NAMES:
+                ScanSnapshot.__write_array(snapshot_file, arrays[name])
+                checksum = zlib.crc32(arrays[name].tostring(), checksum)
+
+            snapshot_file.write(struct.pack('<I', checksum & 0xffffffff))
+
+        os.rename(temp_path, snapshot_path)
+
+        self.__logger.info('Snapshot saved - %s, %s strings', snapshot_path,
+                           len(strings))
+
+    def load(self, snapshot_path):
+        """
+        Read snapshot into project structure and roles
+
+        @param snapshot_path: location of snapshot
+        @type snapshot_path: str
+
+        @raise e: IOError
+        @raise e: ValueError
+        """
+
+        with open(snapshot_path, 'rb') as snapshot_file:
+            content = snapshot_file.read()
+
+        strings, arrays = self.__read_arrays(content, snapshot_path)
+
+        files = ScanSnapshot.__expand(
+            strings, arrays['directory_names'], arrays['file_offsets'],
+            arrays['files'])
+        subdirectories = ScanSnapshot.__expand(
+            strings, arrays['directory_names'],
+            arrays['subdirectory_offsets'], arrays['subdirectories'])
+
+        self.__project_content = dict([
+            (key, {'files': value, 'directories': subdirectories[key]})
+            for key, value in files.iteritems()
+            ])
+        self.__role_content = ScanSnapshot.__expand(
+            strings, arrays['role_names'], arrays['dependency_offsets'],
+            arrays['dependencies'])
+
+        self.__logger.info('Snapshot loaded - %s, %s directories, %s roles',
+                           snapshot_path, len(self.__project_content),
+                           len(self.__role_content))
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+""" Stage result package """
+
+import threading
+from multiprocessing import TimeoutError
+
+
+class StageResult(object):
+    """ Stage result class, value or error of a pipelined stage """
+
+    def __init__(self):
+        """
+        Stage result constructor
+
+        Unlike AsyncResult of Python 2, any number of threads can wait for
+        the same result.
+        """
+
+        self.__event = threading.Event()
+        self.__success = False
+        self.__value = None
+        self.__error = RuntimeError('Stage not finished')
+
+    def set_value(self, value):
+        """
+        Set value of finished stage and wake all waiting threads
+
+        @param value: return value of stage
+        @type value: object
+        """
+
+        self.__success = True
+        self.__value = value
+        self.__event.set()
+
+    def set_error(self, error):
+        """
+        Set error of failed stage and wake all waiting threads
+
+        @param error: error raised by stage
+        @type error: Exception
+        """
+
+        self.__success = False
+        self.__error = error
+        self.__event.set()
+
+    def ready(self):
+        """
+        Return if stage finished
+
+        @return: bool
+        """
+
+        return self.__event.is_set()
+
+    def successful(self):
+        """
+        Return if stage finished without error
+
+        @return: bool
+        """
+
+        return self.ready() and self.__success
+
+    def wait(self, timeout=None):
+        """
+        Wait until stage finished
+
+        @param timeout: seconds to wait at most, None waits without limit
+        @type timeout: float
+        """
+
+        self.__event.wait(timeout)
+
+    def get(self, timeout=None):
+        """
+        Return value of stage, raise its error if it failed
+
+        @param timeout: seconds to wait at most, None waits without limit
+        @type timeout: float
+
+        @return: object
+        @raise e: TimeoutError
+        """
+
+        if not self.__event.wait(timeout):
+            raise TimeoutError()
+
+        if not self.__success:
+            raise self.__error
+
+        return self.__value
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+""" Stage timer package """
+
+import logging
+import os
+import resource
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+class StageTimer(object):
+    """ Stage timer class """
+
+    def __init__(self, enabled=False):
+        """
+        Stage timer constructor
+
+        @param enabled: record stages, disabled timers only run the stages
+        @type enabled: bool
+        """
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__enabled = bool(enabled)
+        self.__stages = OrderedDict()
+        self.__lock = threading.Lock()
+
+        if self.__enabled and tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @staticmethod
+    def __get_cpu_time():
+        """
+        Return user and system CPU time of process
+
+        @return: float
+        """
+
+        times = os.times()
+
+        return times[0] + times[1]
+
+    @staticmethod
+    def __get_peak_memory():
+        """
+        Return peak memory in bytes, traced Python memory if available
+
+        Without tracemalloc this is the resident set size maximum over the
+        whole process lifetime, not the peak of a single stage.
+
+        @return: int
+        """
+
+        if tracemalloc and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[1]
+
+        # resident set size, kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def is_enabled(self):
+        """
+        Return True if stages are recorded
+
+        @return: bool
+        """
+
+        return self.__enabled
+
+    def __get_stage(self, stage):
+        """
+        Return record of stage, create it if unknown
+
+        @param stage: name of stage
+        @type stage: str
+
+        @return: dict
+        """
+
+        return self.__stages.setdefault(
+            stage, {'wall': 0.0, 'cpu': 0.0, 'peak_memory': 0,
+                    'counts': OrderedDict()})
+
+    @contextmanager
+    def measure(self, stage):
+        """
+        Record wall time, process CPU time and peak memory of stage
+
+        Stages running in parallel share process CPU time and memory.
+
+        @param stage: name of stage
+        @type stage: str
+        """
+
+        if not self.__enabled:
+            yield
+            return
+
+        if tracemalloc and hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+        wall = time.time()
+        cpu = StageTimer.__get_cpu_time()
+
+        try:
+            yield
+        finally:
+            wall = time.time() - wall
+            cpu = StageTimer.__get_cpu_time() - cpu
+            peak = StageTimer.__get_peak_memory()
+
+            with self.__lock:
+                record = self.__get_stage(stage)
+                record['wall'] += wall
+                record['cpu'] += cpu
+                record['peak_memory'] = max(record['peak_memory'], peak)
+
+            self.__logger.debug('Stage %s - %.4fs', stage, wall)
+
+    def add_count(self, stage, name, value):
+        """
+        Add to counter of stage, e.g. files or bytes
+
+        @param stage: name of stage
+        @type stage: str
+        @param name: name of counter
+        @type name: str
+        @param value: value added to counter
+        @type value: int
+        """
+
+        if not self.__enabled:
+            return
+
+        with self.__lock:
+            counts = self.__get_stage(stage)['counts']
+            counts[name] = counts.get(name, 0) + value
+
+    def get_timings(self):
+        """
+        Return recorded stages in order of first use
+
+        @return: OrderedDict
+        """
+
+        return self.__stages
+
+    def write_timings(self, stream):
+        """
+        Write recorded stages as table to file-like object
+
+        @param stream: file-like object with write method
+        @type stream: object
+        """
+
+        row = '{:<24} {:>9} {:>9} {:>10}  {}\n'
+        stream.write(row.format('Stage', 'Wall (s)', 'CPU* (s)',
+                                'Peak* (MB)', 'Counts'))
+        stream.write('-' * 80 + '\n')
+
+        for stage, record in self.__stages.iteritems():
+            counts = ', '.join(['%s=%s' % (key, value)
+                                for key, value in record['counts'].items()])
+            stream.write(row.format(stage,
+                                    '%.4f' % record['wall'],
+                                    '%.4f' % record['cpu'],
+                                    '%.1f' % (record['peak_memory'] / 1048576.0),
+                                    counts))
+
+        stream.write('-' * 80 + '\n')
+        stream.write('* process totals, shared by stages running in '
+                     'parallel\n')
+
+        if not (tracemalloc and hasattr(tracemalloc, 'reset_peak')):
+            stream.write('* peak is process lifetime maximum, not per '
+                         'stage\n')
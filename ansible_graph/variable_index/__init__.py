@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+""" Variable index package """
+
+import logging
+
+
+class VariableIndex(object):
+    """ Variable index class """
+
+    # variables provided by Ansible or Jinja, never defined in a project
+    BUILTIN_VARIABLES = frozenset([
+        'and', 'environment', 'false', 'False', 'group_names', 'groups',
+        'hostvars', 'in', 'inventory_dir', 'inventory_file',
+        'inventory_hostname', 'inventory_hostname_short', 'is', 'item',
+        'lookup', 'loop', 'none', 'None', 'not', 'omit', 'or', 'play_hosts',
+        'playbook_dir', 'q', 'query', 'range', 'role_name', 'role_path',
+        'true', 'True', 'vars'])
+
+    # prefix of facts, magic and connection variables
+    BUILTIN_PREFIX = 'ansible_'
+
+    def __init__(self):
+        """ Variable index constructor """
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__defined_in = dict()
+        self.__assigned = set()
+        self.__referenced_in = dict()
+
+    @staticmethod
+    def __is_builtin(name):
+        """
+        Check if variable is provided by Ansible or Jinja
+
+        @param name: variable name
+        @type name: str
+
+        @return: bool
+        """
+
+        return name in VariableIndex.BUILTIN_VARIABLES or \
+            name.startswith(VariableIndex.BUILTIN_PREFIX)
+
+    def set_variable_content(self, variable_content):
+        """
+        Build index from scan results per file
+
+        @param variable_content: definitions, assignments and references
+            by file, see AnsibleVariableReader
+        @type variable_content: dict
+
+        @raise e: TypeError
+        """
+
+        if not isinstance(variable_content, dict):
+            msg = 'Parameter: variable_content needs to a dictionary'
+            self.__logger.error(msg)
+            raise TypeError(msg)
+
+        self.__defined_in = dict()
+        self.__assigned = set()
+        self.__referenced_in = dict()
+
+        for file_path, value in variable_content.iteritems():
+            for name in value['definitions']:
+                self.__defined_in.setdefault(name, list()).append(file_path)
+            for name in value['references']:
+                self.__referenced_in.setdefault(name, list()).append(file_path)
+            self.__assigned.update(value['assignments'])
+
+        self.__logger.debug('Variable index - %s defined, %s referenced',
+                            len(self.__defined_in), len(self.__referenced_in))
+
+    def get_defined_count(self):
+        """
+        Return number of variables defined in vars files
+
+        @return: int
+        """
+
+        return len(self.__defined_in)
+
+    def get_referenced_count(self):
+        """
+        Return number of referenced variables
+
+        @return: int
+        """
+
+        return len(self.__referenced_in)
+
+    def get_definitions(self, name):
+        """
+        Return vars files defining variable
+
+        @param name: variable name
+        @type name: str
+
+        @return: list
+        """
+
+        return sorted(self.__defined_in.get(name, list()))
+
+    def get_references(self, name):
+        """
+        Return files referencing variable
+
+        @param name: variable name
+        @type name: str
+
+        @return: list
+        """
+
+        return sorted(self.__referenced_in.get(name, list()))
+
+    def get_unused(self):
+        """
+        Return variables defined in vars files but never referenced
+
+        @return: dict with sorted defining files by variable name
+        """
+
+        return dict([
+            (name, sorted(files))
+            for name, files in self.__defined_in.iteritems()
+            if name not in self.__referenced_in and
+            not VariableIndex.__is_builtin(name)
+            ])
+
+    def get_undefined(self):
+        """
+        Return referenced variables which are defined nowhere
+
+        @return: dict with sorted referencing files by variable name
+        """
+
+        return dict([
+            (name, sorted(files))
+            for name, files in self.__referenced_in.iteritems()
+            if name not in self.__defined_in and
+            name not in self.__assigned and
+            not VariableIndex.__is_builtin(name)
+            ])
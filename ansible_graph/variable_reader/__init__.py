@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+""" Ansible variable reader package """
+
+import logging
+import os
+import re
+
+from ..file_scanner import FileScannerBase
+
+
+# single pattern for all files, the group name tells the kind of match
+VARIABLE_PATTERN = re.compile(
+    # task condition as list: when: followed by indented list items
+    r'^(?P<when_indent>[ \t]*)(?:-[ \t]+)?when:[ \t]*\n'
+    r'(?P<conditions>(?:(?P=when_indent)[ \t]*-[ \t][^\n]*(?:\n|$))+)'
+    # task condition: when: expression
+    r'|\bwhen:[ \t]*(?P<condition>[^ \t\n][^\n]*)'
+    # top level key of vars file: name: value
+    r'|^(?P<key>[A-Za-z_][A-Za-z0-9_]*)[ \t]*:(?=[ \t]|$)'
+    # ini inventory variable: name=value
+    r'|^(?P<assignment>[A-Za-z_][A-Za-z0-9_]*)[ \t]*='
+    # registered task result
+    r'|\bregister:[ \t]*["\']?(?P<register>[A-Za-z_][A-Za-z0-9_]*)'
+    # lines of set_fact or vars block, looked ahead to keep its expressions
+    r'|\b(?:set_fact|vars):[ \t]*\n(?=(?P<block>(?P<indent>[ \t]+)[^\n]*\n?'
+    r'(?:(?P=indent)[^\n]*\n?)*))'
+    # jinja expression, ends at the next {{ if it is not closed
+    r'|\{\{(?P<expression>(?:[^{}]|\}(?!\})|\{(?!\{))*)\}\}'
+    # jinja statement, ends at the next {% if it is not closed
+    r'|\{%(?P<statement>(?:[^{%]|%(?!\})|\{(?!%))*)%\}',
+    re.MULTILINE)
+
+# first key per line of a set_fact or vars block
+BLOCK_KEY_PATTERN = re.compile(r'^([ \t]+)([A-Za-z_][A-Za-z0-9_]*)[ \t]*:',
+                               re.MULTILINE)
+
+# string literals of expressions, their content is no variable
+STRING_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'')
+
+# names of expressions, with dot or pipe in front and call or keyword
+# argument behind, attributes, filters, functions and arguments are skipped
+NAME_PATTERN = re.compile(
+    r'([.|]?)[ \t]*\b([A-Za-z_][A-Za-z0-9_]*)\b(?=[ \t]*(\(|=(?!=))?)')
+
+# jinja loop and set statements, targets are assigned
+FOR_PATTERN = re.compile(r'^for[ \t]+(.*?)[ \t]+in[ \t]+(.*)$', re.DOTALL)
+SET_PATTERN = re.compile(r'^set[ \t]+([^=]*)(?:=(.*))?$', re.DOTALL)
+
+# words of jinja expressions which are no variables
+JINJA_KEYWORDS = frozenset(['and', 'or', 'not', 'in', 'is', 'if', 'else',
+                            'recursive', 'true', 'false', 'none', 'True',
+                            'False', 'None'])
+
+
+def read_block_keys(block):
+    """
+    Return keys of set_fact or vars block at its first indentation
+
+    @param block: indented lines following set_fact or vars
+    @type block: str
+
+    @return: list
+    """
+
+    keys = list()
+    indent = None
+
+    for match in BLOCK_KEY_PATTERN.finditer(block):
+        if indent is None:
+            indent = match.group(1)
+        if match.group(1) == indent:
+            keys.append(match.group(2))
+
+    return keys
+
+
+def read_expression_names(expression):
+    """
+    Return variable names of jinja expression
+
+    Attributes, filters, tests, functions, keyword arguments, string
+    literals and jinja keywords are left out.
+
+    @param expression: jinja expression without delimiters
+    @type expression: str
+
+    @return: list
+    """
+
+    names = list()
+    after_is = False
+
+    for prefix, name, call in NAME_PATTERN.findall(
+            STRING_PATTERN.sub(' ', expression)):
+        if name in JINJA_KEYWORDS:
+            after_is = name == 'is' or (after_is and name == 'not')
+            continue
+
+        # tests follow "is" or "is not"
+        if not prefix and not call and not after_is:
+            names.append(name)
+
+        after_is = False
+
+    return names
+
+
+def read_condition_names(condition):
+    """
+    Return variable names of task condition
+
+    @param condition: condition as written in YAML, maybe quoted
+    @type condition: str
+
+    @return: list
+    """
+
+    condition = condition.strip()
+
+    # quotes of YAML scalar, not of a string literal
+    if len(condition) > 1 and condition[0] in '"\'' and \
+            condition[-1] == condition[0]:
+        condition = condition[1:-1]
+
+    return read_expression_names(condition)
+
+
+def read_key(match, kind, found):
+    """
+    Add top level key, it only defines a variable in vars files
+
+    @param match: match of key group
+    @type match: MatchObject
+    @param kind: kind of file [definition, inventory, reference]
+    @type kind: str
+    @param found: sets of definitions, assignments and references
+    @type found: dict
+    """
+
+    if kind == 'definition':
+        found['definitions'].add(match.group('key'))
+
+
+def read_assignment(match, kind, found):
+    """
+    Add variable of ini inventory line
+
+    @param match: match of assignment group
+    @type match: MatchObject
+    @param kind: kind of file [definition, inventory, reference]
+    @type kind: str
+    @param found: sets of definitions, assignments and references
+    @type found: dict
+    """
+
+    if kind == 'inventory':
+        found['assignments'].add(match.group('assignment'))
+
+
+def read_register(match, _, found):
+    """
+    Add registered task result
+
+    @param match: match of register group
+    @type match: MatchObject
+    @param found: sets of definitions, assignments and references
+    @type found: dict
+    """
+
+    found['assignments'].add(match.group('register'))
+
+
+def read_block(match, _, found):
+    """
+    Add keys of set_fact and vars blocks
+
+    @param match: match of block group
+    @type match: MatchObject
+    @param found: sets of definitions, assignments and references
+    @type found: dict
+    """
+
+    found['assignments'].update(read_block_keys(match.group('block')))
+
+
+def read_expression(match, _, found):
+    """
+    Add variables of jinja expression
+
+    @param match: match of expression group
+    @type match: MatchObject
+    @param found: sets of definitions, assignments and references
+    @type found: dict
+    """
+
+    found['references'].update(read_expression_names(
+        match.group('expression').strip('-+')))
+
+
+def read_statement(match, _, found):
+    """
+    Add loop and set targets and variables of jinja statement
+
+    Only for, set, if and elif statements are read.
+
+    @param match: match of statement group
+    @type match: MatchObject
+    @param found: sets of definitions, assignments and references
+    @type found: dict
+    """
+
+    statement = match.group('statement').strip('-+ \t\n')
+    keyword = statement.split(None, 1)[0] if statement else None
+    assignment = FOR_PATTERN.match(statement) or \
+        SET_PATTERN.match(statement)
+
+    if assignment:
+        found['assignments'].update(
+            re.findall(r'[A-Za-z_][A-Za-z0-9_]*', assignment.group(1)))
+        found['references'].update(read_expression_names(
+            assignment.group(2) or str()))
+    elif keyword in ['if', 'elif']:
+        found['references'].update(read_expression_names(
+            statement[len(keyword):]))
+
+
+def read_condition(match, _, found):
+    """
+    Add variables of task condition
+
+    @param match: match of condition group
+    @type match: MatchObject
+    @param found: sets of definitions, assignments and references
+    @type found: dict
+    """
+
+    found['references'].update(read_condition_names(
+        match.group('condition')))
+
+
+def read_conditions(match, _, found):
+    """
+    Add variables of task conditions given as list
+
+    @param match: match of conditions group
+    @type match: MatchObject
+    @param found: sets of definitions, assignments and references
+    @type found: dict
+    """
+
+    for line in match.group('conditions').splitlines():
+        found['references'].update(read_condition_names(
+            line.strip()[1:]))
+
+
+# match handler by group name
+MATCH_HANDLERS = {'key': read_key, 'assignment': read_assignment,
+                  'register': read_register, 'block': read_block,
+                  'expression': read_expression,
+                  'statement': read_statement,
+                  'condition': read_condition,
+                  'conditions': read_conditions}
+
+
+def scan_variable_content(content, kind):
+    """
+    Scan content for variable definitions and references
+
+    Module level function, so it can be used by a process pool. Content is
+    matched with a single pattern, nothing is parsed.
+
+    @param content: file content, string or memory map
+    @type content: str
+    @param kind: kind of file [definition, inventory, reference]
+    @type kind: str
+
+    @return: tuple (definitions, assignments, references)
+    """
+
+    found = {'definitions': set(), 'assignments': set(),
+             'references': set()}
+
+    for match in VARIABLE_PATTERN.finditer(content):
+        MATCH_HANDLERS[match.lastgroup](match, kind, found)
+
+    return (sorted(found['definitions']), sorted(found['assignments']),
+            sorted(found['references']))
+
+
+class AnsibleVariableReader(FileScannerBase):
+    """ Ansible variable reader class """
+
+    # role directories with variable definitions and references
+    ROLE_DEFINITION_DIRECTORIES = ['defaults', 'vars']
+    ROLE_REFERENCE_DIRECTORIES = ['tasks', 'handlers', 'templates', 'meta']
+
+    # text files scanned for variables
+    SCANNED_EXTENSIONS = ['', '.yml', '.yaml', '.json', '.j2', '.ini', '.cfg',
+                          '.conf', '.sh', '.txt', '.xml']
+
+    def __init__(self):
+        """ Ansible variable reader constructor """
+
+        super(AnsibleVariableReader, self).__init__()
+
+        self.__logger = logging.getLogger(__name__)
+
+        self.__files = dict()
+        self.__ansible_variables = dict()
+
+    def __get_role_files(self):
+        """
+        Return scanned files of all roles
+
+        @return: dict of locations with kind
+        """
+
+        definitions = self._get_role_files(self.ROLE_DEFINITION_DIRECTORIES,
+                                           self.SCANNED_EXTENSIONS)
+        references = self._get_role_files(self.ROLE_REFERENCE_DIRECTORIES,
+                                          self.SCANNED_EXTENSIONS)
+
+        files = dict.fromkeys(references, 'reference')
+        files.update(dict.fromkeys(definitions, 'definition'))
+
+        return files
+
+    def __get_files(self, playbooks, inventory):
+        """
+        Return scanned files of roles, playbooks, inventory and vars
+
+        @param playbooks: playbooks keyed by location relative to project
+        @type playbooks: list
+        @param inventory: inventory content, see AnsibleInventoryReader
+        @type inventory: dict
+
+        @return: dict of locations with kind
+        """
+
+        files = self.__get_role_files()
+
+        for item in playbooks:
+            files[os.path.join(self._project_path, item)] = 'reference'
+
+        for item in inventory.get('sources') or list():
+            files[os.path.join(self._project_path, item)] = 'inventory'
+
+        for vars_directory in ['group_vars', 'host_vars']:
+            for paths in (inventory.get(vars_directory) or dict()).values():
+                for item in paths:
+                    files.update(dict.fromkeys(self._get_directory_files(
+                        os.path.join(self._project_path, item),
+                        self.SCANNED_EXTENSIONS), 'definition'))
+
+        return files
+
+    def __set_results(self, results):
+        """
+        Store scan results by location relative to project
+
+        @param results: list of tuples (location, tuple (definitions,
+            assignments, references))
+        @type results: list
+        """
+
+        for file_path, (definitions, assignments, references) in results:
+            self.__ansible_variables[
+                os.path.relpath(file_path, self._project_path)] = {
+                    'definitions': definitions,
+                    'assignments': assignments,
+                    'references': references}
+
+    def get_ansible_variables(self, playbooks, inventory):
+        """
+        Return variable definitions, assignments and references per file
+
+        Definitions are top level keys of vars files, assignments are
+        registered results, set_fact/vars keys, inventory variables and
+        template loop targets.
+
+        @param playbooks: playbooks keyed by location relative to project
+        @type playbooks: list
+        @param inventory: inventory content, see AnsibleInventoryReader
+        @type inventory: dict
+
+        @return: dict
+        """
+
+        self.__logger.info('Read Ansible variables')
+
+        self.__files = self.__get_files(playbooks, inventory)
+        self.__ansible_variables.clear()
+        self.__set_results(self._scan_files(scan_variable_content,
+                                            self.__files))
+
+        return self.__ansible_variables
+
+    def get_file_count(self):
+        """
+        Return number of scanned files
+
+        @return: int
+        """
+
+        return len(self.__files)
+
+    def update_ansible_variables(self, playbooks, inventory, changed_paths):
+        """
+        Re-scan changed files and files added to scanned directories
+
+        The dictionary of get_ansible_variables is updated in place.
+
+        @param playbooks: playbooks keyed by location relative to project
+        @type playbooks: list
+        @param inventory: inventory content, see AnsibleInventoryReader
+        @type inventory: dict
+        @param changed_paths: locations of changed directories and files
+        @type changed_paths: list
+
+        @return: bool, True if variables changed
+        """
+
+        changed = set([os.path.abspath(item) for item in changed_paths])
+        files = self.__get_files(playbooks, inventory)
+
+        # new, removed or changed files
+        rescanned = dict([
+            (path, kind) for path, kind in files.iteritems()
+            if path not in self.__files or os.path.abspath(path) in changed or
+            self.__files[path] != kind
+            ])
+        removed = [path for path in self.__files if path not in files]
+
+        if not rescanned and not removed:
+            return False
+
+        self.__logger.info('Update Ansible variables')
+
+        previous = dict(self.__ansible_variables)
+
+        for path in removed:
+            self.__ansible_variables.pop(
+                os.path.relpath(path, self._project_path), None)
+
+        self.__files = files
+        self.__set_results(self._scan_files(scan_variable_content, rescanned))
+
+        return self.__ansible_variables != previous
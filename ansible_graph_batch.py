@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+""" AnsibleGraph batch file """
+
+import glob
+import logging
+import sys
+import os
+
+from ansible_graph.batch_runner import AnsibleGraphBatchRunner
+from ansible_graph.command_line import add_format_arguments, \
+    get_argument_parser, set_logging_level
+
+
+class AnsibleGraphBatch(object):
+    """ AnsibleGraph batch class """
+
+    @staticmethod
+    def __parse_arguments():
+        """
+        Parse given command-line arguments
+
+        @return: class
+        """
+
+        parser = get_argument_parser(
+            'Ansible-Graph automated graphs for many Ansible projects')
+
+        # set optional arguments
+        add_format_arguments(parser)
+
+        parser.add_argument("-j", "--jobs",
+                            type=int,
+                            default=1,
+                            help="set number of projects run in parallel")
+
+        parser.add_argument("--force",
+                            action="store_true",
+                            help="render graphs and reports even if unchanged")
+
+        parser.add_argument("--no-graph", "--report-only",
+                            dest="no_graph",
+                            action="store_true",
+                            help="write reports only, skip graph rendering")
+
+        # set mandatory arguments
+        parser.add_argument("config", help="location of configuration file")
+        parser.add_argument("projects",
+                            nargs='+',
+                            help="Ansible project directories or glob "
+                                 "patterns")
+
+        return parser.parse_args()
+
+    def __init__(self):
+        """ AnsibleGraph batch constructor """
+
+        # initialize logging
+        self.__logger = logging.getLogger(__name__)
+
+        # parse arguments
+        args = AnsibleGraphBatch.__parse_arguments()
+
+        # set logging level
+        set_logging_level(args.verbosity)
+
+        # assign arguments
+        self.__args = args
+        self.__projects = list()
+
+    def verify_arguments(self):
+        """ Verify application arguments """
+
+        self.__logger.info('** verify given arguments **')
+
+        # check configuration file argument
+        if not os.path.isfile(self.__args.config) or \
+                not os.access(self.__args.config, os.R_OK):
+            self.__logger.error('%s not found', self.__args.config)
+            sys.exit(1)
+
+        # expand patterns, missing projects fail in the summary
+        for pattern in self.__args.projects:
+            for item in sorted(glob.glob(pattern)) or [pattern]:
+                if not os.path.isdir(item) or not os.access(item, os.R_OK):
+                    self.__logger.error('%s not found', item)
+                self.__projects.append(item)
+
+    def run_batch(self):
+        """ Start batch run """
+
+        options = dict()
+        options['report'] = self.__args.report
+        options['format'] = self.__args.format
+        options['force'] = self.__args.force
+        options['graph'] = not self.__args.no_graph
+
+        self.__logger.debug('options - %s', options)
+
+        try:
+            self.__logger.info('** start batch run **')
+
+            batch = AnsibleGraphBatchRunner(self.__projects,
+                                            self.__args.config,
+                                            options,
+                                            self.__args.jobs)
+            summaries = batch.run_batch()
+            batch.write_summary(sys.stdout)
+
+        except (ValueError, TypeError, IOError, OSError) as error:
+            self.__logger.error(error)
+            sys.exit(1)
+
+        if [item for item in summaries if item['status'] != 'ok']:
+            sys.exit(2)
+
+
+if __name__ == '__main__':
+    RUN = AnsibleGraphBatch()
+    RUN.verify_arguments()
+    RUN.run_batch()
@@ -0,0 +1,462 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+""" AnsibleGraph benchmark file """
+
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from ansible_graph.command_line import REPORT_FORMATS, \
+    add_format_arguments, get_argument_parser, set_logging_level
+from ansible_graph.configuration_reader import ReadConfiguration
+from ansible_graph.ansible_directory_reader import AnsibleDirectoryReader
+from ansible_graph.ansible_role_reader import AnsibleRoleReader
+from ansible_graph.graph_generator import GraphGenerator
+from ansible_graph.report_generator import ReportGenerator
+
+
+class SyntheticProject(object):
+    """ Synthetic Ansible project generator class """
+
+    ROLE_DIRECTORIES = ['tasks', 'handlers', 'defaults', 'templates']
+
+    # project parameters, missing ones are taken from here
+    DEFAULTS = {'roles': 100, 'fanout': 3, 'depth': 4, 'files': 5,
+                'includes': 4, 'seed': 1}
+
+    def __init__(self, parameters):
+        """
+        Synthetic project constructor
+
+        @param parameters: number of roles, dependencies per role (fanout),
+            dependency levels (depth), files per directory, include
+            directories beside roles and random seed, same seed gives same
+            project
+        @type parameters: dict
+        """
+
+        parameters = dict(self.DEFAULTS, **parameters)
+
+        self.__roles = parameters['roles']
+        self.__fanout = parameters['fanout']
+        self.__depth = max(1, parameters['depth'])
+        self.__files = parameters['files']
+        self.__includes = parameters['includes']
+        self.__random = random.Random(parameters['seed'])
+
+    def get_include_directories(self):
+        """
+        Return names of include directories
+
+        @return: list
+        """
+
+        names = ['group_vars', 'host_vars', 'filter_plugins', 'library']
+        names.extend(['dir_%s' % index
+                      for index in xrange(len(names), self.__includes)])
+
+        return names[:self.__includes] + ['roles']
+
+    @staticmethod
+    def __write_file(path, content=''):
+        """
+        Write file content
+
+        @param path: location of file
+        @type path: str
+        @param content: file content
+        @type content: str
+        """
+
+        with open(path, 'w') as synthetic_file:
+            synthetic_file.write(content)
+
+    def __write_files(self, directory, extension):
+        """
+        Create directory with configured number of files
+
+        @param directory: location of directory
+        @type directory: str
+        @param extension: file name extension
+        @type extension: str
+        """
+
+        os.makedirs(directory)
+
+        for index in xrange(self.__files):
+            SyntheticProject.__write_file(
+                '%s/file_%s.%s' % (directory, index, extension),
+                'value_%s: %s\n' % (index, index))
+
+    def __get_dependencies(self):
+        """
+        Return dependencies per role, each level depends on deeper levels
+
+        @return: dict
+        """
+
+        names = ['role_%05d' % index for index in xrange(self.__roles)]
+        level_size = max(1, len(names) // self.__depth)
+        dependencies = dict()
+
+        for index, name in enumerate(names):
+            deeper = names[(index // level_size + 1) * level_size:]
+            count = min(self.__fanout, len(deeper))
+            dependencies[name] = self.__random.sample(deeper, count)
+
+        return dependencies
+
+    def create(self, project_path):
+        """
+        Create synthetic project
+
+        @param project_path: location of new project
+        @type project_path: str
+        """
+
+        for name in self.get_include_directories()[:-1]:
+            self.__write_files(project_path + '/' + name, 'yml')
+
+        for role, dependencies in self.__get_dependencies().iteritems():
+            role_path = project_path + '/roles/' + role
+
+            for name in self.ROLE_DIRECTORIES:
+                self.__write_files(role_path + '/' + name, 'yml')
+
+            os.makedirs(role_path + '/meta')
+            meta = 'galaxy_info:\n  author: benchmark\ndependencies:\n'
+            meta += ''.join(['  - role: %s\n' % item for item in dependencies])
+            SyntheticProject.__write_file(role_path + '/meta/main.yml', meta)
+
+        for index in xrange(self.__files):
+            SyntheticProject.__write_file(
+                '%s/playbook_%s.yml' % (project_path, index),
+                '- hosts: all\n  roles:\n    - role_00000\n')
+
+
+class AnsibleGraphBenchmark(object):
+    """ AnsibleGraph benchmark class """
+
+    @staticmethod
+    def __parse_arguments():
+        """
+        Parse given command-line arguments
+
+        @return: class
+        """
+
+        parser = get_argument_parser(
+            'Ansible-Graph benchmark on synthetic Ansible projects')
+
+        # set optional arguments
+        parser.add_argument("--roles", type=int, default=200,
+                            help="set number of roles")
+        parser.add_argument("--fanout", type=int, default=3,
+                            help="set dependencies per role")
+        parser.add_argument("--depth", type=int, default=5,
+                            help="set number of dependency levels")
+        parser.add_argument("--files", type=int, default=5,
+                            help="set files per directory")
+        parser.add_argument("--includes", type=int, default=4,
+                            help="set include directories beside roles")
+        parser.add_argument("--seed", type=int, default=1,
+                            help="set random seed of synthetic project")
+
+        parser.add_argument("-n", "--repeat", type=int, default=3,
+                            help="set runs per stage, fastest run counts")
+
+        add_format_arguments(parser, 'svg', report=False)
+
+        parser.add_argument("-o", "--output",
+                            help="write results as JSON into file")
+
+        parser.add_argument("-c", "--compare",
+                            help="compare with results JSON of other run")
+
+        parser.add_argument("--keep",
+                            action="store_true",
+                            help="keep synthetic project directory")
+
+        return parser.parse_args()
+
+    def __init__(self):
+        """ AnsibleGraph benchmark constructor """
+
+        # initialize logging
+        self.__logger = logging.getLogger(__name__)
+
+        # parse arguments
+        args = AnsibleGraphBenchmark.__parse_arguments()
+
+        # set logging level
+        set_logging_level(args.verbosity, logging.CRITICAL)
+
+        # assign arguments
+        self.__args = args
+        self.__stages = dict()
+        self.__counts = dict()
+
+    def verify_arguments(self):
+        """ Verify application arguments """
+
+        self.__logger.info('** verify given arguments **')
+
+        # benchmark logs critical errors only, argument errors are printed
+        for name in ['roles', 'repeat']:
+            if getattr(self.__args, name) < 1:
+                sys.stderr.write('--%s needs to be greater than zero\n' % name)
+                sys.exit(1)
+
+        # check results to compare with, before the project is created
+        if self.__args.compare and \
+                not os.access(self.__args.compare, os.R_OK):
+            sys.stderr.write('%s not found\n' % self.__args.compare)
+            sys.exit(1)
+
+    def __measure(self, stage, function):
+        """
+        Run function repeatedly and record its timings
+
+        @param stage: name of stage
+        @type stage: str
+        @param function: stage function without arguments
+        @type function: callable
+
+        @return: result of last run
+        """
+
+        runs = list()
+        result = None
+
+        for _ in xrange(max(1, self.__args.repeat)):
+            start = time.time()
+            try:
+                result = function()
+            except Exception as error:  # pylint: disable=broad-except
+                self.__logger.error('%s - %s', stage, error)
+                self.__stages[stage] = {'error': str(error)}
+                return None
+            runs.append(round(time.time() - start, 6))
+
+        self.__stages[stage] = {'seconds': min(runs), 'runs': runs}
+        self.__logger.info('%s - %.4fs', stage, min(runs))
+
+        return result
+
+    @staticmethod
+    def __write_configuration(path, includes, location):
+        """
+        Write configuration file for synthetic project
+
+        @param path: location of configuration file
+        @type path: str
+        @param includes: include directories
+        @type includes: list
+        @param location: graph location
+        @type location: str
+        """
+
+        with open(path, 'w') as config_file:
+            config_file.write('[global]\ntitle = Benchmark\n'
+                              'company = Benchmark\n\n'
+                              '[structure]\ninclude = %s\n'
+                              'exclude = .git, .DS_Store\n\n'
+                              '[graph]\nlocation = %s\n'
+                              % (', '.join(includes), location))
+
+    @staticmethod
+    def __get_commit():
+        """
+        Return current git commit, if available
+
+        @return: str
+        """
+
+        try:
+            with open(os.devnull, 'w') as devnull:
+                return subprocess.check_output(
+                    ['git', 'rev-parse', 'HEAD'], stderr=devnull).strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def __run_stages(self, project_path, config_path):
+        """
+        Time each stage on synthetic project
+
+        @param project_path: location of synthetic project
+        @type project_path: str
+        @param config_path: location of configuration file
+        @type config_path: str
+        """
+
+        def read_configuration():
+            """ Read configuration stage """
+            config = ReadConfiguration()
+            config.set_configuration(config_path)
+            return config.get_configuration()
+
+        config = self.__measure('configuration', read_configuration)
+
+        # later stages need the configuration, failure is recorded already
+        if config is None:
+            return
+
+        def read_directories():
+            """ Directory reader stage """
+            reader = AnsibleDirectoryReader()
+            reader.set_reader_config(project_path, config['include'],
+                                     config['exclude'])
+            return reader.get_ansible_structure()
+
+        structure = self.__measure('directory_reader', read_directories)
+
+        def read_roles():
+            """ Role reader stage """
+            reader = AnsibleRoleReader()
+            reader.set_reader_config(project_path)
+            return reader.get_ansible_roles()
+
+        roles = self.__measure('role_reader', read_roles)
+
+        # graphs and reports need structure and roles
+        if structure is None or roles is None:
+            return
+
+        self.__counts = {'directories': len(structure),
+                         'files': sum([len(value['files'])
+                                       for value in structure.values()]),
+                         'roles': len(roles),
+                         'dependencies': sum([len(value)
+                                              for value in roles.values()])}
+
+        self.__run_output_stages(config, structure, roles)
+
+    def __run_output_stages(self, config, structure, roles):
+        """
+        Time graph and report stages on read project
+
+        @param config: configuration
+        @type config: dict
+        @param structure: project structure
+        @type structure: dict
+        @param roles: role dependencies
+        @type roles: dict
+        """
+
+        for graph_type, content in [('project', structure), ('roles', roles)]:
+
+            def build_graph(content=content, graph_type=graph_type):
+                """ DOT source stage """
+                return GraphGenerator().get_graph_source(content, graph_type)
+
+            def generate_graph(content=content, graph_type=graph_type):
+                """ DOT source and Graphviz render stage """
+                graph = GraphGenerator()
+                graph.set_graph_config(self.__args.format, config['location'],
+                                       True)
+                graph.set_partition_mode('never')
+                graph.generate_graph(content, graph_type)
+
+            self.__measure('graph_build_%s' % graph_type, build_graph)
+            self.__measure('graph_render_%s' % graph_type, generate_graph)
+
+        for report_format in REPORT_FORMATS:
+
+            def write_report(report_format=report_format):
+                """ Report stage """
+                report = ReportGenerator(report_format)
+                report.set_report_header({'title': config['title'],
+                                          'company': config['company']})
+                report.set_report_content(structure, roles)
+                with open(os.devnull, 'wb') as sink:
+                    report.write_report(sink)
+
+            self.__measure('report_%s' % report_format, write_report)
+
+    def __write_comparison(self, results):
+        """
+        Print stage timings compared with other results
+
+        @param results: results of this run
+        @type results: dict
+        """
+
+        with open(self.__args.compare, 'r') as compare_file:
+            baseline = json.load(compare_file)
+
+        row = '{:<24} {:>12} {:>12} {:>8}\n'
+        sys.stdout.write(row.format('Stage', 'Baseline', 'Current', 'Ratio'))
+
+        for stage in sorted(results['stages']):
+            current = results['stages'][stage].get('seconds')
+            previous = baseline.get('stages', dict()).get(
+                stage, dict()).get('seconds')
+
+            if current is None or previous is None:
+                sys.stdout.write(row.format(stage, previous, current, '-'))
+                continue
+
+            ratio = '%.2f' % (current / previous) if previous else '-'
+            sys.stdout.write(row.format(stage, '%.4f' % previous,
+                                        '%.4f' % current, ratio))
+
+    def run_benchmark(self):
+        """ Create synthetic project and time all stages """
+
+        work_path = tempfile.mkdtemp(prefix='ansible_graph_benchmark_')
+        project_path = work_path + '/project'
+        config_path = work_path + '/configuration.conf'
+
+        parameters = dict([(name, getattr(self.__args, name))
+                           for name in SyntheticProject.DEFAULTS])
+        generator = SyntheticProject(parameters)
+
+        try:
+            self.__logger.info('** create synthetic project - %s **',
+                               project_path)
+            start = time.time()
+            generator.create(project_path)
+            self.__logger.info('created in %.2fs', time.time() - start)
+
+            AnsibleGraphBenchmark.__write_configuration(
+                config_path, generator.get_include_directories(),
+                work_path + '/report')
+
+            self.__run_stages(project_path, config_path)
+        finally:
+            if self.__args.keep:
+                sys.stderr.write('synthetic project kept - %s\n' % work_path)
+            else:
+                shutil.rmtree(work_path, ignore_errors=True)
+
+        results = {'commit': AnsibleGraphBenchmark.__get_commit(),
+                   'python': platform.python_version(),
+                   'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+                   'parameters': dict(parameters,
+                                      repeat=self.__args.repeat,
+                                      format=self.__args.format),
+                   'counts': self.__counts,
+                   'stages': self.__stages}
+
+        if self.__args.output:
+            with open(self.__args.output, 'w') as output:
+                json.dump(results, output, indent=4, sort_keys=True)
+
+        if self.__args.compare:
+            self.__write_comparison(results)
+        else:
+            json.dump(results, sys.stdout, indent=4, sort_keys=True)
+            sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    RUN = AnsibleGraphBenchmark()
+    RUN.verify_arguments()
+    RUN.run_benchmark()